@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+from ..domain.entities import DataBatch, DataDestination
+
+DEFAULT_CHECKPOINT_PATH = "outputs/etl_checkpoints.db"
+
+# Extensions of the per-chunk part files, by destination format
+CHECKPOINT_FORMATS = {"csv": "csv", "parquet": "parquet"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    destination TEXT PRIMARY KEY,
+    run_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS units (
+    destination TEXT NOT NULL,
+    unit INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (destination, unit)
+);
+"""
+
+
+class CheckpointStore:
+    """Committed chunks (or partitions) per destination, kept in a local SQLite file.
+
+    One run is tracked per destination under a `run_key` identifying the
+    source content and the job. `begin` resumes an unfinished run with the
+    same key and starts over otherwise; `commit` is recorded in its own
+    transaction after the unit's output is in place, so a crash between the
+    two only redoes that unit.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CHECKPOINT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+
+    def begin(self, destination: str, run_key: str) -> Dict[int, Dict[str, Any]]:
+        """Start or resume the run writing `destination`; return the units it already committed."""
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT run_key, status FROM runs WHERE destination = ?", (destination,)
+            ).fetchone()
+            if row is not None and row[0] == run_key and row[1] == "running":
+                return self._committed(connection, destination)
+            connection.execute("DELETE FROM units WHERE destination = ?", (destination,))
+            connection.execute(
+                "INSERT OR REPLACE INTO runs (destination, run_key, status, started_at) VALUES (?, ?, 'running', ?)",
+                (destination, run_key, time.time()),
+            )
+            return {}
+
+    def commit(self, destination: str, unit: int, rows: int, path: str) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO units (destination, unit, rows, path, committed_at) VALUES (?, ?, ?, ?, ?)",
+                (destination, unit, rows, path, time.time()),
+            )
+
+    def finish(self, destination: str) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE runs SET status = 'finished', finished_at = ? WHERE destination = ?", (time.time(), destination)
+            )
+
+    def committed(self, destination: str) -> Dict[int, Dict[str, Any]]:
+        with closing(self._connect()) as connection:
+            return self._committed(connection, destination)
+
+    @staticmethod
+    def _committed(connection: sqlite3.Connection, destination: str) -> Dict[int, Dict[str, Any]]:
+        rows = connection.execute(
+            "SELECT unit, rows, path FROM units WHERE destination = ? ORDER BY unit", (destination,)
+        ).fetchall()
+        return {unit: {"rows": count, "path": path} for unit, count, path in rows}
+
+    def _connect(self) -> sqlite3.Connection:
+        # Flows on other destinations may share the file; wait for its lock instead of failing
+        return sqlite3.connect(self.path, timeout=30)
+
+
+class CheckpointedLoad:
+    """Resumable streamed load: every chunk becomes its own part file, committed to a `CheckpointStore`.
+
+    The destination URI names a directory (no file extension) of
+    `part-<chunk index>.<format>` files. Each part is written to a temporary
+    name and renamed into place, so a chunk is either fully present or absent,
+    and rewriting it is idempotent. On resume, `skip_committed` drops the
+    chunks already committed before they are transformed; a fresh run first
+    removes the part files recorded for the last one, and nothing else.
+    Chunk indexes come from the source (`metadata["chunk_index"]`), so resuming
+    needs the same source content and `chunk_size`, which the run key covers.
+    """
+
+    def __init__(self, store: CheckpointStore, destination: DataDestination, run_key: str):
+        if destination.format not in CHECKPOINT_FORMATS:
+            raise ValueError(f"Checkpointed loads support {sorted(CHECKPOINT_FORMATS)} destinations, not {destination.format}")
+        self.directory = Path(destination.uri)
+        if self.directory.suffix or self.directory.is_file():
+            raise ValueError(
+                f"Checkpointed loads write a directory of part files; dest_uri {destination.uri!r} looks like a file, "
+                f"name a directory instead (e.g. {str(self.directory.with_suffix(''))!r})"
+            )
+        self.store = store
+        self.destination = destination
+        key = str(self.directory.resolve())
+        previous = store.committed(key)
+        self.committed = store.begin(key, run_key)
+        if not self.committed:
+            self._clear_parts(previous)
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.committed)
+
+    def skip_committed(self, batches: Iterable[DataBatch]) -> Iterator[DataBatch]:
+        for batch in batches:
+            if batch.metadata.get("chunk_index") not in self.committed:
+                yield batch
+
+    def write_stream(self, batches: Iterable[DataBatch], adapter: Any) -> Dict[str, Any]:
+        key = str(self.directory.resolve())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for batch in batches:
+            index = batch.metadata.get("chunk_index")
+            if index is None:
+                raise ValueError("Checkpointed loads need chunks tagged with metadata['chunk_index']")
+            path = self.part_path(index)
+            staging = path.with_name(f".{path.name}.tmp")
+            adapter.write(batch, replace(self.destination, uri=str(staging), options={
+                **self.destination.options, "mode": "overwrite",
+            }))
+            os.replace(staging, path)
+            self.store.commit(key, index, batch.num_rows, str(path))
+            self.committed[index] = {"rows": batch.num_rows, "path": str(path)}
+            written += 1
+        self.store.finish(key)
+        return {
+            "status": "success",
+            "path": str(self.directory),
+            "rows_written": sum(unit["rows"] for unit in self.committed.values()),
+            "chunks_written": written,
+            "chunks_resumed": len(self.committed) - written,
+            "bytes_written": sum(Path(unit["path"]).stat().st_size for unit in self.committed.values()),
+        }
+
+    def part_path(self, index: int) -> Path:
+        return self.directory / f"part-{index:06d}.{CHECKPOINT_FORMATS[self.destination.format]}"
+
+    @staticmethod
+    def _clear_parts(units: Dict[int, Dict[str, Any]]) -> None:
+        # Only parts this store recorded; other files in the directory are left alone
+        for unit in units.values():
+            Path(unit["path"]).unlink(missing_ok=True)
+
@@ -1,44 +1,489 @@
 from __future__ import annotations
 
+import io
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
+from urllib.parse import quote
 import pandas as pd
 
 from ..domain.entities import DataBatch, DataDestination
+from .sql import DEFAULT_MAX_OVERFLOW, DEFAULT_POOL_SIZE, column_list, get_engine, qualified_name
+
+
+# Options consumed by FileDestinationAdapter; the rest go to the underlying writer
+FILE_WRITE_OPTIONS = ("partition_cols", "compression", "row_group_size", "file_index", "mode")
+
+FILE_WRITE_MODES = ("overwrite", "append")
+
+CSV_CODECS = {"gzip": ".gz", "bz2": ".bz2", "zstd": ".zst", "lz4": ".lz4"}
+
+# Hive convention for null partition values
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
 
 
 class FileDestinationAdapter:
+    """Local file destination; Arrow batches go to CSV/Parquet without pandas.
+
+    Destination options handled here:
+
+    - `partition_cols`: Hive-style layout `uri/col=value/part-NNNNN.ext`; partition
+      files are written concurrently on a thread pool of `max_workers`.
+    - `compression`: Parquet codec (snappy, zstd, lz4, gzip, ...) or CSV stream codec
+      (gzip, bz2, zstd, lz4).
+    - `row_group_size`: rows per Parquet row group.
+    - `mode`: `overwrite` (default) or `append`. Appends add rows to a single CSV
+      file, or new uniquely named part files to a partitioned layout; a single
+      Parquet file cannot be appended to.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+
     def write(self, batch: DataBatch, destination: DataDestination) -> dict[str, Any]:
         path = Path(destination.uri)
+        options, layout = _split_options(destination.options)
+
+        if layout["partition_cols"]:
+            _require_partitionable(destination.format)
+            files = self._write_partitions(batch, path, destination.format, layout, options,
+                                           name=f"{_part_prefix(layout)}-{layout['file_index']:05d}")
+            return _partitioned_result(path, files)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if layout["mode"] == "append":
+            _require_appendable(destination.format, layout)
+            rows, _ = self._stream_csv([batch], path, layout, options)
+        elif destination.format in ("csv", "parquet"):
+            rows = _write_file(batch, path, destination.format, layout, options)
+        elif destination.format in ("xlsx", "xls"):
+            df = _require_dataframe(batch)
+            df.to_excel(path, index=False, **options)
+            rows = len(df)
+        else:
+            raise ValueError(f"Unsupported format: {destination.format}")
+
+        return {
+            "status": "success",
+            "path": str(path),
+            "rows_written": rows,
+            "bytes_written": path.stat().st_size,
+        }
+
+    def write_stream(self, batches: Iterable[DataBatch], destination: DataDestination) -> dict[str, Any]:
+        """Write batches incrementally to a single file, one chunk at a time.
+
+        With `partition_cols`, every chunk adds one file per partition it touches.
+        """
+        path = Path(destination.uri)
+        options, layout = _split_options(destination.options)
+
+        if layout["partition_cols"]:
+            _require_partitionable(destination.format)
+            files: list[dict[str, Any]] = []
+            chunks = 0
+            prefix = _part_prefix(layout)
+            for batch in batches:
+                files += self._write_partitions(batch, path, destination.format, layout, options,
+                                                name=f"{prefix}-{layout['file_index']:05d}-{chunks:05d}")
+                chunks += 1
+            return {**_partitioned_result(path, files), "chunks_written": chunks}
+
         path.parent.mkdir(parents=True, exist_ok=True)
-        
-        df = batch.raw
-        if not isinstance(df, pd.DataFrame):
-            raise ValueError("Batch raw data must be pandas DataFrame")
-        
+        if layout["mode"] == "append":
+            _require_appendable(destination.format, layout)
         if destination.format == "csv":
-            df.to_csv(path, index=False, **destination.options)
+            rows, chunks = self._stream_csv(batches, path, layout, options)
         elif destination.format == "parquet":
-            df.to_parquet(path, index=False, **destination.options)
+            rows, chunks = self._stream_parquet(batches, path, layout, options)
         elif destination.format in ("xlsx", "xls"):
-            df.to_excel(path, index=False, **destination.options)
+            raise ValueError("Streaming writes are not supported for Excel destinations")
         else:
             raise ValueError(f"Unsupported format: {destination.format}")
-        
+
         return {
             "status": "success",
             "path": str(path),
-            "rows_written": len(df),
+            "rows_written": rows,
+            "chunks_written": chunks,
+            "bytes_written": path.stat().st_size,
         }
 
+    def _write_partitions(
+        self,
+        batch: DataBatch,
+        root: Path,
+        fmt: str,
+        layout: dict[str, Any],
+        options: dict[str, Any],
+        name: str,
+    ) -> list[dict[str, Any]]:
+        import pyarrow as pa
+
+        columns = list(layout["partition_cols"])
+        table = batch.to_arrow()
+        missing = [column for column in columns if column not in table.column_names]
+        if missing:
+            raise ValueError(f"Partition columns not in batch: {missing}")
+
+        # One hash pass over the key columns gives the row positions of every partition
+        keys = table.select(columns).to_pandas()
+        groups = keys.groupby(columns, sort=False, dropna=False).indices
+        data = table.select([name for name in table.column_names if name not in columns])
+        suffix = f".{fmt}" + (CSV_CODECS.get(layout["compression"], "") if fmt == "csv" else "")
+
+        def write_one(key: Any, positions: Any) -> dict[str, Any]:
+            values = dict(zip(columns, key if isinstance(key, tuple) else (key,)))
+            directory = root.joinpath(*(_hive_segment(column, value) for column, value in values.items()))
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{name}{suffix}"
+            part = DataBatch(raw=data.take(pa.array(positions)))
+            rows = _write_file(part, path, fmt, layout, options)
+            return {"path": str(path), "values": {k: _plain(v) for k, v in values.items()},
+                    "rows": rows, "bytes": path.stat().st_size}
+
+        # pyarrow writers release the GIL, so partitions encode and compress in parallel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda item: write_one(*item), groups.items()))
+
+    @staticmethod
+    def _stream_csv(
+        batches: Iterable[DataBatch], path: Path, layout: dict[str, Any], options: dict[str, Any]
+    ) -> tuple[int, int]:
+        rows = chunks = 0
+        append = layout["mode"] == "append"
+        # Appends only write a header when the file is new or empty
+        header = not (append and path.exists() and path.stat().st_size > 0)
+        with _open_csv(path, layout["compression"], append) as handle:
+            for batch in batches:
+                if batch.is_arrow:
+                    _write_arrow_csv(batch.to_arrow(), handle, header=header and chunks == 0)
+                else:
+                    _require_dataframe(batch).to_csv(handle, index=False, header=header and chunks == 0, **options)
+                rows += batch.num_rows
+                chunks += 1
+        return rows, chunks
+
+    @staticmethod
+    def _stream_parquet(
+        batches: Iterable[DataBatch], path: Path, layout: dict[str, Any], options: dict[str, Any]
+    ) -> tuple[int, int]:
+        import pyarrow.parquet as pq
+
+        rows = chunks = 0
+        writer = None
+        try:
+            for batch in batches:
+                table = batch.to_arrow()
+                if writer is None:
+                    writer = pq.ParquetWriter(path, _stream_schema(table.schema), **_parquet_options(layout, options))
+                    table = table.cast(writer.schema)
+                else:
+                    # Chunks may infer narrower types (e.g. all-null columns); align to the file schema
+                    table = table.cast(writer.schema)
+                writer.write_table(table, row_group_size=layout["row_group_size"])
+                rows += table.num_rows
+                chunks += 1
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows, chunks
+
+
+def _stream_schema(schema: Any) -> Any:
+    """File schema for a stream: categorical chunks pick index widths from their own cardinality, so use int32."""
+    import pyarrow as pa
+
+    for index, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type) and field.type.index_type != pa.int32():
+            schema = schema.set(index, field.with_type(pa.dictionary(pa.int32(), field.type.value_type)))
+    return schema
+
+
+def _split_options(options: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    options = dict(options)
+    layout = {key: options.pop(key, None) for key in FILE_WRITE_OPTIONS}
+    layout["file_index"] = layout["file_index"] or 0
+    layout["mode"] = layout["mode"] or "overwrite"
+    if layout["mode"] not in FILE_WRITE_MODES:
+        raise ValueError(f"Unsupported write mode: {layout['mode']} (use one of {FILE_WRITE_MODES})")
+    return options, layout
+
+
+def _part_prefix(layout: dict[str, Any]) -> str:
+    if layout["mode"] == "append":
+        # Unique per write so earlier runs' part files are never overwritten
+        return f"part-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    return "part"
+
+
+def _require_appendable(fmt: str, layout: dict[str, Any]) -> None:
+    if fmt != "csv":
+        raise ValueError(f"Append to a single {fmt} file is not supported; use partition_cols")
+    if layout["compression"] is not None:
+        raise ValueError("Append to a compressed CSV file is not supported; use partition_cols")
+
+
+def _require_partitionable(fmt: str) -> None:
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Partitioned writes are not supported for format: {fmt}")
+
+
+def _write_file(batch: DataBatch, path: Path, fmt: str, layout: dict[str, Any], options: dict[str, Any]) -> int:
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = batch.to_arrow()
+        pq.write_table(table, path, row_group_size=layout["row_group_size"], **_parquet_options(layout, options))
+        return table.num_rows
+
+    with _open_csv(path, layout["compression"]) as handle:
+        if batch.is_arrow:
+            _write_arrow_csv(batch.to_arrow(), handle, header=True)
+        else:
+            _require_dataframe(batch).to_csv(handle, index=False, **options)
+    return batch.num_rows
+
+
+def _parquet_options(layout: dict[str, Any], options: dict[str, Any]) -> dict[str, Any]:
+    if layout["compression"] is not None:
+        return {**options, "compression": layout["compression"]}
+    return options
+
+
+def _open_csv(path: Path, compression: Optional[str], append: bool = False) -> Any:
+    if compression is None:
+        return open(path, "ab" if append else "wb")
+    if compression not in CSV_CODECS:
+        raise ValueError(f"Unsupported CSV compression: {compression} (use one of {sorted(CSV_CODECS)})")
+    import pyarrow as pa
+
+    return pa.CompressedOutputStream(str(path), compression)
+
+
+def _partitioned_result(root: Path, files: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "status": "success",
+        "path": str(root),
+        "rows_written": sum(f["rows"] for f in files),
+        "bytes_written": sum(f["bytes"] for f in files),
+        "files": files,
+    }
+
+
+def _hive_segment(column: str, value: Any) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return f"{column}={HIVE_NULL_PARTITION}"
+    return f"{column}={quote(str(value), safe='')}"
+
+
+def _plain(value: Any) -> Any:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _require_dataframe(batch: DataBatch) -> pd.DataFrame:
+    df = batch.to_pandas()
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("Batch raw data must be pandas DataFrame")
+    return df
+
+
+def _write_arrow_csv(table: Any, handle: Any, header: bool) -> None:
+    import pyarrow.csv as pacsv
+
+    pacsv.write_csv(table, handle, write_options=pacsv.WriteOptions(include_header=header))
+
+
+WRITE_MODES = ("replace", "append", "upsert")
+
+# Rows CSV-encoded at a time while feeding COPY; bounds the extra buffer per batch
+COPY_SLICE_ROWS = 50_000
+
 
 class PostgresDestinationAdapter:
-    """Stub for Postgres destination."""
+    """Postgres table destination bulk-loaded with `COPY ... FROM STDIN`.
+
+    `destination.uri` is a SQLAlchemy URL and the engine is pooled per URL.
+    Options: `table` (defaults to the destination name), `schema`, `mode`
+    (replace/append/upsert) and `key_columns` for upserts. Upserts load a
+    temporary staging table and merge it with `INSERT ... ON CONFLICT`.
+    Other dialects (SQLite in tests) load through DBAPI `executemany`.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_overflow: int = DEFAULT_MAX_OVERFLOW):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+
     def write(self, batch: DataBatch, destination: DataDestination) -> dict[str, Any]:
-        raise NotImplementedError("Postgres destination requires sqlalchemy + psycopg2")
+        result = self.write_stream([batch], destination)
+        del result["chunks_written"]
+        return result
+
+    def write_stream(self, batches: Iterable[DataBatch], destination: DataDestination) -> dict[str, Any]:
+        """Load every chunk in one transaction; `replace` recreates the table from the first chunk."""
+        options = destination.options
+        table = options.get("table") or destination.name
+        schema = options.get("schema")
+        mode = options.get("mode", "append")
+        keys = list(options.get("key_columns") or [])
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode: {mode} (use one of {WRITE_MODES})")
+        if mode == "upsert" and not keys:
+            raise ValueError("Upsert mode requires key_columns")
+
+        engine = get_engine(destination.uri, self.pool_size, self.max_overflow)
+        rows = chunks = 0
+        with engine.begin() as connection:
+            target = qualified_name(connection, table, schema)
+            for batch in batches:
+                data = batch.to_arrow()
+                if chunks == 0:
+                    _prepare_table(connection, data, table, schema, mode, keys)
+                if mode == "upsert":
+                    rows += _upsert(connection, data, target, table, keys)
+                else:
+                    rows += _bulk_insert(connection, data, target)
+                chunks += 1
+
+        return {
+            "status": "success",
+            "table": f"{schema}.{table}" if schema else table,
+            "mode": mode,
+            "rows_written": rows,
+            "chunks_written": chunks,
+        }
+
+    def prepare_shared(self, destination: DataDestination) -> DataDestination:
+        """Set up a table that several writers (e.g. partition workers) load concurrently.
+
+        `replace` drops the table once, here, and the writers append; `upsert`
+        and `append` are left to the writers.
+        """
+        options = destination.options
+        if options.get("mode", "append") != "replace":
+            return destination
+        table = options.get("table") or destination.name
+        engine = get_engine(destination.uri, self.pool_size, self.max_overflow)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {qualified_name(connection, table, options.get('schema'))}")
+        return replace(destination, options={**options, "mode": "append"})
+
+
+def _prepare_table(connection: Any, data: Any, table: str, schema: Optional[str], mode: str, keys: list[str]) -> None:
+    # pandas maps the batch schema to DDL for whatever dialect the engine speaks
+    data.slice(0, 0).to_pandas().to_sql(
+        table, connection, schema=schema, index=False, if_exists="replace" if mode == "replace" else "append"
+    )
+    if mode == "upsert":
+        # ON CONFLICT needs a unique index on the key columns
+        index = connection.dialect.identifier_preparer.quote(f"ux_{table}_{'_'.join(keys)}")
+        connection.exec_driver_sql(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {qualified_name(connection, table, schema)} "
+            f"({column_list(connection, keys)})"
+        )
+
+
+def _bulk_insert(connection: Any, data: Any, target: str) -> int:
+    if data.num_rows == 0:
+        return 0
+    columns = column_list(connection, data.column_names)
+    if connection.dialect.name == "postgresql":
+        _copy_csv(connection, data, f"COPY {target} ({columns}) FROM STDIN WITH (FORMAT csv)")
+    else:
+        marker = {"qmark": "?", "numeric": ":{}", "named": ":p{}"}.get(connection.dialect.paramstyle, "%s")
+        placeholders = ", ".join(marker.format(i + 1) for i in range(data.num_columns))
+        rows = list(zip(*(column.to_pylist() for column in data.columns)))
+        if connection.dialect.paramstyle == "named":
+            rows = [{f"p{i + 1}": value for i, value in enumerate(row)} for row in rows]
+        connection.exec_driver_sql(f"INSERT INTO {target} ({columns}) VALUES ({placeholders})", rows)
+    return data.num_rows
+
+
+def _upsert(connection: Any, data: Any, target: str, table: str, keys: list[str]) -> int:
+    missing = [key for key in keys if key not in data.column_names]
+    if missing:
+        raise ValueError(f"Key columns not in batch: {missing}")
+    data = _last_per_key(data, keys)
+    quote_ident = connection.dialect.identifier_preparer.quote
+    staging = quote_ident(f"_stg_{table}_{uuid.uuid4().hex[:8]}")
+    columns = column_list(connection, data.column_names)
+
+    connection.exec_driver_sql(f"CREATE TEMP TABLE {staging} AS SELECT {columns} FROM {target} WHERE 1 = 0")
+    _bulk_insert(connection, data, staging)
+    updates = ", ".join(f"{quote_ident(c)} = excluded.{quote_ident(c)}" for c in data.column_names if c not in keys)
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    # WHERE true keeps SQLite from parsing ON CONFLICT as part of the SELECT
+    connection.exec_driver_sql(
+        f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging} WHERE true "
+        f"ON CONFLICT ({column_list(connection, keys)}) {action}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {staging}")
+    return data.num_rows
+
+
+def _last_per_key(data: Any, keys: list[str]) -> Any:
+    """Keep the last row per key; ON CONFLICT cannot touch the same row twice in one statement."""
+    import pyarrow as pa
+
+    duplicated = data.select(keys).to_pandas().duplicated(keep="last").to_numpy()
+    return data.filter(pa.array(~duplicated)) if duplicated.any() else data
+
+
+def _copy_csv(connection: Any, data: Any, sql: str) -> None:
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, _CsvSliceReader(data, COPY_SLICE_ROWS))
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                for chunk in _csv_slices(data, COPY_SLICE_ROWS):
+                    copy.write(chunk)
+    finally:
+        cursor.close()
+
+
+def _csv_slices(table: Any, slice_rows: int) -> Iterator[bytes]:
+    # Arrow leaves nulls unquoted and quotes strings, which COPY csv reads as NULL vs ''
+    import pyarrow.csv as pacsv
+
+    options = pacsv.WriteOptions(include_header=False)
+    for offset in range(0, table.num_rows, slice_rows):
+        buffer = io.BytesIO()
+        pacsv.write_csv(table.slice(offset, slice_rows), buffer, write_options=options)
+        yield buffer.getvalue()
+
+
+class _CsvSliceReader(io.RawIOBase):
+    """File-like view over lazily encoded CSV slices, for drivers that read from a file."""
+
+    def __init__(self, table: Any, slice_rows: int):
+        self._slices = _csv_slices(table, slice_rows)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            chunk = next(self._slices, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
 
 
 class BigQueryDestinationAdapter:
     """Stub for BigQuery destination."""
     def write(self, batch: DataBatch, destination: DataDestination) -> dict[str, Any]:
         raise NotImplementedError("BigQuery destination requires google-cloud-bigquery")
+
+    def write_stream(self, batches: Iterable[DataBatch], destination: DataDestination) -> dict[str, Any]:
+        raise NotImplementedError("BigQuery destination requires google-cloud-bigquery")
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import ast
+import json
+import operator
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataSource
+
+# TransformationJob.rules keys handled by the expression engine, applied in this order
+DSL_RULES = ("cleanse", "derive", "enrich", "normalize", "filter")
+
+# numexpr only pays off once its thread pool has enough rows to chew on
+NUMEXPR_MIN_ROWS = 50_000
+
+# Shorthands accepted by "normalize": {"amount": "zscore"} means zscore(amount)
+NORMALIZERS = ("zscore", "minmax")
+
+_BINARY = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_COMPARE = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+# Functions numexpr evaluates natively (same names and semantics)
+_NUMEXPR_FUNCTIONS = {"abs", "sqrt", "log", "exp", "where"}
+
+try:
+    import numexpr
+except ImportError:  # Optional: expressions fall back to pandas/NumPy operators
+    numexpr = None
+
+
+@dataclass
+class Expression:
+    """One expression compiled to a vectorized function of a DataFrame.
+
+    Pure arithmetic/comparison expressions over numeric columns also keep a
+    numexpr translation, used when numexpr is installed and the batch is large.
+    """
+    source: str
+    columns: frozenset
+    evaluate: Callable[[pd.DataFrame], Any]
+    numexpr_source: Optional[str] = None
+    # zscore()/minmax() without explicit statistics: results depend on the batch they run on
+    batch_statistics: bool = False
+
+    def __call__(self, df: pd.DataFrame) -> Any:
+        missing = self.columns - set(df.columns)
+        if missing:
+            raise ValueError(f"Unknown column(s) {sorted(missing)} in expression {self.source!r}")
+        if self.numexpr_source and numexpr is not None and len(df) >= NUMEXPR_MIN_ROWS and all(
+            isinstance(df[c].dtype, np.dtype) and df[c].dtype.kind in "biuf" for c in self.columns
+        ):
+            local = {c: df[c].to_numpy() for c in self.columns}
+            return pd.Series(numexpr.evaluate(self.numexpr_source, local_dict=local), index=df.index)
+        return self.evaluate(df)
+
+
+@dataclass
+class TransformPlan:
+    """Compiled DSL steps: `(rule, target column or None for filters, expression)`."""
+    steps: list[tuple[str, Optional[str], Expression]]
+
+    def apply(self, df: pd.DataFrame, partial: bool = False) -> tuple[pd.DataFrame, dict[str, Any]]:
+        """Run the steps on `df`; `partial` marks a chunk or partition of a larger input."""
+        batch_statistics = [expression.source for _, _, expression in self.steps if expression.batch_statistics]
+        if partial and batch_statistics:
+            raise ValueError(
+                f"{batch_statistics} would scale each chunk with its own statistics; "
+                "pass them explicitly, e.g. zscore(amount, 52.1, 7.3) or minmax(amount, 0, 5000)"
+            )
+        stats: dict[str, Any] = {}
+        copied = False
+        for rule, target, expression in self.steps:
+            result = expression(df)
+            if rule == "filter":
+                mask = _as_mask(result, df.index)
+                stats["filtered_rows"] = stats.get("filtered_rows", 0) + int(len(df) - mask.sum())
+                df = df[mask]
+                copied = True
+                continue
+            if not copied:
+                # Columns are replaced, never written into: a shallow copy keeps the input intact
+                df = df.copy(deep=False)
+                copied = True
+            df[target] = result
+        return df, stats
+
+
+def compile_transform_plan(rules: dict[str, Any]) -> Optional[TransformPlan]:
+    """Compile the DSL sections of `rules`; None when the job uses none of them.
+
+    - `cleanse`: `{column: expression}` or `{column: ["strip", "lower"]}` (functions applied in order)
+    - `derive` / `enrich`: `{column: expression}`, later entries can use earlier ones
+    - `normalize`: `{column: "zscore" | "minmax" | expression}`
+    - `filter`: an expression or a list of expressions (all must hold)
+    """
+    if not any(rules.get(rule) for rule in DSL_RULES):
+        return None
+    steps: list[tuple[str, Optional[str], Expression]] = []
+    for column, spec in (rules.get("cleanse") or {}).items():
+        if isinstance(spec, (list, tuple)):
+            spec = reduce(lambda inner, name: f"{name}({inner})", spec, _column_ref(column))
+        steps.append(("cleanse", column, compile_expression(spec)))
+    for rule in ("derive", "enrich"):
+        for column, spec in (rules.get(rule) or {}).items():
+            steps.append((rule, column, compile_expression(spec)))
+    for column, spec in (rules.get("normalize") or {}).items():
+        if spec in NORMALIZERS:
+            spec = f"{spec}({_column_ref(column)})"
+        steps.append(("normalize", column, compile_expression(spec)))
+    filters = rules.get("filter") or []
+    for spec in [filters] if isinstance(filters, str) else filters:
+        steps.append(("filter", None, compile_expression(spec)))
+    return TransformPlan(steps)
+
+
+def plan_key(rules: dict[str, Any]) -> str:
+    return json.dumps({rule: rules.get(rule) for rule in DSL_RULES}, sort_keys=True, default=str)
+
+
+def compile_expression(source: str) -> Expression:
+    """Parse `source` (a Python-like expression over column names) into an `Expression`.
+
+    Supported: column names (or `col("name with spaces")`), literals, arithmetic,
+    comparisons, `and`/`or`/`not`, `in`/`not in` lists, `a if cond else b` and
+    the functions in `FUNCTIONS`. Anything else is rejected here, not per batch.
+    """
+    try:
+        tree = ast.parse(str(source).strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {source!r}: {e.msg}") from e
+    compiler = _Compiler(source)
+    evaluate = compiler.compile(tree)
+    return Expression(
+        source=str(source),
+        columns=frozenset(compiler.columns),
+        evaluate=evaluate,
+        numexpr_source=_numexpr_source(tree),
+        batch_statistics=compiler.batch_statistics,
+    )
+
+
+def _column_ref(column: str) -> str:
+    return column if column.isidentifier() else f"col({column!r})"
+
+
+class _Compiler:
+    def __init__(self, source: str):
+        self.source = source
+        self.columns: set[str] = set()
+        self.batch_statistics = False
+
+    def compile(self, node: ast.AST) -> Callable[[pd.DataFrame], Any]:
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda df: value
+        if isinstance(node, ast.Name):
+            return self._column(node.id)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            op, left, right = _BINARY[type(node.op)], self.compile(node.left), self.compile(node.right)
+            return lambda df: op(left(df), right(df))
+        if isinstance(node, ast.UnaryOp):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.USub):
+                return lambda df: -operand(df)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(node.op, ast.Not):
+                return lambda df: ~_as_bool(operand(df))
+        if isinstance(node, ast.BoolOp):
+            parts = [self.compile(value) for value in node.values]
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            return lambda df: reduce(combine, (_as_bool(part(df)) for part in parts))
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+            return lambda df: _where(_as_bool(test(df)), body(df), orelse(df), df.index)
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Dict)):
+            value = self._literal(node)
+            return lambda df: value
+        raise ValueError(f"Unsupported syntax ({type(node).__name__}) in expression {self.source!r}")
+
+    def _column(self, name: str) -> Callable[[pd.DataFrame], Any]:
+        self.columns.add(name)
+        return lambda df: df[name]
+
+    def _compare(self, node: ast.Compare) -> Callable[[pd.DataFrame], Any]:
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        checks = []
+        for position, op in enumerate(node.ops):
+            left, right = operands[position], operands[position + 1]
+            if isinstance(op, (ast.In, ast.NotIn)):
+                values = self._literal(node.comparators[position])
+                negate = isinstance(op, ast.NotIn)
+                checks.append(lambda df, left=left, values=values, negate=negate: _isin(left(df), values, negate))
+            elif type(op) in _COMPARE:
+                fn = _COMPARE[type(op)]
+                checks.append(lambda df, fn=fn, left=left, right=right: fn(left(df), right(df)))
+            else:
+                raise ValueError(f"Unsupported comparison in expression {self.source!r}")
+        # a < b < c means (a < b) and (b < c)
+        return lambda df: reduce(operator.and_, (_as_bool(check(df)) for check in checks))
+
+    def _call(self, node: ast.Call) -> Callable[[pd.DataFrame], Any]:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ValueError(f"Only plain function calls are supported in expression {self.source!r}")
+        name = node.func.id
+        if name == "col":
+            if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant):
+                raise ValueError(f"col() takes one column name in expression {self.source!r}")
+            return self._column(str(node.args[0].value))
+        if name == "lookup":
+            return self._lookup(node)
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown function {name}() in expression {self.source!r}")
+        fn = FUNCTIONS[name]
+        if name in NORMALIZERS and len(node.args) < 3:
+            self.batch_statistics = True
+        args = [self.compile(arg) for arg in node.args]
+        return lambda df: fn(*(arg(df) for arg in args))
+
+    def _lookup(self, node: ast.Call) -> Callable[[pd.DataFrame], Any]:
+        """lookup(key, {"CO": "Colombia"}[, default]) or lookup(key, "ref.csv", "code", "name"[, default])."""
+        if len(node.args) < 2:
+            raise ValueError(f"lookup() needs a key and a mapping in expression {self.source!r}")
+        key = self.compile(node.args[0])
+        spec = [self._literal(arg) for arg in node.args[1:]]
+        if isinstance(spec[0], dict):
+            mapping, default = pd.Series(spec[0]), spec[1] if len(spec) > 1 else None
+        elif isinstance(spec[0], str) and len(spec) >= 3:
+            mapping, default = _load_lookup(*spec[:3]), spec[3] if len(spec) > 3 else None
+        else:
+            raise ValueError(f"Unsupported lookup() arguments in expression {self.source!r}")
+        # The mapping is built once here and reused by every batch (hash join through Series.map)
+        return lambda df: _map(key(df), mapping, default)
+
+    def _literal(self, node: ast.AST) -> Any:
+        try:
+            return ast.literal_eval(node)
+        except ValueError as e:
+            raise ValueError(f"Expected a literal in expression {self.source!r}") from e
+
+
+def _numexpr_source(tree: ast.AST) -> Optional[str]:
+    """numexpr spelling of a purely numeric expression, or None when it uses anything else."""
+    class Translate(ast.NodeTransformer):
+        # and/or/not/if become &/|/~/where(), which need bool operands: numbers are tested like `_as_bool`
+        def truth(self, node):
+            translated = self.visit(node)
+            if _is_boolean(node):
+                return translated
+            # Non-zero and not NaN (NaN != NaN), as fillna(False).astype(bool) does
+            return ast.BinOp(ast.Compare(translated, [ast.NotEq()], [ast.Constant(0)]), ast.BitAnd(),
+                             ast.Compare(translated, [ast.Eq()], [translated]))
+
+        def visit_BoolOp(self, node):
+            op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+            return reduce(lambda left, right: ast.BinOp(left, op, right), [self.truth(v) for v in node.values])
+
+        def visit_UnaryOp(self, node):
+            if isinstance(node.op, ast.Not):
+                return ast.UnaryOp(ast.Invert(), self.truth(node.operand))
+            self.generic_visit(node)
+            return node
+
+        def visit_Call(self, node):
+            if isinstance(node.func, ast.Name) and node.func.id == "where" and node.args:
+                node.args = [self.truth(node.args[0]), *(self.visit(arg) for arg in node.args[1:])]
+                return node
+            self.generic_visit(node)
+            return node
+
+        def visit_IfExp(self, node):
+            arguments = [self.truth(node.test), self.visit(node.body), self.visit(node.orelse)]
+            return ast.Call(ast.Name("where", ast.Load()), arguments, [])
+
+    allowed = (ast.Expression, ast.Name, ast.Load, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.IfExp,
+               ast.Compare, ast.Call, ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd,
+               *_BINARY, *_COMPARE)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            continue
+        if not isinstance(node, allowed) and not isinstance(node, (ast.operator, ast.cmpop, ast.unaryop, ast.boolop)):
+            return None
+        if isinstance(node, ast.Compare) and len(node.ops) > 1:
+            return None
+        if isinstance(node, (ast.FloorDiv, ast.Mod)):
+            return None  # numexpr differs from NumPy on negative operands
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.func.id not in _NUMEXPR_FUNCTIONS):
+            return None
+        if isinstance(node, ast.Name) and node.id in ("True", "False", "None", "col"):
+            return None
+    return ast.unparse(Translate().visit(ast.fix_missing_locations(ast.Expression(tree))))
+
+
+def _is_boolean(node: ast.AST) -> bool:
+    return isinstance(node, (ast.Compare, ast.BoolOp)) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not))
+
+
+def _as_bool(value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        return value.fillna(False).astype(bool) if value.dtype != bool else value
+    return value
+
+
+def _as_mask(value: Any, index: pd.Index) -> np.ndarray:
+    if isinstance(value, pd.Series):
+        return _as_bool(value).to_numpy()
+    return np.full(len(index), bool(value))
+
+
+def _where(condition: Any, when_true: Any, when_false: Any, index: pd.Index) -> pd.Series:
+    condition = _as_mask(condition, index)
+    if isinstance(when_true, pd.Series):
+        return when_true.where(condition, when_false)
+    if isinstance(when_false, pd.Series):
+        return when_false.where(~condition, when_true)
+    return pd.Series(np.where(condition, when_true, when_false), index=index)
+
+
+def _isin(values: Any, options: Any, negate: bool) -> Any:
+    options = list(options) if isinstance(options, (list, tuple, set)) else [options]
+    if isinstance(values, pd.Series):
+        mask = values.isin(options)
+        return ~mask & values.notna() if negate else mask
+    return (values not in options) if negate else (values in options)
+
+
+def _map(keys: Any, mapping: pd.Series, default: Any) -> Any:
+    if not isinstance(keys, pd.Series):
+        return mapping.get(keys, default)
+    mapped = keys.map(mapping)
+    return mapped if default is None else mapped.fillna(default)
+
+
+def _load_lookup(uri: str, key_column: str, value_column: str) -> pd.Series:
+    from .sources import FileSourceAdapter
+
+    fmt = uri.rsplit(".", 1)[-1].lower()
+    source = DataSource(name="lookup", kind="file", uri=uri, format=fmt if fmt != "pq" else "parquet",
+                        options={"columns": [key_column, value_column]})
+    frame = FileSourceAdapter().read(source).to_pandas()
+    return frame.drop_duplicates(key_column, keep="last").set_index(key_column)[value_column]
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        if pd.api.types.is_string_dtype(value.dtype) or isinstance(value.dtype, pd.CategoricalDtype):
+            return value.astype("string") if isinstance(value.dtype, pd.CategoricalDtype) else value
+        return value.astype("string")
+    return None if value is None else str(value)
+
+
+def _str_method(name: str, *extra: Any) -> Callable[..., Any]:
+    def apply(value: Any, *args: Any) -> Any:
+        text = _text(value)
+        if isinstance(text, pd.Series):
+            return getattr(text.str, name)(*extra, *args)
+        return None if text is None else getattr(text, name)(*extra, *args)
+    return apply
+
+
+def _datetime(value: Any) -> Any:
+    if isinstance(value, pd.Series) and pd.api.types.is_datetime64_any_dtype(value.dtype):
+        return value
+    return pd.to_datetime(value, errors="coerce")
+
+
+def _date_part(part: str) -> Callable[[Any], Any]:
+    def apply(value: Any) -> Any:
+        values = _datetime(value)
+        return getattr(values.dt, part) if isinstance(values, pd.Series) else getattr(values, part)
+    return apply
+
+
+def _concat(*values: Any) -> Any:
+    return reduce(operator.add, (_text(value) for value in values))
+
+
+def _coalesce(*values: Any) -> Any:
+    result = values[0]
+    for value in values[1:]:
+        if isinstance(result, pd.Series):
+            result = result.fillna(value) if not isinstance(value, pd.Series) else result.combine_first(value)
+        elif result is None or (isinstance(result, float) and np.isnan(result)):
+            result = value
+    return result
+
+
+def _zscore(values: pd.Series, mean: Any = None, std: Any = None) -> pd.Series:
+    # Without explicit mean/std the statistics are per batch; TransformPlan rejects that on chunks
+    mean = values.mean() if mean is None else mean
+    std = values.std() if std is None else std
+    return (values - mean) / std
+
+
+def _minmax(values: pd.Series, low: Any = None, high: Any = None) -> pd.Series:
+    low = values.min() if low is None else low
+    high = values.max() if high is None else high
+    return (values - low) / (high - low)
+
+
+def _round(value: Any, digits: int = 0) -> Any:
+    return value.round(digits) if isinstance(value, pd.Series) else round(value, digits)
+
+
+FUNCTIONS: dict[str, Callable[..., Any]] = {
+    # Cleansing
+    "strip": _str_method("strip"),
+    "lower": _str_method("lower"),
+    "upper": _str_method("upper"),
+    "title": _str_method("title"),
+    "len": _str_method("len"),
+    "replace": lambda value, old, new: _text(value).str.replace(old, new, regex=False),
+    "regex_replace": lambda value, pattern, new: _text(value).str.replace(pattern, new, regex=True),
+    "substr": lambda value, start, stop=None: _text(value).str.slice(start, stop),
+    "contains": lambda value, part: _text(value).str.contains(part, regex=False, na=False),
+    "matches": lambda value, pattern: _text(value).str.fullmatch(pattern).fillna(False).astype(bool),
+    "startswith": lambda value, prefix: _text(value).str.startswith(prefix, na=False),
+    "endswith": lambda value, suffix: _text(value).str.endswith(suffix, na=False),
+    "concat": _concat,
+    "coalesce": _coalesce,
+    "fillna": _coalesce,
+    "isnull": lambda value: pd.isna(value),
+    "notnull": lambda value: pd.notna(value),
+    "nullif": lambda value, empty: value.mask(value == empty) if isinstance(value, pd.Series) else (None if value == empty else value),
+    # Conversion
+    "to_number": lambda value: pd.to_numeric(value, errors="coerce"),
+    "to_str": _text,
+    "to_datetime": _datetime,
+    # Math
+    "abs": lambda value: np.abs(value),
+    "sqrt": lambda value: np.sqrt(value),
+    "log": lambda value: np.log(value),
+    "exp": lambda value: np.exp(value),
+    "floor": lambda value: np.floor(value),
+    "ceil": lambda value: np.ceil(value),
+    "round": _round,
+    "clip": lambda value, low=None, high=None: value.clip(low, high) if isinstance(value, pd.Series) else np.clip(value, low, high),
+    "where": lambda condition, when_true, when_false: _where(condition, when_true, when_false, condition.index),
+    # Normalization
+    "zscore": _zscore,
+    "minmax": _minmax,
+    # Dates
+    "year": _date_part("year"),
+    "month": _date_part("month"),
+    "day": _date_part("day"),
+    "weekday": _date_part("weekday"),
+    "hour": _date_part("hour"),
+    "days_between": lambda start, end: (_datetime(end) - _datetime(start)).dt.days,
+}
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Strings become `category` when distinct values are at most this share of the non-null rows
+DEFAULT_CATEGORY_MAX_RATIO = 0.5
+# Below this many rows category bookkeeping costs more than it saves
+CATEGORY_MIN_ROWS = 100
+
+ARROW_STRING_DTYPE = "string[pyarrow]"
+
+_SIGNED = (np.int8, np.int16, np.int32, np.int64)
+_UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+def optimize_memory(df: pd.DataFrame, options: Dict[str, Any] | bool | None = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Shrink a frame's dtypes and report bytes before/after.
+
+    - integers (numpy or nullable) go to the narrowest signed/unsigned width holding their range
+    - floats go to float32 only when every value round-trips exactly
+    - strings with few distinct values become `category`, the rest Arrow-backed `string[pyarrow]`
+
+    `options` (all optional): `downcast` (default True), `categories` (True),
+    `category_max_ratio` (0.5), `arrow_strings` (True, needs pyarrow).
+    Columns are replaced, never written into, so the input frame is untouched.
+    """
+    options = options if isinstance(options, dict) else {}
+    downcast = options.get("downcast", True)
+    categories = options.get("categories", True)
+    max_ratio = options.get("category_max_ratio", DEFAULT_CATEGORY_MAX_RATIO)
+    arrow_strings = options.get("arrow_strings", True) and _has_pyarrow()
+
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    conversions: Dict[str, str] = {}
+    columns: Dict[Any, pd.Series] = {}
+    for name in df.columns:
+        series = df[name]
+        target = None
+        if downcast and pd.api.types.is_integer_dtype(series.dtype):
+            target = _integer_target(series)
+        elif downcast and pd.api.types.is_float_dtype(series.dtype):
+            target = _float_target(series)
+        elif pd.api.types.is_object_dtype(series.dtype) or _is_python_string(series.dtype):
+            target = _string_target(series, categories, max_ratio, arrow_strings)
+        if target is not None and pd.api.types.pandas_dtype(target) != series.dtype:
+            columns[name] = series.astype(target)
+            conversions[str(name)] = f"{_label(series.dtype)}->{_label(columns[name].dtype)}"
+
+    if columns:
+        df = df.copy(deep=False)
+        for name, column in columns.items():
+            df[name] = column
+    bytes_after = int(df.memory_usage(deep=True).sum()) if columns else bytes_before
+    return df, {"bytes_before": bytes_before, "bytes_after": bytes_after, "columns": conversions}
+
+
+def estimate_nbytes(df: pd.DataFrame) -> int:
+    """Frame size with object columns estimated from ~1000 values (a deep scan costs as much as a group-by)."""
+    total = int(df.memory_usage(index=False).sum())
+    step = max(1, len(df) // 1000)
+    for position, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            sample = df.iloc[::step, position]
+            extra = sample.memory_usage(deep=True, index=False) - sample.memory_usage(index=False)
+            total += int(extra * len(df) / max(len(sample), 1))
+    return total
+
+
+def _integer_target(series: pd.Series) -> Any:
+    present = series.dropna()
+    if present.empty:
+        return None
+    low, high = int(present.min()), int(present.max())
+    candidates = _UNSIGNED if low >= 0 else _SIGNED
+    dtype = next(t for t in candidates if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable Int64 -> Int8/UInt16..., keeping the mask
+        return pd.api.types.pandas_dtype(np.dtype(dtype).name.capitalize().replace("Uint", "UInt"))
+    return dtype
+
+
+def _float_target(series: pd.Series) -> Any:
+    if series.dtype != np.float64:
+        return None
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(over="ignore", invalid="ignore"):
+        narrowed = values.astype(np.float32)
+    # Exact round trip (NaN positions included) means float32 loses nothing
+    same = (narrowed.astype(np.float64) == values) | (np.isnan(values) & np.isnan(narrowed))
+    if not same.all():
+        return None
+    return np.float32
+
+
+def _string_target(series: pd.Series, categories: bool, max_ratio: float, arrow_strings: bool) -> Any:
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+        return None  # Mixed objects (numbers, dicts...) stay as they are
+    present = series.count()
+    if present == 0:
+        return None
+    if categories and len(series) >= CATEGORY_MIN_ROWS and series.nunique(dropna=True) <= max_ratio * present:
+        return "category"
+    return ARROW_STRING_DTYPE if arrow_strings else None
+
+
+def _is_python_string(dtype: Any) -> bool:
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == "python"
+
+
+def _label(dtype: Any) -> str:
+    # str() of StringDtype hides the storage ("string" for both python and pyarrow)
+    return repr(dtype) if isinstance(dtype, pd.StringDtype) else str(dtype)
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Protocol
+from urllib.parse import urlparse
+
+# Bytes per ranged GET; large enough to amortise request latency, small enough to parallelise
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    bucket: str
+    key: str
+    size: int
+
+    @property
+    def url(self) -> str:
+        return f"s3://{self.bucket}/{self.key}"
+
+
+class ObjectStore(Protocol):
+    def list(self, bucket: str, prefix: str) -> List[ObjectInfo]:
+        ...
+
+    def get_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        """Bytes [start, end) of an object."""
+        ...
+
+
+class Boto3ObjectStore:
+    """S3 API client (AWS, MinIO, moto, or GCS through its S3-compatible endpoint).
+
+    Keyword arguments go to `boto3.client("s3", ...)`, e.g. `endpoint_url`,
+    `region_name` or credentials. boto3 clients are thread-safe, so one client
+    serves every ranged GET of the pool.
+    """
+
+    def __init__(self, client: Any = None, **client_kwargs: Any):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise ImportError("S3 sources require boto3 (pip install boto3)") from e
+            client = boto3.client("s3", **client_kwargs)
+        self.client = client
+
+    def list(self, bucket: str, prefix: str) -> List[ObjectInfo]:
+        objects: List[ObjectInfo] = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+            objects += [ObjectInfo(bucket, item["Key"], item["Size"]) for item in page.get("Contents", [])]
+        return objects
+
+    def get_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        response = self.client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end - 1}")
+        return response["Body"].read()
+
+
+class LocalObjectStore:
+    """Object store backed by a local directory (`root/bucket/key`), for offline runs and tests."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def list(self, bucket: str, prefix: str) -> List[ObjectInfo]:
+        base = self.root / bucket
+        objects = [
+            ObjectInfo(bucket, path.relative_to(base).as_posix(), path.stat().st_size)
+            for path in base.rglob("*")
+            if path.is_file()
+        ]
+        return sorted((o for o in objects if o.key.startswith(prefix)), key=lambda o: o.key)
+
+    def get_range(self, bucket: str, key: str, start: int, end: int) -> bytes:
+        with open(self.root / bucket / key, "rb") as handle:
+            handle.seek(start)
+            return handle.read(end - start)
+
+
+def parse_url(url: str) -> tuple[str, str]:
+    """`s3://bucket/key` or `gs://bucket/key` -> (bucket, key)."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("s3", "s3a", "gs", "gcs") or not parsed.netloc:
+        raise ValueError(f"Unsupported object store URL: {url}")
+    return parsed.netloc, parsed.path.lstrip("/")
+
+
+class RangedObjectFile(io.RawIOBase):
+    """Seekable read-only file over an object, fetched as parallel ranged GETs.
+
+    Reads are split into `part_size` parts; the parts covering a read plus a
+    read-ahead window of `window` parts are requested concurrently on `pool`,
+    so sequential consumers (CSV) and large column-chunk reads (Parquet) keep
+    several requests in flight. Parts behind the read position are released,
+    which bounds memory to roughly `(window + 1) * part_size`.
+    """
+
+    def __init__(self, store: ObjectStore, info: ObjectInfo, pool: ThreadPoolExecutor,
+                 part_size: int = DEFAULT_PART_SIZE, window: int = DEFAULT_MAX_WORKERS):
+        self.store = store
+        self.info = info
+        self.pool = pool
+        self.part_size = part_size
+        self.window = window
+        self._position = 0
+        self._parts: Dict[int, Future] = {}
+        self._part_count = -(-info.size // part_size)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.info.size
+        self._position = max(0, offset)
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), self.info.size - self._position)
+        if size <= 0:
+            return 0
+        first = self._position // self.part_size
+        last = (self._position + size - 1) // self.part_size
+        self._request(first, last + self.window)
+
+        view = memoryview(buffer)
+        written = 0
+        for index in range(first, last + 1):
+            part = self._parts[index].result()
+            start = self._position + written - index * self.part_size
+            chunk = part[start:start + size - written]
+            view[written:written + len(chunk)] = chunk
+            written += len(chunk)
+        self._position += written
+        # Parts before the current one are not needed for forward reads
+        for index in [i for i in self._parts if i < self._position // self.part_size]:
+            del self._parts[index]
+        return written
+
+    def _request(self, first: int, last: int) -> None:
+        for index in range(first, min(last, self._part_count - 1) + 1):
+            if index not in self._parts:
+                start = index * self.part_size
+                end = min(start + self.part_size, self.info.size)
+                self._parts[index] = self.pool.submit(
+                    self.store.get_range, self.info.bucket, self.info.key, start, end
+                )
+
+    def close(self) -> None:
+        for future in self._parts.values():
+            future.cancel()
+        self._parts.clear()
+        super().close()
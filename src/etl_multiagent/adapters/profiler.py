@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataBatch
+from .sketches import DEFAULT_HLL_PRECISION, HyperLogLog, _plain, hash_values
+
+# Distinct values are counted exactly (as a set of 64-bit hashes) up to this many, then by HyperLogLog
+DEFAULT_EXACT_DISTINCT_LIMIT = 100_000
+# Same for whole rows (duplicate count); 5M hashes take 40 MB
+DEFAULT_EXACT_ROW_LIMIT = 5_000_000
+# Row-level HyperLogLog is finer: duplicates are a difference of two large counts
+ROW_HLL_PRECISION = 16
+# Values kept per numeric column for quantiles, histogram and outlier fences
+DEFAULT_PROFILE_SAMPLE_SIZE = 100_000
+DEFAULT_HISTOGRAM_BINS = 10
+DEFAULT_TOP_K = 5
+PROFILE_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+OUTLIER_IQR_FACTOR = 1.5
+
+# FNV-1a prime, used to fold column hashes into one hash per row
+_ROW_HASH_PRIME = np.uint64(0x100000001B3)
+# Stand-in hash for nulls of factorized columns
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+class DistinctCounter:
+    """Exact distinct count over value hashes that turns into a HyperLogLog past `exact_limit`."""
+
+    def __init__(self, exact_limit: int = DEFAULT_EXACT_DISTINCT_LIMIT, precision: int = DEFAULT_HLL_PRECISION):
+        self.exact_limit = exact_limit
+        self.precision = precision
+        # Per-batch unique hashes, deduplicated together only when their total passes the limit
+        self.pending: list[np.ndarray] = []
+        self.pending_size = 0
+        self.sketch: Optional[HyperLogLog] = None
+
+    @property
+    def approximate(self) -> bool:
+        return self.sketch is not None
+
+    def add_hashes(self, hashes: np.ndarray, unique: bool = False) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not unique:
+            hashes = pd.unique(hashes)
+        if self.sketch is not None:
+            self.sketch.add_hashes(hashes)
+            return
+        self.pending.append(hashes)
+        self.pending_size += len(hashes)
+        if self.pending_size > self.exact_limit:
+            self._compact()
+
+    def merge(self, other: DistinctCounter) -> None:
+        if other.sketch is None:
+            for hashes in other.pending:
+                self.add_hashes(hashes, unique=True)
+            return
+        if self.sketch is None:
+            self._to_sketch()
+        self.sketch.merge(other.sketch)
+
+    def estimate(self) -> int:
+        if self.sketch is not None:
+            return self.sketch.estimate()
+        self._compact()
+        return self.pending_size
+
+    def error_bound(self) -> int:
+        """Two standard errors of the estimate (0 while exact)."""
+        if self.sketch is None:
+            return 0
+        return int(2 * 1.04 / math.sqrt(1 << self.precision) * self.sketch.estimate())
+
+    def _compact(self) -> None:
+        if len(self.pending) > 1:
+            self.pending = [pd.unique(np.concatenate(self.pending))]
+            self.pending_size = len(self.pending[0])
+        if self.pending_size > self.exact_limit:
+            self._to_sketch()
+
+    def _to_sketch(self) -> None:
+        self.sketch = HyperLogLog(self.precision)
+        for hashes in self.pending:
+            self.sketch.add_hashes(hashes)
+        self.pending, self.pending_size = [], 0
+
+
+class ColumnProfile:
+    """Mergeable single-pass statistics of one column.
+
+    Counts, bounds and moments (mean/variance merged with Chan's formula) are
+    exact; quantiles, histogram and outliers come from a uniform sample of
+    `sample_size` values (bottom-k of random priorities, so samples merge) and
+    are exact while the column fits in it. Non-numeric columns are factorized
+    once: the codes give top values and only the uniques are hashed. Top values
+    are exact per batch and truncated to `10 * top_k` candidates between batches.
+    """
+
+    def __init__(
+        self,
+        exact_limit: int = DEFAULT_EXACT_DISTINCT_LIMIT,
+        precision: int = DEFAULT_HLL_PRECISION,
+        sample_size: int = DEFAULT_PROFILE_SAMPLE_SIZE,
+        top_k: int = DEFAULT_TOP_K,
+        seed: int = 0,
+    ):
+        self.sample_size = sample_size
+        self.top_k = top_k
+        self.dtype: Optional[str] = None
+        self.count = 0
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.distinct = DistinctCounter(exact_limit, precision)
+        self.sample = np.empty(0, dtype=np.float64)
+        self.priorities = np.empty(0, dtype=np.float64)
+        self.top: Dict[Any, int] = {}
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, series: pd.Series) -> np.ndarray:
+        """Fold `series` in and return its 64-bit value hashes (for row hashing)."""
+        self.dtype = self.dtype or str(series.dtype)
+        kind = _kind(series.dtype)
+        self.count += len(series)
+        if kind not in ("numeric", "datetime"):
+            return self._update_factorized(series)
+
+        present = series.notna().to_numpy()
+        self.nulls += int(len(series) - present.sum())
+        hashes = hash_values(series)
+        values = series[present] if not present.all() else series
+        if values.empty:
+            return hashes
+        self._update_bounds(values.min(), values.max())
+        if kind == "numeric":
+            self._update_moments(values.to_numpy(dtype=np.float64))
+        self.distinct.add_hashes(hashes[present])
+        return hashes
+
+    def _update_factorized(self, series: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        nulls = codes < 0
+        self.nulls += int(nulls.sum())
+        unique_hashes = hash_values(pd.Series(uniques))
+        self.distinct.add_hashes(unique_hashes, unique=True)
+        if self.top_k and len(uniques):
+            counts = np.bincount(codes[~nulls], minlength=len(uniques))
+            limit = 10 * self.top_k
+            keep = np.argpartition(counts, -limit)[-limit:] if len(counts) > limit else np.arange(len(counts))
+            self._update_top(pd.Series(counts[keep], index=pd.Index(np.asarray(uniques)[keep], dtype=object)))
+        hashes = np.full(len(series), _NULL_HASH, dtype=np.uint64)
+        hashes[~nulls] = unique_hashes[codes[~nulls]]
+        return hashes
+
+    def merge(self, other: ColumnProfile) -> None:
+        self.dtype = self.dtype or other.dtype
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.min is not None:
+            self._update_bounds(other.min, other.max)
+        if other.n:
+            self._merge_moments(other.n, other.mean, other.m2)
+            self._add_sample(other.sample, other.priorities)
+        if other.top:
+            self._update_top(pd.Series(other.top))
+        self.distinct.merge(other.distinct)
+
+    def to_dict(self, bins: int = DEFAULT_HISTOGRAM_BINS) -> Dict[str, Any]:
+        profile: Dict[str, Any] = {
+            "dtype": self.dtype,
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_pct": round(100 * self.nulls / self.count, 4) if self.count else 0.0,
+            "distinct": self.distinct.estimate(),
+            "distinct_approx": self.distinct.approximate,
+        }
+        if self.min is not None:
+            profile.update(min=_plain(self.min), max=_plain(self.max))
+        if self.n:
+            profile.update(self._distribution(bins))
+        if self.top and max(self.top.values()) > 1:
+            ranked = sorted(self.top.items(), key=lambda item: item[1], reverse=True)[: self.top_k]
+            profile["top_values"] = [[_plain(value), int(count)] for value, count in ranked]
+        return profile
+
+    def _update_bounds(self, low: Any, high: Any) -> None:
+        try:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            self.min = self.max = None
+
+    def _update_moments(self, values: np.ndarray) -> None:
+        finite = values[np.isfinite(values)]
+        if len(finite):
+            self._merge_moments(len(finite), float(finite.mean()), float(((finite - finite.mean()) ** 2).sum()))
+            self._add_sample(finite, self._rng.random(len(finite)))
+
+    def _merge_moments(self, n: int, mean: float, m2: float) -> None:
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def _add_sample(self, values: np.ndarray, priorities: np.ndarray) -> None:
+        values = np.concatenate([self.sample, values])
+        priorities = np.concatenate([self.priorities, priorities])
+        if len(values) > self.sample_size:
+            keep = np.argpartition(priorities, self.sample_size)[: self.sample_size]
+            values, priorities = values[keep], priorities[keep]
+        self.sample, self.priorities = values, priorities
+
+    def _update_top(self, counts: pd.Series) -> None:
+        if self.top:
+            counts = counts.add(pd.Series(self.top), fill_value=0)
+        self.top = counts.nlargest(10 * self.top_k).to_dict()
+
+    def _distribution(self, bins: int) -> Dict[str, Any]:
+        sample = self.sample
+        scale = self.n / len(sample)
+        quantiles = np.quantile(sample, PROFILE_QUANTILES)
+        q1, q3 = np.quantile(sample, (0.25, 0.75))
+        lower, upper = q1 - OUTLIER_IQR_FACTOR * (q3 - q1), q3 + OUTLIER_IQR_FACTOR * (q3 - q1)
+        counts, edges = np.histogram(sample, bins=bins)
+        return {
+            "mean": self.mean,
+            "std": math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0,
+            "quantiles": {f"p{round(q * 100):02d}": float(v) for q, v in zip(PROFILE_QUANTILES, quantiles)},
+            "histogram": {"edges": edges.tolist(), "counts": [int(round(c * scale)) for c in counts]},
+            "outliers": {
+                "method": "iqr",
+                "lower": float(lower),
+                "upper": float(upper),
+                "count": int(round(np.count_nonzero((sample < lower) | (sample > upper)) * scale)),
+            },
+            "sampled": len(sample) < self.n,
+        }
+
+
+class DataProfiler:
+    """Profiles batches in one vectorized pass per column; profilers merge across chunks and partitions.
+
+    Each column is hashed once: the hashes feed its distinct counter and are
+    folded into row hashes for the duplicate count, which is exact while the
+    distinct rows fit `exact_row_limit` and estimated from HyperLogLog beyond
+    (`duplicates_approx`, with `duplicates_error` as a two-sigma bound).
+    """
+
+    def __init__(
+        self,
+        exact_distinct_limit: int = DEFAULT_EXACT_DISTINCT_LIMIT,
+        exact_row_limit: int = DEFAULT_EXACT_ROW_LIMIT,
+        precision: int = DEFAULT_HLL_PRECISION,
+        sample_size: int = DEFAULT_PROFILE_SAMPLE_SIZE,
+        histogram_bins: int = DEFAULT_HISTOGRAM_BINS,
+        top_k: int = DEFAULT_TOP_K,
+        seed: int = 0,
+    ):
+        self.exact_distinct_limit = exact_distinct_limit
+        self.precision = precision
+        self.sample_size = sample_size
+        self.histogram_bins = histogram_bins
+        self.top_k = top_k
+        self.seed = seed
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.row_distinct = DistinctCounter(exact_row_limit, ROW_HLL_PRECISION)
+
+    def update(self, batch: DataBatch) -> None:
+        df = batch.to_pandas()
+        self.rows += len(df)
+        row_hashes = np.zeros(len(df), dtype=np.uint64)
+        for position, name in enumerate(df.columns):
+            series = df.iloc[:, position]
+            column = self.columns.get(str(name))
+            if column is None:
+                column = self.columns[str(name)] = ColumnProfile(
+                    self.exact_distinct_limit, self.precision, self.sample_size, self.top_k,
+                    seed=self.seed + position,
+                )
+            row_hashes = row_hashes * _ROW_HASH_PRIME ^ column.update(series)
+        self.row_distinct.add_hashes(row_hashes)
+
+    def merge(self, other: DataProfiler) -> None:
+        self.rows += other.rows
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        self.row_distinct.merge(other.row_distinct)
+
+    def profile(self) -> Dict[str, Any]:
+        distinct_rows = min(self.row_distinct.estimate(), self.rows)
+        profile = {
+            "rows": self.rows,
+            "column_count": len(self.columns),
+            "duplicates": self.rows - distinct_rows,
+            "duplicates_approx": self.row_distinct.approximate,
+        }
+        if self.row_distinct.approximate:
+            profile["duplicates_error"] = self.row_distinct.error_bound()
+        profile["columns"] = {name: column.to_dict(self.histogram_bins) for name, column in self.columns.items()}
+        return profile
+
+
+def _kind(dtype: Any) -> str:
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "other"
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataBatch
+from .rules import RULE_CHECKS, RuleSet, compile_rules
+
+DEFAULT_QUARANTINE_PATH = "outputs/etl_quarantine.jsonl"
+
+# Columns added to every quarantined row
+QUARANTINE_REASON_COLUMN = "_quarantine_reason"
+QUARANTINE_STAGE_COLUMN = "_quarantine_stage"
+# Source chunk of the row, for streamed runs
+QUARANTINE_CHUNK_COLUMN = "_quarantine_chunk"
+# Joins the reason codes of a row failing several checks
+REASON_SEPARATOR = ";"
+
+
+def cast_failures(df: pd.DataFrame, target_schema: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Mask per `cast:<column>` of the rows whose value cannot be cast to the target dtype.
+
+    Reuses the `type_checks` masks; nulls also fail for NumPy integer and bool
+    targets, which cannot hold them.
+    """
+    casts = {col: str(dtype) for col, dtype in target_schema.items() if col in df.columns}
+    masks = compile_rules({"type_checks": casts}).masks(df)
+    failures = {}
+    for col, dtype in casts.items():
+        mask = masks[f"type_checks:{col}"]
+        target = pd.api.types.pandas_dtype(dtype)
+        if isinstance(target, np.dtype) and target.kind in "iub":
+            mask = mask | df[col].isna().to_numpy()
+        failures[f"cast:{col}"] = mask
+    return failures
+
+
+def split_rows(
+    df: pd.DataFrame, masks: Dict[str, np.ndarray], stage: str
+) -> Tuple[np.ndarray, Optional[pd.DataFrame]]:
+    """Combine failure masks; return the keep mask and the failing rows tagged with their reason codes."""
+    failed = np.zeros(len(df), dtype=bool)
+    for mask in masks.values():
+        failed |= mask
+    if not failed.any():
+        return ~failed, None
+    reasons = np.full(int(failed.sum()), "", dtype=object)
+    for code, mask in masks.items():
+        hit = mask[failed]
+        reasons[hit] += code + REASON_SEPARATOR
+    quarantined = df[failed].assign(**{
+        QUARANTINE_REASON_COLUMN: pd.Series(reasons, index=df.index[failed]).str.rstrip(REASON_SEPARATOR),
+        QUARANTINE_STAGE_COLUMN: stage,
+    })
+    return ~failed, quarantined
+
+
+class QuarantineAdapter:
+    """Row-level error isolation: failing rows go to a dead-letter file, good rows continue.
+
+    `split` evaluates the declarative validation rules (`type_checks`,
+    `range_checks`, `pattern_checks`, `referential_integrity`) as vectorized
+    masks and removes the violating rows from the batch; `write` appends rows
+    quarantined elsewhere (e.g. failed casts, see `PandasTransformAdapter`).
+    Each quarantined row keeps its columns plus `_quarantine_reason` (codes
+    such as `cast:amount;range_checks:age`) and `_quarantine_stage`, and
+    `_quarantine_chunk` when it comes from a chunk of a streamed run.
+
+    The dead-letter file is JSON Lines, one object per row, so rows set aside
+    before and after a transform (different columns) share one file and keep
+    their raw values. It is replaced by the first write of each adapter and
+    appended to afterwards (from the start with `append`, or after
+    `keep_chunks` when a run resumes); `report()` counts rows per reason code.
+    """
+
+    def __init__(self, uri: str, append: bool = False):
+        self.uri = uri
+        self.append = append
+        self.rows = 0
+        self.reasons: Dict[str, int] = {}
+        self._started = False
+        self._lock = threading.Lock()
+        # Compiled rule sets keyed by their rules spec, reused across batches
+        self._rulesets: Dict[str, RuleSet] = {}
+
+    def split(self, batch: DataBatch, rules: Dict[str, Any], stage: str = "validation") -> DataBatch:
+        if not any(rules.get(check) for check in RULE_CHECKS) or batch.num_rows == 0:
+            return batch
+        df = batch.to_pandas()
+        keep, quarantined = split_rows(df, self._ruleset(rules).masks(df), stage)
+        if quarantined is None:
+            return batch
+        chunk = {"chunk_index": batch.metadata["chunk_index"]} if "chunk_index" in batch.metadata else {}
+        self.write(DataBatch(raw=quarantined, metadata=chunk))
+        if batch.is_arrow:
+            import pyarrow as pa
+
+            raw = batch.to_arrow().filter(pa.array(keep))
+        else:
+            raw = df[keep]
+        return DataBatch(
+            raw=raw,
+            schema=batch.schema,
+            stats={**(batch.stats or {}), "rows": int(keep.sum())},
+            metadata={**batch.metadata, "quarantined_rows": len(quarantined)},
+        )
+
+    def write(self, quarantined: DataBatch) -> None:
+        df = quarantined.to_pandas()
+        if df.empty:
+            return
+        if "chunk_index" in quarantined.metadata:
+            df = df.assign(**{QUARANTINE_CHUNK_COLUMN: quarantined.metadata["chunk_index"]})
+        with self._lock:
+            path = Path(self.uri)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a" if self._started or self.append else "w", encoding="utf-8") as handle:
+                df.to_json(handle, orient="records", lines=True, date_format="iso", default_handler=str)
+            self._started = True
+            self.rows += len(df)
+            for code, count in df[QUARANTINE_REASON_COLUMN].str.split(REASON_SEPARATOR).explode().value_counts().items():
+                self.reasons[code] = self.reasons.get(code, 0) + int(count)
+
+    def keep_chunks(self, chunks: Iterable[int]) -> None:
+        """Resume an interrupted streamed run: keep only the rows of `chunks` (the committed ones), then append.
+
+        Chunks that were quarantined but never committed run again, and their
+        rows would otherwise be written twice.
+        """
+        chunks = set(chunks)
+        path = Path(self.uri)
+        with self._lock:
+            if path.exists():
+                staging = path.with_name(f".{path.name}.tmp")
+                with open(path, encoding="utf-8") as rows, open(staging, "w", encoding="utf-8") as kept:
+                    for line in rows:
+                        if line.strip() and json.loads(line).get(QUARANTINE_CHUNK_COLUMN) in chunks:
+                            kept.write(line)
+                os.replace(staging, path)
+            self.append = True
+
+    def report(self) -> Dict[str, Any]:
+        return {"path": self.uri if self._started else None, "rows": self.rows, "reasons": dict(self.reasons)}
+
+    def _ruleset(self, rules: Dict[str, Any]) -> RuleSet:
+        key = json.dumps({check: rules.get(check) for check in RULE_CHECKS}, sort_keys=True, default=str)
+        if key not in self._rulesets:
+            self._rulesets[key] = compile_rules(rules)
+        return self._rulesets[key]
+
+
+def merge_quarantine_reports(reports: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Combine the reports of several adapters, e.g. one per partition worker."""
+    merged: Dict[str, Any] = {"paths": [], "rows": 0, "reasons": {}}
+    for report in reports:
+        if not report:
+            continue
+        if report["path"]:
+            merged["paths"].append(report["path"])
+        merged["rows"] += report["rows"]
+        for code, count in report["reasons"].items():
+            merged["reasons"][code] = merged["reasons"].get(code, 0) + count
+    return merged
+
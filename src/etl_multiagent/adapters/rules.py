@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataSource
+
+# Number of offending row labels kept per rule in validation reports
+DEFAULT_SAMPLE_SIZE = 5
+
+RULE_CHECKS = ("type_checks", "range_checks", "pattern_checks", "referential_integrity")
+
+_TRUE_TOKENS = {"true", "t", "yes", "y", "1"}
+_FALSE_TOKENS = {"false", "f", "no", "n", "0"}
+
+
+@dataclass
+class CompiledRule:
+    """A single column check compiled to a vectorized violation mask."""
+    check: str
+    column: str
+    description: str
+    mask: Callable[[pd.Series], pd.Series]
+
+    @property
+    def name(self) -> str:
+        return f"{self.check}:{self.column}"
+
+
+class RuleSet:
+    """Declarative validation rules compiled once and evaluated per batch.
+
+    Each rule maps a column to a boolean mask of violating rows computed with
+    pandas/NumPy column operations; no Python-level loop touches the rows.
+    """
+
+    def __init__(self, rules: list[CompiledRule], sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.rules = rules
+        self.sample_size = sample_size
+
+    def evaluate(self, df: pd.DataFrame) -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        for rule in self.rules:
+            entry: dict[str, Any] = {"check": rule.check, "column": rule.column, "description": rule.description}
+            if rule.column not in df.columns:
+                entry.update(count=len(df), sample_rows=[], error="column not found")
+            else:
+                mask = rule.mask(df[rule.column]).to_numpy(dtype=bool, na_value=False)
+                entry["count"] = int(mask.sum())
+                entry["sample_rows"] = df.index[mask][: self.sample_size].tolist()
+            results[rule.name] = entry
+        return results
+
+    def masks(self, df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """Violation mask per rule name; rules on missing columns are left out."""
+        return {
+            rule.name: rule.mask(df[rule.column]).to_numpy(dtype=bool, na_value=False)
+            for rule in self.rules
+            if rule.column in df.columns
+        }
+
+
+def compile_rules(rules: dict[str, Any], sample_size: int = DEFAULT_SAMPLE_SIZE) -> RuleSet:
+    compiled: list[CompiledRule] = []
+    for column, dtype in rules.get("type_checks", {}).items():
+        compiled.append(_type_rule(column, dtype))
+    for column, bounds in rules.get("range_checks", {}).items():
+        compiled.append(_range_rule(column, bounds))
+    for column, pattern in rules.get("pattern_checks", {}).items():
+        compiled.append(_pattern_rule(column, pattern))
+    for column, reference in rules.get("referential_integrity", {}).items():
+        compiled.append(_reference_rule(column, reference))
+    return RuleSet(compiled, sample_size=sample_size)
+
+
+def _type_rule(column: str, dtype: str) -> CompiledRule:
+    target = pd.api.types.pandas_dtype(dtype) if dtype not in ("bool", "boolean") else np.dtype(bool)
+
+    if pd.api.types.is_bool_dtype(target):
+        def mask(series: pd.Series) -> pd.Series:
+            if pd.api.types.is_bool_dtype(series.dtype):
+                return pd.Series(False, index=series.index)
+            tokens = series.astype("string").str.strip().str.lower()
+            return series.notna() & ~tokens.isin(_TRUE_TOKENS | _FALSE_TOKENS)
+    elif pd.api.types.is_datetime64_any_dtype(target):
+        def mask(series: pd.Series) -> pd.Series:
+            if pd.api.types.is_datetime64_any_dtype(series.dtype):
+                return pd.Series(False, index=series.index)
+            return series.notna() & pd.to_datetime(series, errors="coerce").isna()
+    elif pd.api.types.is_numeric_dtype(target):
+        integer = pd.api.types.is_integer_dtype(target)
+
+        def mask(series: pd.Series) -> pd.Series:
+            values = pd.to_numeric(series, errors="coerce")
+            invalid = series.notna() & values.isna()
+            if integer:
+                info = np.iinfo(target)
+                invalid |= values.notna() & ((values % 1 != 0) | (values < info.min) | (values > info.max))
+            return invalid
+    else:
+        def mask(series: pd.Series) -> pd.Series:
+            return pd.Series(False, index=series.index)
+
+    return CompiledRule("type_checks", column, f"{column}: values not castable to {dtype}", mask)
+
+
+def _range_rule(column: str, bounds: dict[str, Any]) -> CompiledRule:
+    lower, upper = bounds.get("min"), bounds.get("max")
+
+    def mask(series: pd.Series) -> pd.Series:
+        invalid = pd.Series(False, index=series.index)
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values = series
+        else:
+            values = pd.to_numeric(series, errors="coerce")
+            # A value that is not a number cannot be inside the range
+            invalid |= series.notna() & values.isna()
+        if lower is not None:
+            invalid |= values < lower
+        if upper is not None:
+            invalid |= values > upper
+        return invalid
+
+    return CompiledRule("range_checks", column, f"{column}: values outside range [{lower}, {upper}]", mask)
+
+
+def _pattern_rule(column: str, pattern: str) -> CompiledRule:
+    re.compile(pattern)  # Fail at compile time on invalid expressions
+
+    def mask(series: pd.Series) -> pd.Series:
+        return series.notna() & ~_fullmatch(series, pattern)
+
+    return CompiledRule("pattern_checks", column, f"{column}: values not matching {pattern!r}", mask)
+
+
+def _reference_rule(column: str, reference: Any) -> CompiledRule:
+    allowed = pd.Index(_reference_values(reference)).unique()
+
+    def mask(series: pd.Series) -> pd.Series:
+        # Hash-based membership; the reference index is built once at compile time
+        return series.notna() & ~series.isin(allowed)
+
+    return CompiledRule("referential_integrity", column, f"{column}: values missing from reference set", mask)
+
+
+def _reference_values(reference: Any) -> list[Any]:
+    if isinstance(reference, (list, tuple, set)):
+        return list(reference)
+    if isinstance(reference, dict):
+        if "values" in reference:
+            return list(reference["values"])
+        if "uri" in reference:
+            from .sources import FileSourceAdapter
+
+            source = DataSource(
+                name="reference",
+                kind="file",
+                uri=reference["uri"],
+                format=reference.get("format", "csv"),
+                options={"columns": [reference["column"]]},
+            )
+            return FileSourceAdapter().read(source).raw[reference["column"]].dropna().tolist()
+    raise ValueError(f"Unsupported referential_integrity spec: {reference!r}")
+
+
+def _fullmatch(series: pd.Series, pattern: str) -> pd.Series:
+    # Arrow-backed strings run the regex in compiled code (RE2) instead of per object;
+    # patterns RE2 cannot handle fall back to Python's engine.
+    try:
+        matched = series.astype("string[pyarrow]").str.fullmatch(pattern)
+    except Exception:
+        matched = series.astype("string").str.fullmatch(pattern)
+    return matched.fillna(False).astype(bool)
+
+
+def violation_issues(violations: dict[str, dict[str, Any]]) -> list[str]:
+    issues = []
+    for entry in violations.values():
+        if entry.get("error"):
+            issues.append(f"{entry['column']}: {entry['error']}")
+        elif entry["count"] > 0:
+            issues.append(f"{entry['description']} ({entry['count']} rows)")
+    return issues
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .file_lock import file_lock
+
+DEFAULT_SCHEMA_REGISTRY_PATH = "outputs/etl_schemas.json"
+DEFAULT_SAMPLE_ROWS = 1000
+# Extra samples taken at random offsets (CSV) or random row groups (Parquet/Feather)
+DEFAULT_SAMPLE_BLOCKS = 4
+
+# Strings become `category` when distinct values stay below both limits
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_VALUES = 1000
+
+# Integers get int32 only with headroom over the sampled range; unseen rows may be larger
+_INT32_SAFE_LIMIT = 2 ** 27
+
+_INTEGER_PATTERN = re.compile(r"^[+-]?\d+$")
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$")
+_BOOLEAN_VALUES = {"true", "false"}
+
+
+@dataclass
+class InferredSchema:
+    """Compact dtypes for a source, as pandas dtype names (`Int32`, `category`, `datetime64[ns]`...)."""
+    uri: str
+    format: str
+    columns: Dict[str, str]
+    sample_rows: int
+    inferred_at: float
+
+    @property
+    def datetime_columns(self) -> List[str]:
+        return [name for name, dtype in self.columns.items() if dtype.startswith("datetime64")]
+
+
+class SchemaInferrer:
+    """Infer compact dtypes from a sample instead of a full parse.
+
+    The sample is the first `sample_rows` rows plus `sample_blocks` extra
+    blocks drawn at random: byte offsets for CSV (each block starts at the next
+    line break), row groups for Parquet, record-batch ranges for Feather.
+    Integers and booleans use numpy dtypes unless the sample has missing values
+    (nullable `Int32`/`boolean` parse markedly slower); a later row that does not
+    fit makes the reader fall back. Low-cardinality strings become `category`.
+    """
+
+    def __init__(
+        self,
+        sample_rows: int = DEFAULT_SAMPLE_ROWS,
+        sample_blocks: int = DEFAULT_SAMPLE_BLOCKS,
+        seed: int = 0,
+    ):
+        self.sample_rows = sample_rows
+        self.sample_blocks = sample_blocks
+        self.seed = seed
+
+    def infer(self, path: str | Path, fmt: str) -> InferredSchema:
+        path = Path(path)
+        if fmt == "csv":
+            sample = self._sample_csv(path)
+            columns = {name: infer_text_dtype(sample[name]) for name in sample.columns}
+        elif fmt in ("parquet", "feather"):
+            sample = self._sample_columnar(path, fmt)
+            columns = {name: _compact_dtype(sample[name]) for name in sample.columns}
+        elif fmt in ("xlsx", "xls"):
+            sample = pd.read_excel(path, nrows=self.sample_rows)
+            columns = {name: _compact_dtype(sample[name]) for name in sample.columns}
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+        return InferredSchema(uri=str(path), format=fmt, columns=columns,
+                              sample_rows=len(sample), inferred_at=time.time())
+
+    def _sample_csv(self, path: Path) -> pd.DataFrame:
+        head = pd.read_csv(path, nrows=self.sample_rows, dtype=str)
+        frames = [head]
+        size = path.stat().st_size
+        with open(path, "rb") as handle:
+            # Skip the header and the rows already in the head sample
+            for _ in range(len(head) + 1):
+                handle.readline()
+            start = handle.tell()
+            if size - start <= 0 or self.sample_blocks <= 0:
+                return head
+            rng = np.random.default_rng(self.seed)
+            block_rows = max(1, self.sample_rows // self.sample_blocks)
+            for offset in sorted(rng.integers(start, size, size=self.sample_blocks)):
+                handle.seek(int(offset))
+                handle.readline()  # Land on the next full line
+                lines = [handle.readline() for _ in range(block_rows)]
+                text = b"".join(line for line in lines if line).decode("utf-8", errors="replace")
+                if not text:
+                    continue
+                frames.append(pd.read_csv(io.StringIO(text), header=None, names=list(head.columns),
+                                          dtype=str, on_bad_lines="skip"))
+        return pd.concat(frames, ignore_index=True)
+
+    def _sample_columnar(self, path: Path, fmt: str) -> pd.DataFrame:
+        import pyarrow as pa
+
+        rng = np.random.default_rng(self.seed)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(path)
+            groups = list(range(1, parquet.num_row_groups))
+            picked = sorted(rng.choice(groups, size=min(self.sample_blocks, len(groups)), replace=False)) if groups else []
+            tables = [_first_rows(parquet, [0], self.sample_rows)]
+            tables += [_first_rows(parquet, [int(group)], self.sample_rows) for group in picked]
+            return pa.concat_tables(tables).to_pandas()
+
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path, memory_map=True)
+        slices = [table.slice(0, self.sample_rows)]
+        if table.num_rows > self.sample_rows:
+            for offset in rng.integers(self.sample_rows, table.num_rows, size=self.sample_blocks):
+                slices.append(table.slice(int(offset), self.sample_rows // max(self.sample_blocks, 1)))
+        return pa.concat_tables(slices).to_pandas()
+
+
+def _first_rows(parquet: Any, row_groups: List[int], rows: int) -> Any:
+    import pyarrow as pa
+
+    batch = next(parquet.iter_batches(batch_size=rows, row_groups=row_groups), None)
+    return pa.Table.from_batches([batch]) if batch is not None else parquet.schema_arrow.empty_table()
+
+
+def infer_text_dtype(values: pd.Series) -> str:
+    """Narrowest dtype that parses every sampled string of a column."""
+    present = values.dropna()
+    if present.empty:
+        return "object"
+    text = present.astype(str).str.strip()
+    nullable = len(present) < len(values)
+    if text.str.lower().isin(_BOOLEAN_VALUES).all():
+        return "boolean" if nullable else "bool"
+    if text.str.match(_INTEGER_PATTERN).all():
+        return _integer_dtype(pd.to_numeric(text), nullable)
+    if pd.to_numeric(text, errors="coerce").notna().all():
+        return "float64"
+    if text.str.match(_DATE_PATTERN).all() and pd.to_datetime(text, errors="coerce", format="ISO8601").notna().all():
+        return "datetime64[ns]"
+    return _string_dtype(present)
+
+
+def _compact_dtype(values: pd.Series) -> str:
+    """Compact dtype for an already typed column (Parquet, Feather, Excel)."""
+    dtype = values.dtype
+    present = values.dropna()
+    nullable = len(present) < len(values)
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean" if nullable else "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return _integer_dtype(present, nullable)
+    if pd.api.types.is_float_dtype(dtype):
+        return "float64"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return str(dtype)
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return _string_dtype(present) if not present.empty else "object"
+    return str(dtype)
+
+
+def _integer_dtype(values: pd.Series, nullable: bool) -> str:
+    dtype = "int32" if not values.empty and values.abs().max() < _INT32_SAFE_LIMIT else "int64"
+    return dtype.capitalize() if nullable or values.empty else dtype
+
+
+def _string_dtype(values: pd.Series) -> str:
+    distinct = values.nunique()
+    if distinct <= CATEGORY_MAX_VALUES and distinct <= CATEGORY_MAX_RATIO * len(values):
+        return "category"
+    return "object"
+
+
+class SchemaRegistry:
+    """Inferred schemas keyed by source URI, kept in one JSON file rewritten atomically under a lock."""
+
+    def __init__(self, path: str | Path = DEFAULT_SCHEMA_REGISTRY_PATH, inferrer: Optional[SchemaInferrer] = None):
+        self.path = Path(path)
+        self.inferrer = inferrer or SchemaInferrer()
+
+    def get(self, uri: str) -> Optional[InferredSchema]:
+        entry = self._load().get(self._key(uri))
+        return InferredSchema(**entry) if entry else None
+
+    def put(self, uri: str, schema: InferredSchema) -> None:
+        with file_lock(self.path):
+            entries = self._load()
+            entries[self._key(uri)] = asdict(schema)
+            self._save(entries)
+
+    def invalidate(self, uri: str) -> bool:
+        with file_lock(self.path):
+            entries = self._load()
+            if entries.pop(self._key(uri), None) is None:
+                return False
+            self._save(entries)
+            return True
+
+    def entries(self) -> List[InferredSchema]:
+        return [InferredSchema(**entry) for entry in self._load().values()]
+
+    def resolve(self, uri: str, fmt: str, sample_path: str | Path | None = None) -> InferredSchema:
+        """Registered schema for `uri`, inferring (from `sample_path`, default `uri`) on a miss."""
+        schema = self.get(uri)
+        if schema is None or schema.format != fmt:
+            schema = self.inferrer.infer(sample_path or uri, fmt)
+            schema.uri = uri
+            self.put(uri, schema)
+        return schema
+
+    @staticmethod
+    def _key(uri: str) -> str:
+        return str(Path(uri).resolve()) if "://" not in uri else uri
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        staging.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(staging, self.path)
+
+
+def pandas_read_options(columns: Dict[str, str]) -> Dict[str, Any]:
+    """`dtype` / `parse_dates` arguments for `pd.read_csv` / `pd.read_excel`."""
+    dates = [name for name, dtype in columns.items() if dtype.startswith("datetime64")]
+    dtypes = {name: dtype for name, dtype in columns.items() if name not in dates}
+    return {"dtype": dtypes, "parse_dates": dates} if dates else {"dtype": dtypes}
+
+
+def arrow_types(columns: Dict[str, str], compact_integers: bool = True) -> Dict[str, Any]:
+    """Arrow types for pandas dtype names; without `compact_integers` integers stay int64."""
+    import pyarrow as pa
+
+    types = {}
+    for name, dtype in columns.items():
+        if dtype in ("Int32", "int32"):
+            types[name] = pa.int32() if compact_integers else pa.int64()
+        elif dtype in ("Int64", "int64"):
+            types[name] = pa.int64()
+        elif dtype in ("boolean", "bool"):
+            types[name] = pa.bool_()
+        elif dtype in ("float64", "float32"):
+            types[name] = pa.from_numpy_dtype(np.dtype(dtype))
+        elif dtype.startswith("datetime64"):
+            types[name] = pa.timestamp("ns", tz=dtype[dtype.index(",") + 1:-1].strip()) if "," in dtype else pa.timestamp("ns")
+        elif dtype == "category":
+            types[name] = pa.dictionary(pa.int32(), pa.string())
+        elif dtype in ("object", "string"):
+            types[name] = pa.string()
+    return types
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HLL_PRECISION = 12
+DEFAULT_BLOOM_CAPACITY = 10_000_000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+# Rows hashed into the Bloom filter per step; bounds the (rows x hashes) position matrix
+_BLOOM_BLOCK_ROWS = 65_536
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash per row, computed column-wise by pandas (no Python row loop)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    # frexp is exact on 32-bit halves, so the 64-bit result never rounds up
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Approximate distinct counter in 2**precision bytes; merge is a register max."""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        rank = (width - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    @property
+    def nbytes(self) -> int:
+        return self.registers.nbytes
+
+
+class BloomFilter:
+    """Fixed-size bit set sized for `capacity` keys at `error_rate` false positives."""
+
+    def __init__(self, capacity: int = DEFAULT_BLOOM_CAPACITY, error_rate: float = DEFAULT_BLOOM_ERROR_RATE):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter needs capacity > 0 and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.inserted = 0
+
+    def add_and_check(self, hashes: np.ndarray) -> np.ndarray:
+        """Return which hashes were (probably) present before, then insert them all."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        seen = np.zeros(len(hashes), dtype=bool)
+        for start in range(0, len(hashes), _BLOOM_BLOCK_ROWS):
+            block = hashes[start:start + _BLOOM_BLOCK_ROWS]
+            positions = self._positions(block)
+            present = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+            seen[start:start + len(block)] = present.all(axis=1)
+            flat = positions.ravel()
+            np.bitwise_or.at(self.bits, (flat >> np.uint64(3)).astype(np.intp),
+                             np.left_shift(1, (flat & np.uint64(7)).astype(np.uint8)).astype(np.uint8))
+        self.inserted += int(np.count_nonzero(~seen))
+        return seen
+
+    def merge(self, other: BloomFilter) -> None:
+        if (other.size, other.hash_count) != (self.size, self.hash_count):
+            raise ValueError("Cannot merge Bloom filters with different parameters")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        self.inserted += other.inserted
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Kirsch-Mitzenmacher double hashing: k positions from two 32-bit halves
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.inserted / self.size)) ** self.hash_count
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+
+@dataclass
+class ColumnSketch:
+    """Mergeable per-column counters: nulls, min/max and approximate distinct values."""
+    precision: int = DEFAULT_HLL_PRECISION
+    count: int = 0
+    nulls: int = 0
+    min: Any = None
+    max: Any = None
+    distinct: HyperLogLog = field(init=False)
+
+    def __post_init__(self):
+        self.distinct = HyperLogLog(self.precision)
+
+    def update(self, series: pd.Series) -> None:
+        self.count += len(series)
+        self.nulls += int(series.isna().sum())
+        values = series.dropna()
+        if values.empty:
+            return
+        if (pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_datetime64_any_dtype(values.dtype)) \
+                and not pd.api.types.is_bool_dtype(values.dtype):
+            self._update_bounds(values.min(), values.max())
+        self.distinct.add_hashes(hash_values(values))
+
+    def merge(self, other: ColumnSketch) -> None:
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.min is not None:
+            self._update_bounds(other.min, other.max)
+        self.distinct.merge(other.distinct)
+
+    def _update_bounds(self, low: Any, high: Any) -> None:
+        try:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            # Column changed type between batches; bounds are no longer comparable
+            self.min = self.max = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "min": _plain(self.min),
+            "max": _plain(self.max),
+            "approx_distinct": self.distinct.estimate(),
+        }
+
+
+def _plain(value: Optional[Any]) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
@@ -0,0 +1,511 @@
+from __future__ import annotations
+
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataBatch, DataSource
+from .memory import estimate_nbytes
+
+# TransformationJob.rules keys that need the whole stream, applied after the per-batch rules
+KEYED_RULES = ("join", "aggregate")
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+# Hash partitions per spill; each holds about 1/N of the keys
+DEFAULT_SPILL_PARTITIONS = 32
+# A partition still over budget is re-split with a new hash seed, at most this many times
+MAX_SPILL_DEPTH = 3
+
+AGGREGATIONS = ("sum", "count", "size", "min", "max", "mean", "var", "std", "nunique")
+
+_METRIC_PATTERN = re.compile(r"^\s*(\w+)\s*\(\s*([^()]*?)\s*\)\s*$")
+# How each partial column is folded into another partial of the same group; `avg`/`m2` are pooled first
+_COMBINE = {"sum": "sum", "count": "sum", "size": "sum", "min": "min", "max": "max", "avg": "first", "m2": "sum"}
+# Group-by function computing each partial kind from raw rows (`m2` is rescaled from the sample variance)
+_PARTIAL_AGG = {"avg": "mean", "m2": "var"}
+
+
+class SpillPartitions:
+    """Frames hash-partitioned by key columns into files under a private temp directory.
+
+    Rows with equal keys always land in the same partition, so each partition
+    can be aggregated or joined on its own. `level` salts the hash: a partition
+    re-split at the next level spreads its keys over fresh buckets.
+    """
+
+    def __init__(self, count: int = DEFAULT_SPILL_PARTITIONS, spill_dir: Optional[str] = None, level: int = 0):
+        self.count = count
+        self.level = level
+        if spill_dir:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(prefix="etl-spill-", dir=spill_dir))
+        self.files: Dict[Tuple[str, int], List[Path]] = {}
+        self.bytes_written = 0
+
+    def write(self, name: str, df: pd.DataFrame, keys: List[str]) -> None:
+        if df.empty:
+            return
+        buckets = partition_ids(df, keys, self.count, self.level)
+        # One stable sort, then contiguous slices per bucket
+        order = np.argsort(buckets, kind="stable")
+        sizes = np.bincount(buckets, minlength=self.count)
+        ordered = df.take(order)
+        start = 0
+        for bucket, size in enumerate(sizes):
+            if size == 0:
+                continue
+            paths = self.files.setdefault((name, bucket), [])
+            path = self.directory / f"{name}-{bucket:04d}-{len(paths):06d}.pkl"
+            ordered.iloc[start:start + size].to_pickle(path)
+            paths.append(path)
+            self.bytes_written += path.stat().st_size
+            start += size
+
+    def paths(self, name: str, bucket: int) -> List[Path]:
+        return self.files.get((name, bucket), [])
+
+    def size(self, name: str, bucket: int) -> int:
+        return sum(path.stat().st_size for path in self.paths(name, bucket))
+
+    def read(self, name: str, bucket: int) -> Iterator[pd.DataFrame]:
+        for path in self.paths(name, bucket):
+            yield pd.read_pickle(path)
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.files.clear()
+
+
+def partition_ids(df: pd.DataFrame, keys: List[str], count: int, level: int = 0) -> np.ndarray:
+    """Bucket per row from the key values only (not column names), so both join sides agree."""
+    frame = pd.DataFrame({str(i): _hashable(df[key]) for i, key in enumerate(keys)})
+    hashes = pd.util.hash_pandas_object(frame, index=False, hash_key=f"etl-spill-{level:06d}").to_numpy()
+    return (hashes % np.uint64(count)).astype(np.int64)
+
+
+def parse_metrics(metrics: Dict[str, str]) -> List[Tuple[str, str, Optional[str]]]:
+    """`{"total": "sum(amount)", "orders": "count()"}` -> `[(output, function, column)]`."""
+    parsed = []
+    for output, spec in metrics.items():
+        match = _METRIC_PATTERN.match(str(spec))
+        if not match or match.group(1) not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation {spec!r} for '{output}' (use one of {AGGREGATIONS})")
+        function, column = match.group(1), match.group(2) or None
+        if function == "count" and column is None:
+            function = "size"
+        if function != "size" and column is None:
+            raise ValueError(f"Aggregation {spec!r} for '{output}' needs a column")
+        parsed.append((output, function, column))
+    return parsed
+
+
+class SpillingAggregator:
+    """Group-by aggregation whose working set stays under `memory_budget_mb`.
+
+    Each batch is reduced to one partial row per group (sums, counts, means and
+    sums of squared deviations (M2), min/max, and distinct `(keys, value)` pairs
+    for `nunique`); M2s are merged with Chan's formula, as in the profiler. Partials
+    accumulate in memory and are re-combined as they grow; when the combined
+    table still exceeds half the budget it is hash-partitioned by the group
+    keys to disk. `results()` then finishes one partition at a time, re-splitting
+    any partition that alone exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        group_by: List[str],
+        metrics: Dict[str, str],
+        memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+        partitions: int = DEFAULT_SPILL_PARTITIONS,
+        spill_dir: Optional[str] = None,
+        level: int = 0,
+    ):
+        if not group_by:
+            raise ValueError("Aggregation requires 'group_by'")
+        self.group_by = list(group_by)
+        self.metrics = metrics
+        self.memory_budget = int(memory_budget_mb * 1024 ** 2)
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.level = level
+        self._parsed = parse_metrics(metrics)
+        self._partials = _partial_specs(self._parsed)
+        # nunique of a group key is 1 per group and needs no distinct pairs
+        self._distinct = sorted({column for _, function, column in self._parsed
+                                 if function == "nunique" and column not in self.group_by})
+        self._pending: List[pd.DataFrame] = []
+        self._pending_distinct: Dict[str, List[pd.DataFrame]] = {column: [] for column in self._distinct}
+        self._bytes = 0
+        self._spill: Optional[SpillPartitions] = None
+        self.stats = {"spilled_bytes": 0, "spills": 0}
+
+    def update(self, df: pd.DataFrame) -> None:
+        missing = set(self.group_by) | {column for column, _ in self._partials.values() if column}
+        missing |= set(self._distinct)
+        missing -= set(df.columns)
+        if missing:
+            raise ValueError(f"Aggregation column(s) not in batch: {sorted(missing)}")
+        if df.empty:
+            return
+        self._add(self._partial(df), {column: df[self.group_by + [column]].drop_duplicates() for column in self._distinct})
+
+    def results(self) -> Iterator[pd.DataFrame]:
+        """Final groups, one frame per partition (a single frame when nothing spilled)."""
+        try:
+            if self._spill is None:
+                if self._pending:
+                    yield self._finish(self._combine(self._pending), self._pending_distinct)
+                return
+            self._spill_pending()
+            for bucket in range(self._spill.count):
+                yield from self._finish_partition(bucket)
+        finally:
+            if self._spill is not None:
+                self.stats["spilled_bytes"] += self._spill.bytes_written
+                self._spill.cleanup()
+                self._spill = None
+
+    def _finish_partition(self, bucket: int) -> Iterator[pd.DataFrame]:
+        names = ["partial"] + [f"distinct-{i}" for i in range(len(self._distinct))]
+        if not any(self._spill.paths(name, bucket) for name in names):
+            return
+        if sum(self._spill.size(name, bucket) for name in names) > self.memory_budget and self.level < MAX_SPILL_DEPTH:
+            # Too many groups landed together: re-split this partition with a new seed
+            child = SpillingAggregator(self.group_by, self.metrics, self.memory_budget / 1024 ** 2,
+                                       self.partitions, self.spill_dir, self.level + 1)
+            for partial in self._spill.read("partial", bucket):
+                child._add(partial, {})
+            for i, column in enumerate(self._distinct):
+                for pairs in self._spill.read(f"distinct-{i}", bucket):
+                    child._add(None, {column: pairs})
+            yield from child.results()
+            self.stats["spilled_bytes"] += child.stats["spilled_bytes"]
+            return
+        partial = self._combine(list(self._spill.read("partial", bucket)))
+        distinct = {column: list(self._spill.read(f"distinct-{i}", bucket)) for i, column in enumerate(self._distinct)}
+        yield self._finish(partial, distinct)
+
+    def _add(self, partial: Optional[pd.DataFrame], distinct: Dict[str, pd.DataFrame]) -> None:
+        if partial is not None:
+            self._pending.append(partial)
+            self._bytes += estimate_nbytes(partial)
+        for column, pairs in distinct.items():
+            self._pending_distinct[column].append(pairs)
+            self._bytes += estimate_nbytes(pairs)
+        if self._bytes <= self.memory_budget:
+            return
+        # Over budget: fold the partials first, spill only if that did not help enough
+        if self._pending:
+            self._pending = [self._combine(self._pending)]
+        for column, frames in self._pending_distinct.items():
+            if frames:
+                self._pending_distinct[column] = [pd.concat(frames, ignore_index=True).drop_duplicates()]
+        self._bytes = sum(map(estimate_nbytes, self._pending)) + sum(
+            estimate_nbytes(frame) for frames in self._pending_distinct.values() for frame in frames
+        )
+        if self._bytes > self.memory_budget // 2:
+            self._spill_pending()
+
+    def _spill_pending(self) -> None:
+        if self._spill is None:
+            self._spill = SpillPartitions(self.partitions, self.spill_dir, self.level)
+            self.stats["spills"] += 1
+        for partial in self._pending:
+            self._spill.write("partial", partial, self.group_by)
+        for i, column in enumerate(self._distinct):
+            for pairs in self._pending_distinct[column]:
+                self._spill.write(f"distinct-{i}", pairs, self.group_by)
+            self._pending_distinct[column] = []
+        self._pending = []
+        self._bytes = 0
+
+    def _partial(self, df: pd.DataFrame) -> pd.DataFrame:
+        named = {
+            name: (column or self.group_by[0], _PARTIAL_AGG.get(kind, kind))
+            for name, (column, kind) in self._partials.items()
+        }
+        partial = df.groupby(self.group_by, sort=False, dropna=False, observed=True).agg(**named).reset_index()
+        for name, (column, kind) in self._partials.items():
+            if kind == "m2":
+                # M2 = sample variance * (n - 1); groups with fewer than two values have none
+                partial[name] = (partial[name] * (partial[_partial_name("count", column)] - 1)).fillna(0.0)
+        return partial
+
+    def _combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        frame = partials[0] if len(partials) == 1 else pd.concat(partials, ignore_index=True)
+        frame = self._pool_moments(frame)
+        combine = {name: _COMBINE[kind] for name, (_, kind) in self._partials.items()}
+        return frame.groupby(self.group_by, sort=False, dropna=False, observed=True).agg(combine).reset_index()
+
+    def _pool_moments(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Chan's merge over every row of a group: each M2 gains `n * (mean - pooled mean)^2`.
+
+        Afterwards every row carries the pooled mean, so summing M2 and taking
+        the first mean per group completes the merge.
+        """
+        columns = [column for column, kind in self._partials.values() if kind == "m2"]
+        if not columns:
+            return frame
+        frame = frame.copy()
+        keys = [frame[key] for key in self.group_by]
+        for column in columns:
+            count, avg, m2 = (_partial_name(kind, column) for kind in ("count", "avg", "m2"))
+            n = frame[count].astype("float64")
+            total = n.groupby(keys, sort=False, dropna=False, observed=True).transform("sum")
+            weighted = (n * frame[avg]).fillna(0.0).groupby(keys, sort=False, dropna=False, observed=True)
+            mean = weighted.transform("sum") / total.where(total > 0)
+            frame[m2] = frame[m2] + (n * (frame[avg] - mean) ** 2).fillna(0.0)
+            frame[avg] = mean
+        return frame
+
+    def _finish(self, partial: pd.DataFrame, distinct: Dict[str, List[pd.DataFrame]]) -> pd.DataFrame:
+        result = partial[self.group_by].copy()
+        for output, function, column in self._parsed:
+            if function == "nunique" and column in self.group_by:
+                result[output] = result[column].notna().astype("int64").to_numpy()
+            elif function == "nunique":
+                pairs = pd.concat(distinct[column], ignore_index=True) if distinct[column] else None
+                # Pairs are distinct once deduplicated, so a non-null count is the distinct count
+                counts = (pairs.drop_duplicates().groupby(self.group_by, sort=False, dropna=False, observed=True)[column]
+                          .count() if pairs is not None else pd.Series(dtype="int64"))
+                result[output] = (result.merge(counts.rename("__n").reset_index(), on=self.group_by, how="left")["__n"]
+                                  .fillna(0).astype("int64").to_numpy())
+            elif function in ("sum", "count", "size", "min", "max"):
+                result[output] = partial[_partial_name(function, column)].to_numpy()
+            elif function == "mean":
+                count = partial[_partial_name("count", column)]
+                result[output] = (partial[_partial_name("sum", column)].astype("float64") / count.where(count > 0)).to_numpy()
+            else:
+                count = partial[_partial_name("count", column)]
+                variance = partial[_partial_name("m2", column)] / (count - 1).where(count > 1)
+                result[output] = (variance if function == "var" else np.sqrt(variance)).to_numpy()
+        return result
+
+
+class SpillingHashJoin:
+    """Join streamed batches against a right-hand table under `memory_budget_mb`.
+
+    When the right side fits in half the budget it is kept in memory and each
+    left batch is merged as it arrives. Otherwise both sides are hash-partitioned
+    by key to disk (a grace hash join) and each partition is joined on its own:
+    its right rows in memory, its left rows streamed file by file. Partitions
+    whose right side is still too large are re-split with a new hash seed.
+    Supports `how="left"` (enrichment) and `how="inner"`.
+    """
+
+    def __init__(
+        self,
+        right: Callable[[], Iterable[pd.DataFrame]],
+        left_on: List[str],
+        right_on: List[str],
+        how: str = "left",
+        columns: Optional[List[str]] = None,
+        memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+        partitions: int = DEFAULT_SPILL_PARTITIONS,
+        spill_dir: Optional[str] = None,
+        level: int = 0,
+    ):
+        if how not in ("left", "inner"):
+            raise ValueError(f"Unsupported join type: {how} (use 'left' or 'inner')")
+        if len(left_on) != len(right_on) or not left_on:
+            raise ValueError("Join keys must be non-empty and pair up left and right columns")
+        self.right = right
+        self.left_on = list(left_on)
+        self.right_on = list(right_on)
+        self.how = how
+        self.columns = columns
+        self.memory_budget = int(memory_budget_mb * 1024 ** 2)
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.level = level
+        self.stats = {"spilled_bytes": 0, "spills": 0, "broadcast": True}
+
+    def join(self, left: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        right_frames, spill = [], None
+        held = 0
+        try:
+            for frame in self.right():
+                frame = self._right_columns(frame)
+                if spill is not None:
+                    spill.write("right", frame, self.right_on)
+                    continue
+                right_frames.append(frame)
+                held += estimate_nbytes(frame)
+                if held > self.memory_budget // 2:
+                    spill = SpillPartitions(self.partitions, self.spill_dir, self.level)
+                    self.stats.update(broadcast=False, spills=self.stats["spills"] + 1)
+                    for held_frame in right_frames:
+                        spill.write("right", held_frame, self.right_on)
+                    right_frames = []
+
+            if spill is None:
+                table = pd.concat(right_frames, ignore_index=True) if right_frames else None
+                for frame in left:
+                    yield self._merge(frame, table)
+                return
+
+            for frame in left:
+                spill.write("left", frame, self.left_on)
+            for bucket in range(spill.count):
+                yield from self._join_partition(spill, bucket)
+        finally:
+            if spill is not None:
+                self.stats["spilled_bytes"] += spill.bytes_written
+                spill.cleanup()
+
+    def _join_partition(self, spill: SpillPartitions, bucket: int) -> Iterator[pd.DataFrame]:
+        if not spill.paths("left", bucket):
+            return
+        if spill.size("right", bucket) > self.memory_budget // 2 and self.level < MAX_SPILL_DEPTH:
+            child = SpillingHashJoin(lambda: spill.read("right", bucket), self.left_on, self.right_on, self.how,
+                                     None, self.memory_budget / 1024 ** 2, self.partitions, self.spill_dir, self.level + 1)
+            yield from child.join(spill.read("left", bucket))
+            self.stats["spilled_bytes"] += child.stats["spilled_bytes"]
+            return
+        frames = list(spill.read("right", bucket))
+        table = pd.concat(frames, ignore_index=True) if frames else None
+        for frame in spill.read("left", bucket):
+            yield self._merge(frame, table)
+
+    def _right_columns(self, frame: pd.DataFrame) -> pd.DataFrame:
+        missing = set(self.right_on) - set(frame.columns)
+        if missing:
+            raise ValueError(f"Join key(s) not in right side: {sorted(missing)}")
+        if self.columns is None:
+            return frame
+        return frame[list(dict.fromkeys(self.right_on + list(self.columns)))]
+
+    def _merge(self, frame: pd.DataFrame, table: Optional[pd.DataFrame]) -> pd.DataFrame:
+        missing = set(self.left_on) - set(frame.columns)
+        if missing:
+            raise ValueError(f"Join key(s) not in batch: {sorted(missing)}")
+        if table is None:
+            return frame if self.how == "left" else frame.iloc[0:0]
+        merged = frame.merge(table, how=self.how, left_on=self.left_on, right_on=self.right_on,
+                             suffixes=("", "_right"), sort=False)
+        # Keep one copy of the key when both sides name it differently
+        extra = [key for key, left_key in zip(self.right_on, self.left_on) if key != left_key and key not in frame.columns]
+        return merged.drop(columns=extra)
+
+
+def apply_keyed_rules(batches: Iterable[DataBatch], rules: Dict[str, Any]) -> Iterator[DataBatch]:
+    """Run the `join` and then the `aggregate` rule over a stream of transformed batches.
+
+    - `join`: `{"right": {"uri": ..., "format": ...}, "on": "id" | {"left": "customer", "right": "id"},
+      "how": "left", "columns": [...]}`
+    - `aggregate`: `{"group_by": [...], "metrics": {"total": "sum(amount)", "orders": "count()"}}`
+
+    Both accept `memory_budget_mb`, `partitions` and `spill_dir`. Output batches
+    carry the input metadata (minus per-chunk entries) and `metadata["spill"]`.
+    """
+    carried: Dict[str, Any] = {}
+    spill_stats: Dict[str, Any] = {}
+
+    def frames() -> Iterator[pd.DataFrame]:
+        for batch in batches:
+            for key, value in batch.metadata.items():
+                if key == "filtered_rows":
+                    carried[key] = carried.get(key, 0) + value
+                elif key not in ("chunk_index", "memory"):
+                    carried[key] = value
+            yield batch.to_pandas()
+
+    stream: Iterable[pd.DataFrame] = frames()
+    if rules.get("join"):
+        joiner = build_join(rules["join"])
+        spill_stats["join"] = joiner.stats
+        stream = joiner.join(stream)
+    if rules.get("aggregate"):
+        aggregator = build_aggregator(rules["aggregate"])
+        spill_stats["aggregate"] = aggregator.stats
+        stream = _aggregate(aggregator, stream)
+    for index, frame in enumerate(stream):
+        yield DataBatch(
+            raw=frame,
+            schema={"columns": frame.dtypes.to_dict()},
+            stats={"rows": len(frame), "cols": len(frame.columns)},
+            metadata={**carried, "chunk_index": index, "spill": spill_stats},
+        )
+
+
+def build_aggregator(spec: Dict[str, Any]) -> SpillingAggregator:
+    group_by = spec.get("group_by")
+    return SpillingAggregator(
+        [group_by] if isinstance(group_by, str) else list(group_by or []),
+        spec.get("metrics") or {},
+        memory_budget_mb=spec.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB),
+        partitions=spec.get("partitions", DEFAULT_SPILL_PARTITIONS),
+        spill_dir=spec.get("spill_dir"),
+    )
+
+
+def build_join(spec: Dict[str, Any]) -> SpillingHashJoin:
+    on = spec.get("on")
+    if isinstance(on, dict):
+        left_on, right_on = on.get("left"), on.get("right")
+    else:
+        left_on = right_on = on
+    left_on = [left_on] if isinstance(left_on, str) else list(left_on or [])
+    right_on = [right_on] if isinstance(right_on, str) else list(right_on or [])
+    right = spec.get("right")
+    if not isinstance(right, dict) or "uri" not in right:
+        raise ValueError("Join requires 'right': {'uri': ..., 'format': ...}")
+    return SpillingHashJoin(
+        lambda: _read_right(right),
+        left_on,
+        right_on,
+        how=spec.get("how", "left"),
+        columns=spec.get("columns"),
+        memory_budget_mb=spec.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB),
+        partitions=spec.get("partitions", DEFAULT_SPILL_PARTITIONS),
+        spill_dir=spec.get("spill_dir"),
+    )
+
+
+def _read_right(spec: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    from .sources import DEFAULT_CHUNK_ROWS, FileSourceAdapter
+
+    uri = spec["uri"]
+    fmt = spec.get("format") or uri.rsplit(".", 1)[-1].lower()
+    source = DataSource(name="join", kind="file", uri=uri, format=fmt, options=dict(spec.get("options") or {}))
+    # Streamed so that only the part of the right side kept in memory counts against the budget
+    for batch in FileSourceAdapter(spec.get("chunk_rows", DEFAULT_CHUNK_ROWS)).read_stream(source):
+        yield batch.to_pandas()
+
+
+def _aggregate(aggregator: SpillingAggregator, frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    for frame in frames:
+        aggregator.update(frame)
+    yield from aggregator.results()
+
+
+def _partial_specs(parsed: List[Tuple[str, str, Optional[str]]]) -> Dict[str, Tuple[Optional[str], str]]:
+    """Partial columns needed by the metrics: `{partial name: (source column, kind)}`."""
+    needs = {
+        "sum": ["sum"], "count": ["count"], "size": ["size"], "min": ["min"], "max": ["max"],
+        "mean": ["sum", "count"], "var": ["count", "avg", "m2"], "std": ["count", "avg", "m2"], "nunique": [],
+    }
+    # Group sizes are always kept, so every group has a partial row (nunique-only specs too)
+    specs: Dict[str, Tuple[Optional[str], str]] = {_partial_name("size", None): (None, "size")}
+    for _, function, column in parsed:
+        for kind in needs[function]:
+            specs[_partial_name(kind, column)] = (column, kind)
+    return specs
+
+
+def _partial_name(kind: str, column: Optional[str]) -> str:
+    return f"__{kind}__{column or ''}"
+
+
+def _hashable(column: pd.Series) -> pd.Series:
+    if column.isna().all():
+        # An all-null slice of a string key comes back float64 after a group-by; hash it as nulls
+        return pd.Series(None, index=column.index, dtype=object)
+    if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        return column.astype("float64")  # int and float keys of equal value must hash alike
+    return column
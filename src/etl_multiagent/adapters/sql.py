@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Sequence
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+# Keyed by (pid, url): pooled connections must not be shared with forked workers
+_ENGINES: dict[tuple[int, str], Any] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(url: str, pool_size: int = DEFAULT_POOL_SIZE, max_overflow: int = DEFAULT_MAX_OVERFLOW) -> Any:
+    """Pooled SQLAlchemy engine shared by every adapter pointing at the same URL."""
+    key = (os.getpid(), url)
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            from sqlalchemy import create_engine
+            from sqlalchemy.engine import make_url
+
+            kwargs: dict[str, Any] = {"pool_pre_ping": True}
+            if make_url(url).get_backend_name() != "sqlite":
+                # SQLite uses single-connection pools that take no sizing
+                kwargs.update(pool_size=pool_size, max_overflow=max_overflow)
+            engine = _ENGINES[key] = create_engine(url, **kwargs)
+        return engine
+
+
+def dispose_engines() -> None:
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+def qualified_name(connection: Any, table: str, schema: str | None = None) -> str:
+    quote = connection.dialect.identifier_preparer.quote
+    return f"{quote(schema)}.{quote(table)}" if schema else quote(table)
+
+
+def column_list(connection: Any, columns: Sequence[str]) -> str:
+    quote = connection.dialect.identifier_preparer.quote
+    return ", ".join(quote(column) for column in columns)
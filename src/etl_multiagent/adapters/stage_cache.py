@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..domain.entities import DataBatch, DataSource
+
+DEFAULT_CACHE_DIR = "outputs/etl_cache"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Bump when adapter output changes shape so stale snapshots stop matching
+STAGE_CACHE_VERSION = "1"
+
+# Bytes sampled from the head and tail of each source file for the content fingerprint
+_FINGERPRINT_SAMPLE_BYTES = 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    stage: str
+    rows: int
+    bytes: int
+    chunks: int
+    created_at: float
+    last_used: float
+    path: Path
+
+
+class StageCache:
+    """Content-addressed, size-bounded store of intermediate `DataBatch` snapshots.
+
+    Each entry is a directory `<root>/<key>/` holding one Parquet file per chunk
+    plus `meta.json` (batch metadata, Arrow/pandas flag, sizes). Entries are
+    written to a temporary directory and renamed into place, so a crashed run
+    never leaves a half-written snapshot behind. Reads refresh the entry's
+    last-used time; `evict` drops least recently used entries until the cache
+    fits in `max_bytes`.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def has(self, key: str) -> bool:
+        return (self.root / key / "meta.json").exists()
+
+    def get(self, key: str) -> Optional[DataBatch]:
+        batches = list(self.get_stream(key) or [])
+        if not batches:
+            return None
+        if len(batches) == 1:
+            return batches[0]
+        import pyarrow as pa
+
+        meta = self._touch(key)
+        table = pa.concat_tables([batch.to_arrow() for batch in batches])
+        return _snapshot_batch(table, meta["arrow"], meta["metadata"][0])
+
+    def get_stream(self, key: str) -> Optional[Iterator[DataBatch]]:
+        if not self.has(key):
+            return None
+        meta = self._touch(key)
+        return self._read_chunks(self.root / key, meta)
+
+    def put(self, key: str, stage: str, batch: DataBatch) -> DataBatch:
+        list(self.put_stream(key, stage, [batch]))
+        return batch
+
+    def put_stream(self, key: str, stage: str, batches: Iterable[DataBatch]) -> Iterator[DataBatch]:
+        """Pass batches through while snapshotting them; the entry is committed once the stream ends."""
+        import pyarrow.parquet as pq
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+        staging.mkdir()
+        meta: Dict[str, Any] = {"key": key, "stage": stage, "version": STAGE_CACHE_VERSION,
+                                "arrow": None, "rows": 0, "metadata": []}
+        try:
+            for index, batch in enumerate(batches):
+                pq.write_table(batch.to_arrow(), staging / f"part-{index:05d}.parquet")
+                meta["arrow"] = batch.is_arrow if meta["arrow"] is None else meta["arrow"]
+                meta["rows"] += batch.num_rows
+                meta["metadata"].append(batch.metadata or {})
+                yield batch
+            meta["created_at"] = time.time()
+            meta["bytes"] = sum(f.stat().st_size for f in staging.iterdir())
+            (staging / "meta.json").write_text(json.dumps(meta, default=str), encoding="utf-8")
+            target = self.root / key
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def entries(self) -> List[CacheEntry]:
+        entries = []
+        for meta_path in self.root.glob("*/meta.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            entries.append(CacheEntry(
+                key=meta["key"], stage=meta["stage"], rows=meta["rows"], bytes=meta["bytes"],
+                chunks=len(meta["metadata"]), created_at=meta["created_at"],
+                last_used=meta_path.stat().st_mtime, path=meta_path.parent,
+            ))
+        return sorted(entries, key=lambda e: e.last_used, reverse=True)
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[CacheEntry]:
+        """Remove least recently used entries until the total size fits the budget."""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(e.bytes for e in entries)
+        evicted = []
+        for entry in reversed(entries):
+            if total <= budget:
+                break
+            shutil.rmtree(entry.path, ignore_errors=True)
+            total -= entry.bytes
+            evicted.append(entry)
+        return evicted
+
+    def purge(self, older_than: Optional[float] = None) -> List[CacheEntry]:
+        """Remove every entry, or those unused for more than `older_than` seconds."""
+        cutoff = time.time() - older_than if older_than is not None else None
+        purged = []
+        for entry in self.entries():
+            if cutoff is None or entry.last_used < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                purged.append(entry)
+        return purged
+
+    def _touch(self, key: str) -> Dict[str, Any]:
+        meta_path = self.root / key / "meta.json"
+        os.utime(meta_path)
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _read_chunks(path: Path, meta: Dict[str, Any]) -> Iterator[DataBatch]:
+        import pyarrow.parquet as pq
+
+        for index, metadata in enumerate(meta["metadata"]):
+            table = pq.read_table(path / f"part-{index:05d}.parquet", memory_map=True)
+            yield _snapshot_batch(table, meta["arrow"], metadata)
+
+
+def _snapshot_batch(table: Any, arrow: bool, metadata: Dict[str, Any]) -> DataBatch:
+    raw = table if arrow else table.to_pandas()
+    columns = dict(zip(table.schema.names, table.schema.types)) if arrow else raw.dtypes.to_dict()
+    return DataBatch(
+        raw=raw,
+        schema={"columns": columns},
+        stats={"rows": table.num_rows, "cols": table.num_columns},
+        metadata={**metadata, "cache_hit": True},
+    )
+
+
+def cache_key(*parts: Any) -> str:
+    payload = json.dumps([STAGE_CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def source_fingerprint(source: DataSource) -> Dict[str, Any]:
+    """Identity of a source's content: size, mtime and head/tail bytes of every local file.
+
+    Non-local sources (databases, object stores) fall back to their URI and
+    options, so they only miss the cache when their definition changes.
+    """
+    paths = [Path(p) for p in sorted(glob.glob(source.uri))] if glob.has_magic(source.uri) else [Path(source.uri)]
+    files = []
+    for path in paths:
+        for file in (sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]):
+            if not file.is_file():
+                continue
+            stat = file.stat()
+            digest = hashlib.blake2b(digest_size=16)
+            with open(file, "rb") as handle:
+                digest.update(handle.read(_FINGERPRINT_SAMPLE_BYTES))
+                if stat.st_size > 2 * _FINGERPRINT_SAMPLE_BYTES:
+                    handle.seek(-_FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+                    digest.update(handle.read())
+            files.append([str(file.resolve()), stat.st_size, stat.st_mtime_ns, digest.hexdigest()])
+    return {"uri": source.uri, "format": source.format, "options": source.options, "files": files}
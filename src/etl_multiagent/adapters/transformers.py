@@ -1,62 +1,609 @@
 from __future__ import annotations
 
-from typing import Any
+import json
+from dataclasses import replace
+from typing import Any, Iterable, Iterator
+import numpy as np
 import pandas as pd
 
 from ..domain.entities import DataBatch, TransformationJob
+from .expressions import DSL_RULES, TransformPlan, compile_transform_plan, plan_key
+from .memory import optimize_memory
+from .quarantine import cast_failures, split_rows
+from .spill import KEYED_RULES, apply_keyed_rules
+from .rules import DEFAULT_SAMPLE_SIZE, RULE_CHECKS, RuleSet, compile_rules, violation_issues
+from .sketches import (
+    DEFAULT_BLOOM_CAPACITY,
+    DEFAULT_BLOOM_ERROR_RATE,
+    DEFAULT_HLL_PRECISION,
+    BloomFilter,
+    ColumnSketch,
+    hash_rows,
+)
+
+# Rows per Arrow chunk streamed back from DuckDB
+DEFAULT_SQL_CHUNK_ROWS = 100_000
 
 
 class PandasTransformAdapter:
+    """Column mapping and type casting on pandas DataFrames.
+
+    `job.rules["low_copy"]` skips the defensive deep copy: the input is shallow
+    copied, pure 1:1 mappings become renames, and unchanged columns keep sharing
+    their buffers with the input. Pandas replaces (never writes into) columns on
+    assignment, so the caller's frame is left untouched either way.
+
+    `job.rules["optimize_memory"]` (True or an options dict, see `optimize_memory`)
+    shrinks dtypes after casting and reports `metadata["memory"]`. Streamed
+    chunks skip numeric downcasting unless `downcast` is set explicitly: each
+    chunk would pick its own widths, while sinks need one schema per dataset.
+
+    `job.rules` sections `cleanse`, `derive`, `enrich`, `normalize` and `filter`
+    hold expressions (see `compile_transform_plan`) run after the mappings and
+    before the casts. They are compiled once per job and reused for every batch
+    this adapter sees; rows dropped by filters are counted in `metadata["filtered_rows"]`.
+
+    `job.rules["join"]` and `job.rules["aggregate"]` need every batch, so they run
+    in `apply_stream` after the per-batch rules and spill to disk by key past
+    their memory budget (see `apply_keyed_rules`); `apply` runs them on one batch.
+
+    `job.rules["quarantine"]` isolates rows whose values fail the casts instead
+    of leaving the whole column uncast: they are split out with a vectorized
+    mask and handed over as `metadata["quarantine"]`, a `DataBatch` tagged with
+    reason codes (see `QuarantineAdapter`), while the good rows are cast.
+    """
+
+    def __init__(self):
+        # Compiled expression plans keyed by their rules spec, reused across batches
+        self._plans: dict[str, TransformPlan | None] = {}
+
     def apply(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
-        df = batch.raw
+        if not any(job.rules.get(rule) for rule in KEYED_RULES):
+            return self._apply_batch(batch, job)
+        outputs = list(self.apply_stream([batch], job))
+        if not outputs:
+            return self._apply_batch(batch, job)  # Nothing survived: keep the (empty) per-batch result
+        df = pd.concat([output.raw for output in outputs], ignore_index=True) if len(outputs) > 1 else outputs[0].raw
+        metadata = {key: value for key, value in outputs[-1].metadata.items() if key != "chunk_index"}
+        return DataBatch(
+            raw=df,
+            schema={"columns": df.dtypes.to_dict()},
+            stats={"rows": len(df), "cols": len(df.columns)},
+            metadata=metadata,
+        )
+
+    def apply_stream(self, batches: Iterable[DataBatch], job: TransformationJob) -> Iterator[DataBatch]:
+        transformed = (self._apply_batch(batch, job) for batch in batches)
+        if not any(job.rules.get(rule) for rule in KEYED_RULES):
+            yield from transformed
+            return
+        # Keyed rules rebuild the batches: carry quarantined rows over to the next output
+        quarantined: list[pd.DataFrame] = []
+
+        def set_aside(batches: Iterable[DataBatch]) -> Iterator[DataBatch]:
+            for batch in batches:
+                if "quarantine" in batch.metadata:
+                    quarantined.append(batch.metadata.pop("quarantine").raw)
+                yield batch
+
+        for batch in apply_keyed_rules(set_aside(transformed), job.rules):
+            if quarantined:
+                batch.metadata["quarantine"] = DataBatch(raw=pd.concat(quarantined, ignore_index=True))
+                quarantined.clear()
+            yield batch
+        if quarantined:
+            empty = pd.DataFrame()
+            yield DataBatch(raw=empty, schema={"columns": {}}, stats={"rows": 0, "cols": 0},
+                            metadata={"quarantine": DataBatch(raw=pd.concat(quarantined, ignore_index=True))})
+
+    def _apply_batch(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
+        df = batch.to_pandas()
         if not isinstance(df, pd.DataFrame):
             raise ValueError("Batch raw data must be pandas DataFrame")
-        
+
         # Apply column mappings
-        df_transformed = df.copy()
-        for target_col, source_col in job.mappings.items():
-            if source_col in df_transformed.columns:
-                df_transformed[target_col] = df_transformed[source_col]
-        
+        if job.rules.get("low_copy"):
+            df_transformed = self._map_columns_low_copy(df, job.mappings)
+        else:
+            df_transformed = df.copy()
+            for target_col, source_col in job.mappings.items():
+                if source_col in df_transformed.columns:
+                    df_transformed[target_col] = df_transformed[source_col]
+
+        plan = self._plan(job.rules)
+        dsl_stats = {}
+        if plan is not None:
+            partial = "chunk_index" in batch.metadata or "partition" in batch.metadata
+            df_transformed, dsl_stats = plan.apply(df_transformed, partial)
+
         # Apply transformation rules (simple example: type casting)
-        for col, dtype in job.target_schema.items():
-            if col in df_transformed.columns:
-                try:
-                    df_transformed[col] = df_transformed[col].astype(dtype)
-                except Exception:
-                    pass  # Skip errors for now
-        
+        df_transformed, cast_errors = self._cast(df_transformed, job.target_schema)
+
+        metadata = {**batch.metadata, "transformed": True, **dsl_stats}
+        if cast_errors and job.rules.get("quarantine"):
+            keep, quarantined = split_rows(df_transformed, cast_failures(df_transformed, job.target_schema), "transform")
+            if quarantined is not None:
+                metadata["quarantine"] = DataBatch(raw=quarantined, metadata=_chunk_tag(batch))
+                df_transformed, cast_errors = self._cast(df_transformed[keep], job.target_schema)
+        if cast_errors:
+            metadata["cast_errors"] = cast_errors
+        if job.rules.get("optimize_memory"):
+            options = job.rules["optimize_memory"] if isinstance(job.rules["optimize_memory"], dict) else {}
+            if "chunk_index" in batch.metadata:
+                options = {"downcast": False, **options}
+            df_transformed, metadata["memory"] = optimize_memory(df_transformed, options)
         return DataBatch(
             raw=df_transformed,
             schema={"columns": df_transformed.dtypes.to_dict()},
             stats={"rows": len(df_transformed), "cols": len(df_transformed.columns)},
-            metadata={**batch.metadata, "transformed": True}
+            metadata=metadata
         )
 
+    def _plan(self, rules: dict[str, Any]) -> TransformPlan | None:
+        if not any(rules.get(rule) for rule in DSL_RULES):
+            return None
+        key = plan_key(rules)
+        if key not in self._plans:
+            self._plans[key] = compile_transform_plan(rules)
+        return self._plans[key]
+
+    @staticmethod
+    def _map_columns_low_copy(df: pd.DataFrame, mappings: dict[str, str]) -> pd.DataFrame:
+        present, renames = _plan_renames(list(df.columns), mappings)
+        df_transformed = df.rename(columns=renames, copy=False)
+        for target, source in present.items():
+            if renames.get(source) != target:
+                df_transformed[target] = df_transformed[renames.get(source, source)]
+        return df_transformed
+
+    @staticmethod
+    def _cast(df: pd.DataFrame, target_schema: dict[str, Any]) -> tuple[pd.DataFrame, dict[str, str]]:
+        casts = {col: dtype for col, dtype in target_schema.items() if col in df.columns}
+        if not casts:
+            return df, {}
+        try:
+            # One astype call for every column; columns already in the target dtype are not copied
+            return df.astype(casts, copy=False), {}
+        except Exception:
+            pass
+        # Something failed: cast column by column to find out which ones and why
+        cast_errors: dict[str, str] = {}
+        for col, dtype in casts.items():
+            try:
+                df[col] = df[col].astype(dtype, copy=False)
+            except Exception as e:
+                cast_errors[col] = f"cannot cast to {dtype}: {e}"
+        return df, cast_errors
+
+
+class ArrowTransformAdapter:
+    """Column mapping and type casting directly on pyarrow Tables.
+
+    Arrow columns are immutable, so mapped columns reference the source buffers
+    and only cast columns allocate. Pandas batches, and rules this adapter does
+    not implement, are handed to `fallback` (converted to pandas only then).
+    """
+
+    ARROW_RULES = {"low_copy", "engine"}
+
+    def __init__(self, fallback: Any = None):
+        self.fallback = fallback or PandasTransformAdapter()
+
+    def apply(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
+        if not batch.is_arrow or set(job.rules) - self.ARROW_RULES:
+            return self.fallback.apply(batch, job)
+        return self._apply_arrow(batch, job)
+
+    def apply_stream(self, batches: Iterable[DataBatch], job: TransformationJob) -> Iterator[DataBatch]:
+        if any(job.rules.get(rule) for rule in KEYED_RULES):
+            yield from self.fallback.apply_stream(batches, job)
+            return
+        for batch in batches:
+            yield self.apply(batch, job)
+
+    def _apply_arrow(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
+        table = batch.to_arrow()
+        if job.rules.get("low_copy"):
+            present, renames = _plan_renames(table.column_names, job.mappings)
+            table = table.rename_columns([renames.get(name, name) for name in table.column_names])
+        else:
+            present = {target: source for target, source in job.mappings.items() if source in table.column_names}
+            renames = {}
+        for target, source in present.items():
+            if renames.get(source) == target:
+                continue
+            column = table.column(renames.get(source, source))
+            if target in table.column_names:
+                table = table.set_column(table.column_names.index(target), target, column)
+            else:
+                table = table.append_column(target, column)
+
+        table, cast_errors = self._cast(table, job.target_schema)
+        metadata = {**batch.metadata, "transformed": True}
+        if cast_errors:
+            metadata["cast_errors"] = cast_errors
+        return DataBatch(
+            raw=table,
+            schema={"columns": dict(zip(table.schema.names, table.schema.types))},
+            stats={"rows": table.num_rows, "cols": table.num_columns},
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _cast(table: Any, target_schema: dict[str, Any]) -> tuple[Any, dict[str, str]]:
+        import pyarrow.compute as pc
+
+        cast_errors: dict[str, str] = {}
+        for col, dtype in target_schema.items():
+            if col not in table.column_names:
+                continue
+            try:
+                arrow_type = _arrow_type(dtype)
+                index = table.column_names.index(col)
+                if table.column(index).type != arrow_type:
+                    table = table.set_column(index, col, pc.cast(table.column(index), arrow_type))
+            except Exception as e:
+                cast_errors[col] = f"cannot cast to {dtype}: {e}"
+        return table, cast_errors
+
+
+class DuckDBTransformAdapter:
+    """Mappings, casts and SQL run by an embedded DuckDB engine.
+
+    The input is visible to `job.rules["sql"]` as the table `batch` (after the
+    mappings; default `SELECT * FROM batch`), and `job.rules["sql_tables"]` maps
+    extra table names to files or globs that DuckDB scans itself (Parquet, CSV,
+    JSON). Arrow batches are registered without copying. A stream is exposed to
+    DuckDB as one Arrow record-batch reader, so a single query covers the whole
+    stream (aggregations included) and results come back as Arrow chunks of
+    `chunk_rows` rows. `job.rules["duckdb"]` holds settings such as `threads`,
+    `memory_limit` and `temp_directory` (where DuckDB spills).
+    """
+
+    # quarantine is accepted so flows can set it, but a value DuckDB cannot cast still fails the query
+    DUCKDB_RULES = {"engine", "sql", "sql_tables", "duckdb", "low_copy", "quarantine"}
+
+    def __init__(self, chunk_rows: int = DEFAULT_SQL_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    def apply(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
+        import pyarrow as pa
+
+        tables = [output.raw for output in self.apply_stream([batch], job)]
+        table = pa.concat_tables(tables) if tables else pa.table({})
+        return DataBatch(
+            raw=table,
+            schema={"columns": dict(zip(table.schema.names, table.schema.types))},
+            stats={"rows": table.num_rows, "cols": table.num_columns},
+            metadata={**batch.metadata, "transformed": True, "engine": "duckdb"},
+        )
+
+    def apply_stream(self, batches: Iterable[DataBatch], job: TransformationJob) -> Iterator[DataBatch]:
+        import duckdb
+        import pyarrow as pa
+
+        unsupported = set(job.rules) - self.DUCKDB_RULES
+        if unsupported:
+            raise ValueError(f"DuckDB engine does not run rules {sorted(unsupported)}; express them in job.rules['sql']")
+        iterator = iter(batches)
+        first = next(iterator, None)
+        if first is None:
+            return
+        connection = duckdb.connect()
+        try:
+            for name, value in (job.rules.get("duckdb") or {}).items():
+                connection.execute(f"SET {name} = {_sql_literal(value)}")
+            for name, path in (job.rules.get("sql_tables") or {}).items():
+                connection.execute(f"CREATE VIEW {_quote(name)} AS SELECT * FROM {_sql_literal(path)}")
+            connection.register("__input", _arrow_reader(first, iterator))
+            query = _duckdb_query(job, _batch_columns(first))
+            result = connection.execute(query)
+            reader = (result.to_arrow_reader(self.chunk_rows) if hasattr(result, "to_arrow_reader")
+                      else result.fetch_record_batch(self.chunk_rows))
+            for index, record_batch in enumerate(reader):
+                table = pa.Table.from_batches([record_batch])
+                yield DataBatch(
+                    raw=table,
+                    schema={"columns": dict(zip(table.schema.names, table.schema.types))},
+                    stats={"rows": table.num_rows, "cols": table.num_columns},
+                    metadata={**first.metadata, "transformed": True, "engine": "duckdb", "chunk_index": index},
+                )
+        finally:
+            connection.close()
+
+
+def _arrow_reader(first: DataBatch, rest: Iterator[DataBatch]) -> Any:
+    """One Arrow reader over the whole stream; later chunks are cast to the first chunk's schema."""
+    import pyarrow as pa
+
+    head = first.to_arrow()
+    schema = head.schema
+
+    def record_batches() -> Iterator[Any]:
+        yield from head.to_batches()
+        for batch in rest:
+            table = batch.to_arrow()
+            if table.schema != schema:
+                try:
+                    table = table.select(schema.names).cast(schema)
+                except (KeyError, ValueError, pa.ArrowInvalid) as e:
+                    raise ValueError(f"Chunk schema does not match the first chunk: {e}") from e
+            yield from table.to_batches()
+
+    return pa.RecordBatchReader.from_batches(schema, record_batches())
+
+
+def _batch_columns(batch: DataBatch) -> list[str]:
+    return list(batch.raw.column_names if batch.is_arrow else batch.raw.columns)
+
+
+def _duckdb_query(job: TransformationJob, columns: list[str]) -> str:
+    """Mappings as a `batch` CTE, the job SQL over it, and casts as the outer projection."""
+    mapped = [name for name in columns if name not in job.mappings]
+    mapped += [target for target, source in job.mappings.items() if source in columns]
+    select = ", ".join(
+        f"{_quote(job.mappings[name])} AS {_quote(name)}" if name in job.mappings and job.mappings[name] in columns
+        else _quote(name)
+        for name in mapped
+    )
+    sql = job.rules.get("sql") or "SELECT * FROM batch"
+    casts = ", ".join(
+        f"CAST({_quote(column)} AS {_duckdb_type(dtype)}) AS {_quote(column)}" for column, dtype in job.target_schema.items()
+    )
+    if not casts:
+        return f"WITH batch AS (SELECT {select} FROM __input) {sql}"
+    return (f"WITH batch AS (SELECT {select} FROM __input), result AS ({sql}) "
+            f"SELECT * REPLACE ({casts}) FROM result")
+
+
+def _duckdb_type(dtype: Any) -> str:
+    name = str(dtype)
+    types = {
+        "object": "VARCHAR", "str": "VARCHAR", "string": "VARCHAR", "category": "VARCHAR",
+        "bool": "BOOLEAN", "boolean": "BOOLEAN", "float32": "FLOAT", "float64": "DOUBLE",
+        "int8": "TINYINT", "int16": "SMALLINT", "int32": "INTEGER", "int64": "BIGINT",
+        "uint8": "UTINYINT", "uint16": "USMALLINT", "uint32": "UINTEGER", "uint64": "UBIGINT",
+    }
+    if name.startswith("datetime64"):
+        return "TIMESTAMP"
+    # Nullable pandas names (Int64, Float32) map like their numpy peers
+    return types.get(name, types.get(name.lower(), name))
+
+
+def _quote(name: Any) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _chunk_tag(batch: DataBatch) -> dict[str, Any]:
+    return {"chunk_index": batch.metadata["chunk_index"]} if "chunk_index" in batch.metadata else {}
+
+
+def _plan_renames(columns: list[Any], mappings: dict[str, str]) -> tuple[dict[str, str], dict[str, str]]:
+    """Split mappings into those present in `columns` and the subset that can be pure renames."""
+    present = {target: source for target, source in mappings.items() if source in columns}
+    uses: dict[str, int] = {}
+    for source in present.values():
+        uses[source] = uses.get(source, 0) + 1
+    # A mapping is a pure rename when its source feeds nothing else and no column is clobbered
+    renames = {
+        source: target
+        for target, source in present.items()
+        if uses[source] == 1 and target not in columns and source not in present
+    }
+    return present, renames
+
+
+def _arrow_type(dtype: Any) -> Any:
+    import pyarrow as pa
+
+    name = str(dtype)
+    if name in ("object", "str", "string"):
+        return pa.string()
+    if name == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    if name in ("bool", "boolean"):
+        return pa.bool_()
+    # Nullable pandas names (Int64, Float32) map to the same Arrow types as their numpy peers
+    return pa.from_numpy_dtype(np.dtype(name.lower()))
+
 
 class ValidationAdapter:
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        # Compiled rule sets keyed by their rules spec, reused across batches
+        self._rulesets: dict[str, RuleSet] = {}
+
     def validate(self, batch: DataBatch, rules: dict[str, Any]) -> dict[str, Any]:
-        df = batch.raw
+        if batch.is_arrow and not any(rules.get(check) for check in RULE_CHECKS):
+            import pyarrow as pa
+
+            try:
+                return self._validate_arrow(batch.to_arrow(), rules)
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid, pa.ArrowTypeError):
+                pass  # Column types Arrow cannot group on; fall back to pandas
+        df = batch.to_pandas()
         if not isinstance(df, pd.DataFrame):
             return {"status": "error", "message": "Batch is not DataFrame"}
-        
+
         issues = []
-        
+        report: dict[str, Any] = {}
+
         # Check for nulls
         if rules.get("check_nulls"):
             null_counts = df.isnull().sum()
-            for col, count in null_counts.items():
-                if count > 0:
-                    issues.append(f"{col}: {count} null values")
-        
+            report["null_counts"] = {col: int(count) for col, count in null_counts.items() if count > 0}
+            for col, count in report["null_counts"].items():
+                issues.append(f"{col}: {count} null values")
+
         # Check for duplicates
         if rules.get("check_duplicates"):
-            dup_count = df.duplicated().sum()
+            dup_count = int(df.duplicated().sum())
+            report["duplicate_rows"] = dup_count
             if dup_count > 0:
                 issues.append(f"{dup_count} duplicate rows found")
-        
+
+        # Declarative column rules (type/range/pattern/referential), vectorized per column
+        if any(rules.get(check) for check in RULE_CHECKS):
+            report["violations"] = self._ruleset(rules).evaluate(df)
+            issues.extend(violation_issues(report["violations"]))
+
         return {
             "status": "pass" if not issues else "warning",
             "issues": issues,
             "rows_validated": len(df),
+            **report,
+        }
+
+    @staticmethod
+    def _validate_arrow(table: Any, rules: dict[str, Any]) -> dict[str, Any]:
+        # Null counts are stored in Arrow array metadata; no data is touched
+        report: dict[str, Any] = {"issues": [], "rows_validated": table.num_rows}
+        if rules.get("check_nulls"):
+            report["null_counts"] = {
+                name: table.column(name).null_count
+                for name in table.column_names
+                if table.column(name).null_count > 0
+            }
+            for col, count in report["null_counts"].items():
+                report["issues"].append(f"{col}: {count} null values")
+        if rules.get("check_duplicates"):
+            # Distinct rows via Arrow's hash aggregation over every column
+            distinct = table.group_by(table.column_names).aggregate([]).num_rows if table.num_columns else 0
+            report["duplicate_rows"] = table.num_rows - distinct if table.num_columns else 0
+            if report["duplicate_rows"] > 0:
+                report["issues"].append(f"{report['duplicate_rows']} duplicate rows found")
+        return {"status": "pass" if not report["issues"] else "warning", **report}
+
+    def _ruleset(self, rules: dict[str, Any]) -> RuleSet:
+        key = json.dumps({check: rules.get(check) for check in RULE_CHECKS}, sort_keys=True, default=str)
+        if key not in self._rulesets:
+            self._rulesets[key] = compile_rules(rules, sample_size=self.sample_size)
+        return self._rulesets[key]
+
+    @staticmethod
+    def merge_reports(reports: Iterable[dict[str, Any] | None]) -> dict[str, Any]:
+        """Combine per-batch reports into one, summing counters and rebuilding issues.
+
+        Duplicates are only counted within each batch; use
+        `IncrementalValidationAdapter` to catch rows duplicated across batches.
+        """
+        merged: dict[str, Any] = {"status": "pass", "issues": [], "rows_validated": 0}
+        null_counts: dict[str, int] | None = None
+        duplicate_rows: int | None = None
+        violations: dict[str, dict[str, Any]] | None = None
+        messages = []
+
+        for report in reports:
+            if not report:
+                continue
+            if report.get("status") == "error":
+                merged["status"] = "error"
+                messages.append(report.get("message", ""))
+                continue
+            merged["rows_validated"] += report.get("rows_validated", 0)
+            if "null_counts" in report:
+                null_counts = null_counts or {}
+                for col, count in report["null_counts"].items():
+                    null_counts[col] = null_counts.get(col, 0) + count
+            if "duplicate_rows" in report:
+                duplicate_rows = (duplicate_rows or 0) + report["duplicate_rows"]
+            if "violations" in report:
+                violations = violations or {}
+                for name, entry in report["violations"].items():
+                    current = violations.setdefault(name, {**entry, "count": 0, "sample_rows": []})
+                    current["count"] += entry["count"]
+                    current["sample_rows"] = (current["sample_rows"] + entry["sample_rows"])[:DEFAULT_SAMPLE_SIZE]
+
+        if null_counts is not None:
+            merged["null_counts"] = null_counts
+            for col, count in null_counts.items():
+                merged["issues"].append(f"{col}: {count} null values")
+        if duplicate_rows is not None:
+            merged["duplicate_rows"] = duplicate_rows
+            if duplicate_rows > 0:
+                merged["issues"].append(f"{duplicate_rows} duplicate rows found")
+        if violations is not None:
+            merged["violations"] = violations
+            merged["issues"].extend(violation_issues(violations))
+
+        if merged["status"] == "error":
+            merged["message"] = "; ".join(m for m in messages if m)
+        elif merged["issues"]:
+            merged["status"] = "warning"
+        return merged
+
+
+class IncrementalValidationAdapter(ValidationAdapter):
+    """Stateful validator for streamed batches built on mergeable sketches.
+
+    Null counts, min/max and HyperLogLog distinct counts are kept per column, and
+    a Bloom filter of row hashes flags duplicates across batches. Memory is fixed
+    by `hll_precision` (2**p bytes per column) and `bloom_capacity`/`bloom_error_rate`,
+    never by the number of rows seen. `report()` returns the combined result.
+    """
+
+    def __init__(
+        self,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        hll_precision: int = DEFAULT_HLL_PRECISION,
+        bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        bloom_error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+    ):
+        super().__init__(sample_size=sample_size)
+        self.hll_precision = hll_precision
+        self.columns: dict[str, ColumnSketch] = {}
+        self.rows = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._merged: dict[str, Any] | None = None
+
+    def validate(self, batch: DataBatch, rules: dict[str, Any]) -> dict[str, Any]:
+        # Sketches hash pandas columns; convert Arrow input once for both passes
+        df = batch.to_pandas()
+        batch = replace(batch, raw=df)
+        # Duplicates are resolved against every batch seen so far, not just this one
+        report = super().validate(batch, {**rules, "check_duplicates": False})
+        if report.get("status") == "error":
+            self._merged = self.merge_reports([self._merged, report])
+            return report
+
+        if rules.get("check_duplicates"):
+            hashes = hash_rows(df)
+            within = pd.Series(hashes).duplicated().to_numpy()
+            seen = np.zeros(len(hashes), dtype=bool)
+            seen[~within] = self.rows.add_and_check(hashes[~within])
+            report["duplicate_rows"] = int(np.count_nonzero(within | seen))
+            if report["duplicate_rows"] > 0:
+                report["issues"].append(f"{report['duplicate_rows']} duplicate rows found")
+                report["status"] = "warning"
+
+        for col in df.columns:
+            self.columns.setdefault(str(col), ColumnSketch(self.hll_precision)).update(df[col])
+
+        self._merged = self.merge_reports([self._merged, report])
+        return report
+
+    def merge(self, other: IncrementalValidationAdapter) -> None:
+        """Fold in the state of another validator, e.g. from a parallel partition."""
+        self.rows.merge(other.rows)
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = sketch
+        self._merged = self.merge_reports([self._merged, other._merged])
+
+    def report(self) -> dict[str, Any]:
+        report = dict(self._merged or self.merge_reports([]))
+        report["column_stats"] = {col: sketch.to_dict() for col, sketch in self.columns.items()}
+        report["sketches"] = {
+            "bytes": self.rows.nbytes + sum(s.distinct.nbytes for s in self.columns.values()),
+            "duplicate_false_positive_rate": round(self.rows.estimated_error_rate, 6),
         }
+        return report
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..domain.entities import DataBatch, DataSource
+from .file_lock import file_lock
+from .sources import expand_files, is_multi_file
+
+DEFAULT_WATERMARK_PATH = "outputs/etl_watermarks.json"
+
+# column: rows with `column > watermark`; mtime/name: files newer (or sorting after) the watermark
+WATERMARK_MODES = ("column", "mtime", "name")
+
+
+class WatermarkStore:
+    """High-watermarks per source, kept in a single JSON file rewritten atomically under a lock."""
+
+    def __init__(self, path: str | Path = DEFAULT_WATERMARK_PATH):
+        self.path = Path(path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._load().get(key)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        # Jobs sharing the file commit concurrently; the lock keeps their keys from overwriting each other
+        with file_lock(self.path):
+            entries = self._load()
+            entries[key] = {**entry, "updated_at": time.time()}
+            staging = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            staging.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(staging, self.path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+
+@dataclass
+class IncrementalPlan:
+    """The delta to read for one run and the watermark to commit once it is loaded."""
+    source: DataSource
+    key: str
+    mode: str
+    column: Optional[str]
+    previous: Any
+    pending: Any
+    has_data: bool = True
+
+    def observe(self, batch: DataBatch) -> None:
+        if self.mode != "column":
+            return
+        value = _column_max(batch, self.column)
+        if value is not None and (self.pending is None or value > self.pending):
+            self.pending = value
+
+    def track(self, batches: Iterable[DataBatch]) -> Iterator[DataBatch]:
+        for batch in batches:
+            self.observe(batch)
+            yield batch
+
+    def commit(self, store: WatermarkStore) -> bool:
+        """Persist the new watermark; call only after the delta reached the destination."""
+        if self.pending is None or self.pending == self.previous:
+            return False
+        store.set(self.key, {"mode": self.mode, "column": self.column, "value": _encode(self.pending)})
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        return {"key": self.key, "mode": self.mode, "column": self.column,
+                "previous": _encode(self.previous), "pending": _encode(self.pending)}
+
+
+def plan_incremental(source: DataSource, spec: Dict[str, Any], store: WatermarkStore) -> IncrementalPlan:
+    """Narrow `source` to what changed since the stored watermark.
+
+    `spec` is `{"mode": "column", "column": "updated_at"}` (any source whose
+    reader accepts `filters`) or `{"mode": "mtime"}` / `{"mode": "name"}` for
+    a directory or glob of files.
+    """
+    mode = spec.get("mode", "column")
+    if mode not in WATERMARK_MODES:
+        raise ValueError(f"Unsupported watermark mode: {mode} (use one of {WATERMARK_MODES})")
+    column = spec.get("column")
+    if mode == "column" and not column:
+        raise ValueError("Column watermarks require 'column'")
+
+    key = spec.get("key") or f"{source.kind}:{source.uri}:{mode}:{column or ''}"
+    stored = store.get(key)
+    previous = _decode(stored["value"]) if stored else None
+
+    if mode == "column":
+        options = dict(source.options)
+        if previous is not None:
+            options["filters"] = _and_filter(options.get("filters"), (column, ">", previous))
+        return IncrementalPlan(replace(source, options=options), key, mode, column, previous, previous)
+
+    files = expand_files(source.uri) if is_multi_file(source.uri) else [source.uri]
+    marks = {path: (Path(path).stat().st_mtime_ns if mode == "mtime" else Path(path).name) for path in files}
+    selected = [path for path in files if previous is None or marks[path] > previous]
+    pending = max((marks[path] for path in selected), default=previous)
+    options = {**source.options, "files": selected}
+    return IncrementalPlan(replace(source, options=options), key, mode, None, previous, pending,
+                           has_data=bool(selected))
+
+
+def _and_filter(filters: Any, term: tuple) -> Any:
+    if not filters:
+        return [term]
+    if isinstance(filters[0], list):
+        return [[*conjunction, term] for conjunction in filters]
+    return [*filters, term]
+
+
+def _column_max(batch: DataBatch, column: str) -> Any:
+    if batch.num_rows == 0:
+        return None
+    if batch.is_arrow:
+        import pyarrow.compute as pc
+
+        table = batch.to_arrow()
+        if column not in table.column_names:
+            raise ValueError(f"Watermark column not in batch: {column}")
+        return pc.max(table[column]).as_py()
+    df = batch.raw
+    if column not in df.columns:
+        raise ValueError(f"Watermark column not in batch: {column}")
+    value = df[column].max()
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and "datetime" in value:
+        return datetime.fromisoformat(value["datetime"])
+    if isinstance(value, dict) and "date" in value:
+        return date.fromisoformat(value["date"])
+    return value
@@ -0,0 +1,3 @@
+"""Benchmark suite for the ETL adapters and pipeline on deterministic synthetic data."""
+
+__all__ = ["synthetic", "runner"]
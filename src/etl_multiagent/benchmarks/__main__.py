@@ -0,0 +1,55 @@
+"""Run the ETL benchmarks: `python -m etl_multiagent.benchmarks --rows 1000000 --compare baseline.json`."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import click
+
+from .runner import (
+    DEFAULT_BENCHMARK_CHUNK_ROWS,
+    DEFAULT_BENCHMARK_DIR,
+    DEFAULT_BENCHMARK_OUTPUT,
+    DEFAULT_REGRESSION_THRESHOLD,
+    compare_results,
+    run_benchmarks,
+)
+from .synthetic import DEFAULT_SEED, SHAPES
+
+
+@click.command()
+@click.option("--shapes", "-s", multiple=True, type=click.Choice(SHAPES), help="Formas de tabla (todas por defecto)")
+@click.option("--rows", "-r", multiple=True, type=int, help="Tamaños en filas (1000000 por defecto)")
+@click.option("--formats", "-f", multiple=True, type=click.Choice(["parquet", "csv"]), help="Formatos (parquet por defecto)")
+@click.option("--dir", "directory", default=DEFAULT_BENCHMARK_DIR, show_default=True, help="Directorio de datasets")
+@click.option("--output", "-o", default=DEFAULT_BENCHMARK_OUTPUT, show_default=True, help="Archivo JSON de resultados")
+@click.option("--chunk-rows", default=DEFAULT_BENCHMARK_CHUNK_ROWS, show_default=True, help="Filas por chunk")
+@click.option("--seed", default=DEFAULT_SEED, show_default=True)
+@click.option("--no-end-to-end", is_flag=True, help="Omitir la ejecución completa del flow")
+@click.option("--compare", "baseline", type=click.Path(exists=True, dir_okay=False), help="JSON base para comparar")
+@click.option("--threshold", default=DEFAULT_REGRESSION_THRESHOLD, show_default=True, help="Ratio de regresión")
+def main(shapes, rows, formats, directory, output, chunk_rows, seed, no_end_to_end, baseline, threshold):
+    """Benchmarks de los adapters ETL y del pipeline completo."""
+    report = run_benchmarks(
+        shapes=shapes or SHAPES, sizes=rows or (1_000_000,), formats=formats or ("parquet",),
+        directory=directory, output=output, chunk_rows=chunk_rows, seed=seed, end_to_end=not no_end_to_end,
+    )
+    for r in report["results"]:
+        if "error" in r:
+            click.echo(f"{r['shape']:>8} {r['rows']:>11,} {r['format']:>7} {r['stage']:>10}  error: {r['error']}")
+        else:
+            click.echo(f"{r['shape']:>8} {r['rows']:>11,} {r['format']:>7} {r['stage']:>10}  "
+                       f"{r['rows_per_s']:>14,.0f} rows/s {r['mb_per_s']:>9.1f} MB/s {r['peak_rss_mb']:>8.0f} MB RSS")
+    click.echo(f"Resultados: {output}")
+    if baseline:
+        comparison = compare_results(json.loads(Path(baseline).read_text(encoding="utf-8")), report, threshold)
+        regressions = [c for c in comparison if c["regression"]]
+        for c in regressions:
+            click.echo(f"Regresión: {c['shape']} {c['rows']:,} {c['format']} {c['stage']} x{c['speedup']}")
+        if regressions:
+            raise SystemExit(1)
+        click.echo(f"Sin regresiones frente a {baseline}")
+
+
+if __name__ == "__main__":
+    main()
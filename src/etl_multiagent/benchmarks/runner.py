@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from ..domain.entities import DataBatch, DataDestination, DataSource, TransformationJob
+from ..flows.instrumentation import peak_rss_mb
+from .synthetic import DEFAULT_SEED, SHAPES, dataset_path, write_dataset
+
+DEFAULT_BENCHMARK_DIR = "outputs/etl_bench"
+DEFAULT_BENCHMARK_OUTPUT = "outputs/etl_benchmark.json"
+DEFAULT_BENCHMARK_CHUNK_ROWS = 500_000
+# A stage slower than the baseline by more than this ratio is flagged as a regression
+DEFAULT_REGRESSION_THRESHOLD = 1.10
+
+
+@dataclass
+class BenchmarkCase:
+    shape: str
+    rows: int
+    format: str = "parquet"
+    chunk_rows: int = DEFAULT_BENCHMARK_CHUNK_ROWS
+    seed: int = DEFAULT_SEED
+    end_to_end: bool = True
+
+
+def run_benchmarks(
+    shapes: Sequence[str] = SHAPES,
+    sizes: Sequence[int] = (1_000_000,),
+    formats: Sequence[str] = ("parquet",),
+    directory: str | Path = DEFAULT_BENCHMARK_DIR,
+    output: Optional[str | Path] = DEFAULT_BENCHMARK_OUTPUT,
+    chunk_rows: int = DEFAULT_BENCHMARK_CHUNK_ROWS,
+    seed: int = DEFAULT_SEED,
+    end_to_end: bool = True,
+) -> Dict[str, Any]:
+    """Time every adapter and the whole pipeline on synthetic datasets; write the results as JSON.
+
+    Datasets are generated once under `directory` and reused. The adapter pass
+    and the end-to-end run of each case run in fresh processes, so each peak
+    RSS is its own.
+    """
+    results = []
+    for fmt in formats:
+        for shape in shapes:
+            for rows in sizes:
+                path = dataset_path(directory, shape, rows, fmt, seed)
+                if not path.exists():
+                    write_dataset(path, shape, rows, fmt, seed)
+                case = BenchmarkCase(shape, rows, fmt, chunk_rows, seed, end_to_end)
+                results.extend(_in_fresh_process(run_adapters, case, str(path), str(directory)))
+                if end_to_end:
+                    results.append(_in_fresh_process(run_end_to_end, case, str(path), str(directory)))
+    report = {"environment": environment(), "results": results}
+    if output is not None:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def run_adapters(case: BenchmarkCase, path: str, directory: str) -> List[Dict[str, Any]]:
+    """Source, transform, validation and destination adapters timed separately over one streamed pass."""
+    from ..adapters.destinations import FileDestinationAdapter
+    from ..adapters.sources import FileSourceAdapter
+    from ..adapters.transformers import PandasTransformAdapter, ValidationAdapter
+
+    input_bytes = Path(path).stat().st_size
+    source = DataSource(name="bench", kind="file", uri=path, format=case.format)
+    reader, transformer, validator = FileSourceAdapter(case.chunk_rows), PandasTransformAdapter(), ValidationAdapter()
+    job = _job(path, case.format)
+    seconds = {"read": 0.0, "transform": 0.0, "validate": 0.0}
+    rows = 0
+
+    def timed() -> Iterator[DataBatch]:
+        nonlocal rows
+        batches = reader.read_stream(source)
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            seconds["read"] += time.perf_counter() - start
+            if batch is None:
+                return
+            start = time.perf_counter()
+            batch = transformer.apply(batch, job)
+            seconds["transform"] += time.perf_counter() - start
+            start = time.perf_counter()
+            validator.validate(batch, {"check_nulls": True, "check_duplicates": True})
+            seconds["validate"] += time.perf_counter() - start
+            rows += batch.num_rows
+            yield batch
+
+    start = time.perf_counter()
+    FileDestinationAdapter().write_stream(timed(), _destination(path, directory))
+    # Writing is what remains of the pass once the upstream stages are taken out
+    seconds["write"] = time.perf_counter() - start - sum(seconds.values())
+    peak = peak_rss_mb()
+    return [{**_result(case, stage, seconds[stage], rows, input_bytes), "peak_rss_mb": peak} for stage in seconds]
+
+
+def run_end_to_end(case: BenchmarkCase, path: str, directory: str) -> Dict[str, Any]:
+    """`ETLPipelineFlow` streaming the dataset through every stage."""
+    try:
+        from ..flows.etl_pipeline_flow import ETLFlowState, ETLPipelineFlow
+    except ImportError as e:  # The flow needs CrewAI
+        return {**asdict(case), "stage": "end_to_end", "error": str(e)}
+
+    job = _job(path, case.format)
+    flow = ETLPipelineFlow.from_state(ETLFlowState(
+        source_uri=path, source_format=case.format, dest_uri=_destination(path, directory).uri, dest_format="parquet",
+        mappings=job.mappings, target_schema=job.target_schema, transform_rules=job.rules,
+        chunk_size=case.chunk_rows,
+    ))
+    start = time.perf_counter()
+    flow.run_steps()
+    seconds = time.perf_counter() - start
+    if flow.state.errors:
+        return {**asdict(case), "stage": "end_to_end", "error": "; ".join(flow.state.errors)}
+    rows = flow.state.load_result.get("rows_written", 0)
+    return {**_result(case, "end_to_end", seconds, rows, Path(path).stat().st_size), "peak_rss_mb": peak_rss_mb()}
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """Per (shape, rows, format, stage): throughput ratio current/baseline, flagging slowdowns past `threshold`."""
+    def key(result: Dict[str, Any]) -> tuple:
+        return result["shape"], result["rows"], result["format"], result["stage"]
+
+    before = {key(r): r for r in baseline.get("results", []) if "rows_per_s" in r}
+    rows = []
+    for result in current.get("results", []):
+        old = before.get(key(result))
+        if old is None or "rows_per_s" not in result:
+            continue
+        ratio = result["rows_per_s"] / old["rows_per_s"] if old["rows_per_s"] else float("inf")
+        rows.append({
+            "shape": result["shape"], "rows": result["rows"], "format": result["format"], "stage": result["stage"],
+            "baseline_rows_per_s": old["rows_per_s"], "rows_per_s": result["rows_per_s"],
+            "speedup": round(ratio, 3), "regression": ratio * threshold < 1,
+        })
+    return rows
+
+
+def environment() -> Dict[str, Any]:
+    import numpy
+    import pandas
+
+    info = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+    }
+    try:
+        import pyarrow
+
+        info["pyarrow"] = pyarrow.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def _job(path: str, fmt: str) -> TransformationJob:
+    # A rename of the first column and a float32 cast of the first float column: the typical mapping job
+    import pyarrow.parquet as pq
+    import pandas as pd
+
+    sample = pq.read_schema(path).empty_table().to_pandas() if fmt == "parquet" else pd.read_csv(path, nrows=100)
+    first = str(sample.columns[0])
+    floats = [str(name) for name in sample.columns if pd.api.types.is_float_dtype(sample[name].dtype)]
+    return TransformationJob(
+        source_schema={},
+        target_schema={floats[0]: "float32"} if floats else {},
+        mappings={f"{first}_copy": first},
+        rules={"low_copy": True},
+    )
+
+
+def _destination(path: str, directory: str) -> DataDestination:
+    return DataDestination(name="bench", kind="file", uri=str(Path(directory) / f"out-{Path(path).stem}.parquet"),
+                           format="parquet")
+
+
+def _in_fresh_process(function: Any, *args: Any) -> Any:
+    # spawn: a forked child would inherit (and report) the parent's peak RSS
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(function, *args).result()
+
+
+def _result(case: BenchmarkCase, stage: str, seconds: float, rows: int, input_bytes: int) -> Dict[str, Any]:
+    return {
+        **asdict(case),
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(rows / seconds, 1) if seconds > 0 else None,
+        # Throughput in source bytes, so stages and formats compare on the same basis
+        "mb_per_s": round(input_bytes / 1024 ** 2 / seconds, 2) if seconds > 0 else None,
+        "input_mb": round(input_bytes / 1024 ** 2, 2),
+    }
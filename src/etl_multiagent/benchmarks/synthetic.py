@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+# Table shapes of the benchmark datasets
+SHAPES = ("narrow", "wide", "strings", "numeric")
+BENCHMARK_ROWS = (1_000_000, 10_000_000, 100_000_000)
+DEFAULT_SEED = 42
+# Rows generated (and written) per chunk, so 100M-row files never sit in memory
+DEFAULT_GENERATOR_CHUNK_ROWS = 1_000_000
+
+_WORDS = np.array([
+    "data", "pipeline", "quality", "stream", "batch", "column", "schema", "value", "record", "source",
+    "target", "cloud", "agent", "market", "report", "signal", "metric", "customer", "order", "region",
+], dtype=object)
+_COUNTRIES = np.array(["CO", "MX", "AR", "CL", "PE", "BR", "US", "ES", "EC", "UY"], dtype=object)
+_START = np.datetime64("2024-01-01T00:00:00", "s")
+
+
+def generate_chunks(
+    shape: str,
+    rows: int,
+    seed: int = DEFAULT_SEED,
+    chunk_rows: int = DEFAULT_GENERATOR_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Yield `rows` rows of a synthetic table in chunks.
+
+    Each chunk draws from its own generator seeded with `(seed, chunk index)`,
+    so the data depends only on the arguments (not on how much was generated
+    before) and chunk `i` can be rebuilt alone.
+    """
+    if shape not in _BUILDERS:
+        raise ValueError(f"Unsupported shape: {shape} (use one of {SHAPES})")
+    build = _BUILDERS[shape]
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        size = min(chunk_rows, rows - start)
+        rng = np.random.default_rng([seed, index])
+        yield build(rng, np.arange(start, start + size, dtype=np.int64))
+
+
+def write_dataset(
+    path: str | Path,
+    shape: str,
+    rows: int,
+    fmt: str = "parquet",
+    seed: int = DEFAULT_SEED,
+    chunk_rows: int = DEFAULT_GENERATOR_CHUNK_ROWS,
+) -> Path:
+    """Write a synthetic table chunk by chunk as CSV or Parquet (one row group per chunk)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.tmp")
+    if fmt == "csv":
+        for index, chunk in enumerate(generate_chunks(shape, rows, seed, chunk_rows)):
+            chunk.to_csv(staging, mode="w" if index == 0 else "a", header=index == 0, index=False)
+    elif fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in generate_chunks(shape, rows, seed, chunk_rows):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(staging, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    staging.replace(path)
+    return path
+
+
+def dataset_path(directory: str | Path, shape: str, rows: int, fmt: str, seed: int = DEFAULT_SEED) -> Path:
+    return Path(directory) / f"{shape}-{rows}-s{seed}.{fmt}"
+
+
+def _narrow(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": ids,
+        "event_time": _START + rng.integers(0, 365 * 86400, len(ids)).astype("timedelta64[s]"),
+        "amount": rng.gamma(2.0, 50.0, len(ids)).round(2),
+        "country": rng.choice(_COUNTRIES, len(ids)),
+    })
+
+
+def _wide(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    columns: Dict[str, Any] = {"id": ids}
+    for i in range(20):
+        columns[f"f{i:02d}"] = rng.normal(i, 1.0 + i, len(ids))
+    for i in range(20):
+        columns[f"i{i:02d}"] = rng.integers(0, 10 ** (1 + i % 6), len(ids))
+    for i in range(10):
+        columns[f"s{i:02d}"] = rng.choice(_WORDS, len(ids))
+    return pd.DataFrame(columns)
+
+
+def _strings(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    n = len(ids)
+    user = rng.integers(0, 1_000_000, n).astype(str).astype(object)
+    return pd.DataFrame({
+        "id": ids,
+        "name": rng.choice(_WORDS, n) + " " + rng.choice(_WORDS, n),
+        "email": "user" + user + "@" + rng.choice(_WORDS, n) + ".com",
+        "country": rng.choice(_COUNTRIES, n),
+        "city": "city-" + rng.integers(0, 1000, n).astype(str).astype(object),
+        "code": np.char.mod("%016x", rng.integers(0, 2 ** 62, n)).astype(object),
+        "comment": rng.choice(_WORDS, n) + " " + rng.choice(_WORDS, n) + " " + rng.choice(_WORDS, n),
+    })
+
+
+def _numeric(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    columns: Dict[str, Any] = {"id": ids}
+    for i in range(12):
+        columns[f"x{i:02d}"] = rng.random(len(ids))
+    for i in range(4):
+        columns[f"n{i:02d}"] = rng.integers(-1_000_000, 1_000_000, len(ids))
+    return pd.DataFrame(columns)
+
+
+_BUILDERS: Dict[str, Callable[[np.random.Generator, np.ndarray], pd.DataFrame]] = {
+    "narrow": _narrow,
+    "wide": _wide,
+    "strings": _strings,
+    "numeric": _numeric,
+}
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -16,11 +16,39 @@ class DataSource:
 
 @dataclass
 class DataBatch:
+    """A unit of data moving between ports.
+
+    `raw` is a pandas DataFrame or a pyarrow Table/RecordBatch. Adapters that can
+    work on Arrow buffers pass them through untouched; the others call
+    `to_pandas()` explicitly, so conversions only happen where they are needed.
+    """
     raw: Any
     schema: Optional[Dict[str, Any]] = None
     stats: Optional[Dict[str, Any]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def is_arrow(self) -> bool:
+        return type(self.raw).__module__.startswith("pyarrow")
+
+    @property
+    def num_rows(self) -> int:
+        return self.raw.num_rows if self.is_arrow else len(self.raw)
+
+    def to_pandas(self) -> Any:
+        if self.is_arrow:
+            return self.raw.to_pandas()
+        return self.raw
+
+    def to_arrow(self) -> Any:
+        import pyarrow as pa
+
+        if isinstance(self.raw, pa.Table):
+            return self.raw
+        if isinstance(self.raw, pa.RecordBatch):
+            return pa.Table.from_batches([self.raw])
+        return pa.Table.from_pandas(self.raw, preserve_index=False)
+
 
 @dataclass
 class TransformationJob:
@@ -30,6 +58,14 @@ class TransformationJob:
     rules: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.utcnow)
 
+    def required_columns(self) -> Optional[List[str]]:
+        """Source columns the job reads (mapping sources and cast-only columns); None means all."""
+        if not self.mappings and not self.target_schema:
+            return None
+        columns = list(dict.fromkeys(self.mappings.values()))
+        columns += [name for name in self.target_schema if name not in self.mappings and name not in columns]
+        return columns
+
 
 @dataclass
 class DataDestination:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from typing import Callable, Iterable, Iterator
+
 from ..domain.entities import DataSource, DataBatch, TransformationJob, DataDestination
-from ..ports import SourcePort, TransformPort, ValidationPort, DestinationPort
+from ..ports import SourcePort, TransformPort, ValidationPort, ProfilingPort, DestinationPort
 
 
 class IngestData:
@@ -11,6 +13,9 @@ class IngestData:
     def execute(self, source: DataSource) -> DataBatch:
         return self.source_port.read(source)
 
+    def execute_stream(self, source: DataSource) -> Iterator[DataBatch]:
+        return self.source_port.read_stream(source)
+
 
 class TransformData:
     def __init__(self, transform_port: TransformPort):
@@ -19,6 +24,15 @@ class TransformData:
     def execute(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
         return self.transform_port.apply(batch, job)
 
+    def execute_stream(self, batches: Iterable[DataBatch], job: TransformationJob) -> Iterator[DataBatch]:
+        apply_stream = getattr(self.transform_port, "apply_stream", None)
+        if apply_stream is not None:
+            # Stream-aware ports (joins, aggregations) need to see every batch
+            yield from apply_stream(batches, job)
+            return
+        for batch in batches:
+            yield self.transform_port.apply(batch, job)
+
 
 class LoadData:
     def __init__(self, destination_port: DestinationPort):
@@ -27,6 +41,9 @@ class LoadData:
     def execute(self, batch: DataBatch, destination: DataDestination) -> dict:
         return self.destination_port.write(batch, destination)
 
+    def execute_stream(self, batches: Iterable[DataBatch], destination: DataDestination) -> dict:
+        return self.destination_port.write_stream(batches, destination)
+
 
 class ReconcileJobResult:
     def __init__(self, validation_port: ValidationPort):
@@ -34,3 +51,36 @@ class ReconcileJobResult:
 
     def execute(self, batch: DataBatch, rules: dict) -> dict:
         return self.validation_port.validate(batch, rules)
+
+    def execute_stream(
+        self,
+        batches: Iterable[DataBatch],
+        rules: dict,
+        on_report: Callable[[dict], None],
+    ) -> Iterator[DataBatch]:
+        """Validate each batch as it passes through, handing reports to `on_report`."""
+        for batch in batches:
+            on_report(self.validation_port.validate(batch, rules))
+            yield batch
+
+
+class ProfileData:
+    def __init__(self, profiling_port: ProfilingPort):
+        self.profiling_port = profiling_port
+
+    def execute(self, batch: DataBatch) -> dict:
+        self.profiling_port.update(batch)
+        profile = self.profiling_port.profile()
+        batch.stats = {**(batch.stats or {}), "profile": profile}
+        return profile
+
+    def execute_stream(
+        self,
+        batches: Iterable[DataBatch],
+        on_profile: Callable[[dict], None],
+    ) -> Iterator[DataBatch]:
+        """Profile batches as they pass through; `on_profile` gets the merged profile once the stream ends."""
+        for batch in batches:
+            self.profiling_port.update(batch)
+            yield batch
+        on_profile(self.profiling_port.profile())
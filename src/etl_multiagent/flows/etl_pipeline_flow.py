@@ -1,14 +1,39 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from pathlib import Path
+from functools import partial
+from typing import Optional, Dict, Any, Iterator, List
 from crewai.flow.flow import Flow, listen, start
 
 from ..domain.entities import DataSource, DataBatch, TransformationJob, DataDestination
-from ..domain.use_cases import IngestData, TransformData, LoadData, ReconcileJobResult
-from ..adapters.sources import FileSourceAdapter
-from ..adapters.destinations import FileDestinationAdapter
-from ..adapters.transformers import PandasTransformAdapter, ValidationAdapter
+from ..domain.use_cases import IngestData, TransformData, LoadData, ProfileData, ReconcileJobResult
+from ..adapters.sources import DatabaseSourceAdapter, FileSourceAdapter, S3SourceAdapter
+from ..adapters.destinations import FileDestinationAdapter, PostgresDestinationAdapter
+from ..adapters.transformers import (
+    ArrowTransformAdapter,
+    DuckDBTransformAdapter,
+    IncrementalValidationAdapter,
+    PandasTransformAdapter,
+    ValidationAdapter,
+)
+from ..adapters.checkpoints import DEFAULT_CHECKPOINT_PATH, CheckpointedLoad, CheckpointStore
+from ..adapters.spill import KEYED_RULES
+from ..adapters.stage_cache import DEFAULT_CACHE_MAX_BYTES, StageCache, cache_key, source_fingerprint
+from ..adapters.profiler import DataProfiler
+from ..adapters.quarantine import DEFAULT_QUARANTINE_PATH, QuarantineAdapter, merge_quarantine_reports
+from ..adapters.schema_registry import DEFAULT_SCHEMA_REGISTRY_PATH
+from ..adapters.watermarks import DEFAULT_WATERMARK_PATH, IncrementalPlan, WatermarkStore, plan_incremental
+from .partitioned_executor import Partition, PartitionedETLExecutor
+from .instrumentation import FlowMetrics, InstrumentedPort, emit_spans, measured_step, write_prometheus
+from .pipelined_executor import DEFAULT_PIPELINE_BUFFER, PipelineStage
+
+DEFAULT_VALIDATION_RULES = {"check_nulls": True, "check_duplicates": True}
+
+SOURCE_ADAPTERS = {"file": FileSourceAdapter, "db": DatabaseSourceAdapter, "s3": S3SourceAdapter}
+DESTINATION_ADAPTERS = {"file": FileDestinationAdapter, "db": PostgresDestinationAdapter}
+# Chosen per job with transform_rules["engine"]; otherwise arrow_native picks arrow or pandas
+TRANSFORM_ENGINES = {"pandas": PandasTransformAdapter, "arrow": ArrowTransformAdapter, "duckdb": DuckDBTransformAdapter}
 
 
 @dataclass
@@ -19,83 +44,582 @@ class ETLFlowState:
     dest_format: str
     mappings: Dict[str, str]
     target_schema: Dict[str, str]
+    # Adapter selection: source "file" | "db" | "s3", destination "file" | "db"
+    source_kind: str = "file"
+    dest_kind: str = "file"
+    # Reader options, e.g. {"table": "events"} for db sources
+    source_options: Optional[Dict[str, Any]] = None
+    # Rows per chunk; when set, stages run per chunk and memory is bounded by chunk size
+    chunk_size: Optional[int] = None
+    # Keep batches as pyarrow Tables end to end (Parquet/CSV in and out without pandas)
+    arrow_native: bool = False
+    # Destination options: partition_cols/compression/row_group_size/mode for files, table/mode/key_columns for db
+    dest_options: Optional[Dict[str, Any]] = None
+    # Worker processes; above 1 the input is split into partitions run in parallel
+    workers: int = 1
+    partition_strategy: str = "auto"
+    partition_key: Optional[str] = None
+    # Read only the columns the job uses (TransformationJob.required_columns)
+    project_columns: bool = False
+    # DNF predicates pushed to the reader, e.g. [("country", "=", "CO")]; Parquet skips non-matching row groups
+    source_filters: Optional[List[Any]] = None
+    # TransformationJob.rules, e.g. {"low_copy": True, "optimize_memory": True}
+    transform_rules: Optional[Dict[str, Any]] = None
+    # Extra checks merged over the defaults: type_checks, range_checks, pattern_checks, referential_integrity
+    validation_rules: Optional[Dict[str, Any]] = None
+    # Sketch sizing for streamed validation: hll_precision, bloom_capacity, bloom_error_rate
+    validation_sketch_options: Optional[Dict[str, Any]] = None
+    # Directory for stage snapshots; reruns with unchanged inputs resume after the last cached stage
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    # Read only new data: {"mode": "column", "column": "updated_at"} or {"mode": "mtime"|"name"}
+    incremental: Optional[Dict[str, Any]] = None
+    watermark_path: str = DEFAULT_WATERMARK_PATH
+    # Parse file sources with dtypes inferred from a sample and kept in the schema registry
+    infer_schema: bool = False
+    schema_registry_path: str = DEFAULT_SCHEMA_REGISTRY_PATH
+    # Split rows failing casts or validation rules into a JSON Lines dead-letter file; the good rows continue
+    quarantine: bool = False
+    quarantine_path: str = DEFAULT_QUARANTINE_PATH
+    # Commit each chunk (or partition) to a SQLite checkpoint store; rerunning a failed job resumes after the last commit.
+    # Streamed: dest_uri is a directory (no extension) of part-<chunk> files
+    checkpoint: bool = False
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH
+    # Profile the transformed data; options go to DataProfiler (exact_distinct_limit, sample_size...)
+    profile_data: bool = False
+    profile_options: Optional[Dict[str, Any]] = None
+    # With chunk_size: read, transform/validate and load run in their own threads over bounded queues
+    pipelined: bool = False
+    pipeline_buffer: int = DEFAULT_PIPELINE_BUFFER
+    # Besides state.metrics: write a Prometheus text file and/or emit OpenTelemetry spans
+    metrics_prometheus_path: Optional[str] = None
+    metrics_otel: bool = False
     
     batch: Optional[DataBatch] = None
+    stream: Optional[Iterator[DataBatch]] = None
+    partitions: Optional[List[Partition]] = None
     validation_report: Optional[Dict[str, Any]] = None
     load_result: Optional[Dict[str, Any]] = None
     errors: list[str] = None
+    cache_keys: Optional[Dict[str, str]] = None
+    cache_hits: list[str] = None
+    incremental_plan: Optional[IncrementalPlan] = None
+    checkpoint_key: Optional[str] = None
+    checkpoint_load: Optional[CheckpointedLoad] = None
+    profile: Optional[Dict[str, Any]] = None
+    # Summed `optimize_memory` reports: bytes_before, bytes_after, columns converted
+    memory_report: Optional[Dict[str, Any]] = None
+    # Per pipelined stage: chunks, busy_s, blocked_s (waiting on downstream), waiting_s (downstream waiting on it)
+    pipeline_report: Optional[Dict[str, Any]] = None
+    # {"steps": per flow step, "ports": per port method}: wall_s, cpu_s, rows/bytes in and out, rss_peak_delta_mb
+    metrics: Optional[Dict[str, Any]] = None
+    # Quarantined rows: dead-letter paths, row count and rows per reason code
+    quarantine_report: Optional[Dict[str, Any]] = None
     
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.cache_hits is None:
+            self.cache_hits = []
 
 
 class ETLPipelineFlow(Flow[ETLFlowState]):
-    """Flow orchestrating ETL pipeline using use cases and adapters."""
+    """Flow orchestrating ETL pipeline using use cases and adapters.
+
+    With `chunk_size` set, each step wraps a lazy stream of batches instead of a
+    single batch; `load_destination` drives the stream so every chunk goes through
+    ingest -> transform -> validate -> load before the next one is read.
+
+    With `workers > 1`, ingestion only plans partitions and `load_destination`
+    runs the whole chain per partition on a `PartitionedETLExecutor`.
+
+    With `incremental`, only rows/files past the stored watermark are read and
+    the destination defaults to `mode="append"`; the new watermark is committed
+    after a successful load, so failed runs re-read the same delta.
+
+    With `cache_dir`, ingest and transform outputs are snapshotted in a
+    `StageCache` keyed by the source fingerprint, the job and the adapters;
+    a rerun restores the latest stage whose inputs are unchanged.
+
+    With `checkpoint`, a streamed run writes `dest_uri` as a directory of
+    `part-<chunk>` files, committing each to a `CheckpointStore`; a rerun of
+    an interrupted job skips the committed chunks (see `CheckpointedLoad`).
+
+    Every step and port call is measured into `state.metrics` (see
+    `FlowMetrics`); `export_metrics` can also publish them as a Prometheus
+    text file or OpenTelemetry spans.
+    """
+    
+    @classmethod
+    def from_state(cls, state: ETLFlowState) -> "ETLPipelineFlow":
+        """Flow starting from `state` (CrewAI only builds initial state from dicts and pydantic models)."""
+        flow = cls()
+        flow._state = state
+        return flow
     
     @start()
+    @measured_step
     def ingest_source(self):
         source = DataSource(
             name="user_source",
-            kind="file",
+            kind=self.state.source_kind,
             uri=self.state.source_uri,
             format=self.state.source_format,
+            options=dict(self.state.source_options or {}),
         )
         
-        use_case = IngestData(source_port=FileSourceAdapter())
+        if self.state.arrow_native:
+            source.options["arrow"] = True
+        if self.state.project_columns:
+            source.options["columns"] = self._build_job().required_columns()
+        if self.state.source_filters:
+            source.options["filters"] = self.state.source_filters
+        if self.state.infer_schema and self.state.source_kind == "file":
+            source.options.update(schema="registry", schema_registry=self.state.schema_registry_path)
+        
+        use_case = IngestData(source_port=self._instrument("source", self._source_adapter()))
         try:
-            self.state.batch = use_case.execute(source)
+            if self.state.incremental:
+                source = self._plan_incremental(source)
+                if source is None:
+                    return
+            if self.state.checkpoint:
+                self._plan_checkpoint(source)
+            if self.state.workers > 1:
+                self._check_partitioned_aggregate()
+                if self.state.infer_schema and self.state.source_kind == "file":
+                    # Infer once here rather than once per partition worker
+                    source = FileSourceAdapter().resolve_schema(source)
+                self.state.partitions = self._executor().plan(source)
+                return
+            if self.state.chunk_size:
+                source.options["chunksize"] = self.state.chunk_size
+            if self.state.cache_dir and not self.state.incremental:
+                # Deltas differ on every run, so they are never worth snapshotting
+                self._plan_cache(source)
+                if self._restore("transform") or self._restore("ingest"):
+                    return
+            if self.state.chunk_size:
+                self.state.stream = use_case.execute_stream(source)
+            else:
+                self.state.batch = use_case.execute(source)
+            self._snapshot("ingest")
         except Exception as e:
             self.state.errors.append(f"Ingestion failed: {e}")
+            return
+        plan = self.state.incremental_plan
+        if plan is not None:
+            if self.state.stream is not None:
+                self.state.stream = plan.track(self.state.stream)
+            else:
+                plan.observe(self.state.batch)
+                if self.state.batch.num_rows == 0:
+                    self._skip("no new rows")
+        if self.state.checkpoint_load is not None and self.state.stream is not None:
+            # Chunks committed by the interrupted run are dropped before any work is spent on them
+            self.state.stream = self.state.checkpoint_load.skip_committed(self.state.stream)
+    
+    def _check_partitioned_aggregate(self) -> None:
+        aggregate = (self.state.transform_rules or {}).get("aggregate")
+        if not aggregate:
+            return
+        group_by = aggregate.get("group_by")
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        # Each worker aggregates its own partition: groups must not span partitions
+        if self.state.partition_strategy not in ("hash", "key_range") or self.state.partition_key not in group_by:
+            raise ValueError("Aggregations with workers > 1 need hash/key_range partitioning on a group_by column")
+    
+    def _plan_checkpoint(self, source: DataSource) -> None:
+        rules = self.state.transform_rules or {}
+        if self.state.cache_dir:
+            raise ValueError("checkpoint and cache_dir are alternative ways to resume; set only one")
+        if self.state.dest_kind != "file":
+            raise ValueError("Checkpoints need a file destination")
+        if self.state.workers <= 1:
+            if not self.state.chunk_size:
+                raise ValueError("Checkpoints need chunk_size (streamed runs) or workers > 1")
+            if any(rules.get(rule) for rule in KEYED_RULES) or rules.get("engine") == "duckdb":
+                raise ValueError("Checkpoints need chunk-wise transforms; join, aggregate and duckdb outputs span chunks")
+            if (self.state.dest_options or {}).get("partition_cols"):
+                raise ValueError("Checkpointed streamed loads do not support partition_cols")
+        job = self._build_job()
+        self.state.checkpoint_key = cache_key(
+            "checkpoint", source_fingerprint(source), self.state.chunk_size, self.state.workers,
+            self.state.partition_strategy, self.state.partition_key,
+            job.mappings, job.target_schema, job.rules, self._validation_rules(), self.state.dest_format,
+        )
+        if self.state.workers <= 1:
+            self.state.checkpoint_load = CheckpointedLoad(
+                CheckpointStore(self.state.checkpoint_path), self._build_destination(), self.state.checkpoint_key
+            )
+    
+    def _plan_incremental(self, source: DataSource) -> Optional[DataSource]:
+        if self.state.workers > 1 and self.state.incremental.get("mode", "column") == "column":
+            raise ValueError("Column watermarks need a single worker; use mtime/name watermarks with workers > 1")
+        plan = plan_incremental(source, self.state.incremental, WatermarkStore(self.state.watermark_path))
+        self.state.incremental_plan = plan
+        if not plan.has_data:
+            self._skip("no new files")
+            return None
+        return plan.source
+    
+    def _skip(self, reason: str) -> None:
+        self.state.batch = None
+        self.state.stream = None
+        self.state.load_result = {"status": "skipped", "rows_written": 0, "reason": reason}
+    
+    def _skipped(self) -> bool:
+        return bool(self.state.load_result) and self.state.load_result.get("status") == "skipped"
     
     @listen(ingest_source)
+    @measured_step
     def transform_data(self):
-        if self.state.batch is None:
+        if self.state.partitions is not None or self._skipped():
+            return  # Deferred to the partition workers, or nothing new to process
+        if self.state.batch is None and self.state.stream is None:
             self.state.errors.append("No batch to transform")
             return
         
-        job = TransformationJob(
-            source_schema=self.state.batch.schema or {},
-            target_schema=self.state.target_schema,
-            mappings=self.state.mappings,
-        )
+        if "transform" in self.state.cache_hits:
+            if self.state.stream is not None:
+                self.state.stream = self._track_transformed(self.state.stream)
+            else:
+                self._record_transformed(self.state.batch)
+            return
         
-        use_case = TransformData(transform_port=PandasTransformAdapter())
+        job = self._build_job()
+        try:
+            use_case = TransformData(transform_port=self._instrument("transform", self._transform_adapter()))
+        except ValueError as e:
+            self.state.errors.append(f"Transformation failed: {e}")
+            return
+        if self.state.stream is not None:
+            self.state.stream = self._pipeline_stage("ingest", self.state.stream)
+            self.state.stream = self._track_transformed(use_case.execute_stream(self.state.stream, job))
+            self._snapshot("transform")
+            return
         try:
             self.state.batch = use_case.execute(self.state.batch, job)
+            self._record_transformed(self.state.batch)
+            self._snapshot("transform")
         except Exception as e:
             self.state.errors.append(f"Transformation failed: {e}")
     
+    def _track_transformed(self, batches: Iterator[DataBatch]) -> Iterator[DataBatch]:
+        for batch in batches:
+            self._record_transformed(batch)
+            yield batch
+    
+    def _record_transformed(self, batch: DataBatch) -> None:
+        quarantined = batch.metadata.pop("quarantine", None)
+        if quarantined is not None:
+            adapter = self._quarantine_adapter()
+            adapter.write(quarantined)
+            self._publish_quarantine_report(adapter)
+        memory = batch.metadata.get("memory")
+        if memory:
+            report = self.state.memory_report or {"bytes_before": 0, "bytes_after": 0, "columns": {}}
+            report["bytes_before"] += memory["bytes_before"]
+            report["bytes_after"] += memory["bytes_after"]
+            report["columns"].update(memory["columns"])
+            self.state.memory_report = report
+        for col, message in batch.metadata.get("cast_errors", {}).items():
+            prefix = f"Cast failed for column '{col}'"
+            # Report each column once, even if it fails in many chunks
+            if not any(error.startswith(prefix) for error in self.state.errors):
+                self.state.errors.append(f"{prefix}: {message}")
+    
     @listen(transform_data)
+    @measured_step
     def validate_quality(self):
-        if self.state.batch is None:
+        if self.state.partitions is not None or self._skipped():
+            return  # Deferred to the partition workers, or nothing new to process
+        if self.state.batch is None and self.state.stream is None:
             self.state.errors.append("No batch to validate")
             return
         
-        use_case = ReconcileJobResult(validation_port=ValidationAdapter())
-        try:
-            self.state.validation_report = use_case.execute(
-                self.state.batch,
-                rules={"check_nulls": True, "check_duplicates": True}
+        rules = self._validation_rules()
+        if self.state.quarantine:
+            try:
+                self._quarantine_invalid_rows(rules)
+            except Exception as e:
+                self.state.errors.append(f"Quarantine failed: {e}")
+                return
+        if self.state.stream is not None:
+            # One stateful validator sees every chunk, so the report covers the whole dataset
+            validator = IncrementalValidationAdapter(**(self.state.validation_sketch_options or {}))
+            use_case = ReconcileJobResult(validation_port=self._instrument("validation", validator))
+            self.state.stream = use_case.execute_stream(
+                self.state.stream, rules, on_report=lambda _: self._publish_validation_report(validator)
             )
+            if self.state.profile_data:
+                profiling = ProfileData(profiling_port=self._instrument("profiling", self._profiler()))
+                self.state.stream = profiling.execute_stream(self.state.stream, on_profile=self._publish_profile)
+            self.state.stream = self._pipeline_stage("transform", self.state.stream)
+            return
+        if self.state.profile_data:
+            try:
+                profiling = ProfileData(profiling_port=self._instrument("profiling", self._profiler()))
+                self.state.profile = profiling.execute(self.state.batch)
+            except Exception as e:
+                self.state.errors.append(f"Profiling failed: {e}")
+        use_case = ReconcileJobResult(validation_port=self._instrument("validation", ValidationAdapter()))
+        try:
+            self.state.validation_report = use_case.execute(self.state.batch, rules=rules)
         except Exception as e:
             self.state.errors.append(f"Validation failed: {e}")
     
+    def _quarantine_invalid_rows(self, rules: Dict[str, Any]) -> None:
+        adapter = self._quarantine_adapter()
+        if self.state.stream is not None:
+            self.state.stream = self._split_stream(adapter, self.state.stream, rules)
+        else:
+            self.state.batch = adapter.split(self.state.batch, rules)
+            self._publish_quarantine_report(adapter)
+    
+    def _split_stream(
+        self, adapter: QuarantineAdapter, batches: Iterator[DataBatch], rules: Dict[str, Any]
+    ) -> Iterator[DataBatch]:
+        for batch in batches:
+            batch = adapter.split(batch, rules)
+            self._publish_quarantine_report(adapter)
+            yield batch
+    
+    def _quarantine_adapter(self) -> QuarantineAdapter:
+        # One adapter per state, so every stage appends to the same dead-letter file
+        if self.state.quarantine_report is None or getattr(self, "_quarantine", None) is None:
+            self._quarantine = QuarantineAdapter(self.state.quarantine_path)
+            checkpoint = self.state.checkpoint_load
+            if checkpoint is not None and checkpoint.resumed:
+                # Rows of chunks that run again are rewritten, not duplicated
+                self._quarantine.keep_chunks(list(checkpoint.committed))
+            self._publish_quarantine_report(self._quarantine)
+        return self._quarantine
+    
+    def _publish_quarantine_report(self, adapter: QuarantineAdapter) -> None:
+        self.state.quarantine_report = merge_quarantine_reports([adapter.report()])
+    
+    def _pipeline_stage(self, name: str, stream: Iterator[DataBatch]) -> Iterator[DataBatch]:
+        if not self.state.pipelined:
+            return stream
+        stage = PipelineStage(stream, name, self.state.pipeline_buffer)
+        self.state.pipeline_report = {**(self.state.pipeline_report or {}), name: stage.stats}
+        return iter(stage)
+    
+    def _publish_validation_report(self, validator: IncrementalValidationAdapter) -> None:
+        self.state.validation_report = validator.report()
+    
+    def _publish_profile(self, profile: Dict[str, Any]) -> None:
+        self.state.profile = profile
+    
+    def _profiler(self) -> DataProfiler:
+        return DataProfiler(**(self.state.profile_options or {}))
+    
     @listen(validate_quality)
+    @measured_step
     def load_destination(self):
-        if self.state.batch is None:
+        if self._skipped():
+            return
+        if self.state.batch is None and self.state.stream is None and self.state.partitions is None:
             self.state.errors.append("No batch to load")
             return
         
+        destination = self._build_destination()
+        if self.state.partitions is not None:
+            self._run_partitions(destination)
+        else:
+            self._load(destination)
+        if self.state.incremental_plan is not None and self.state.load_result and not self.state.errors:
+            if not self.state.load_result.get("rows_written"):
+                # Streamed and partitioned deltas only turn out empty once consumed
+                self.state.load_result = {"status": "skipped", "rows_written": 0, "reason": "no new rows"}
+                return
+            self.state.incremental_plan.commit(WatermarkStore(self.state.watermark_path))
+    
+    def _build_destination(self) -> DataDestination:
         destination = DataDestination(
             name="user_destination",
-            kind="file",
+            kind=self.state.dest_kind,
             uri=self.state.dest_uri,
             format=self.state.dest_format,
+            options=dict(self.state.dest_options or {}),
         )
-        
-        use_case = LoadData(destination_port=FileDestinationAdapter())
+        if self.state.incremental:
+            # Deltas extend the destination instead of replacing it
+            destination.options.setdefault("mode", "append")
+        return destination
+    
+    def _load(self, destination: DataDestination) -> None:
+        adapter = self._instrument("destination", self._destination_adapter())
+        use_case = LoadData(destination_port=adapter)
+        if self.state.stream is not None:
+            # Consuming the stream runs every upstream stage chunk by chunk
+            try:
+                if self.state.checkpoint_load is not None:
+                    self.state.load_result = self.state.checkpoint_load.write_stream(self.state.stream, adapter)
+                else:
+                    self.state.load_result = use_case.execute_stream(self.state.stream, destination)
+            except Exception as e:
+                self.state.errors.append(f"Streaming pipeline failed: {e}")
+            finally:
+                self.state.stream = None
+            return
         try:
             self.state.load_result = use_case.execute(self.state.batch, destination)
         except Exception as e:
             self.state.errors.append(f"Load failed: {e}")
+
+    
+    @listen(load_destination)
+    def export_metrics(self):
+        if not (self.state.metrics_prometheus_path or self.state.metrics_otel):
+            return
+        report = self._flow_metrics().report()
+        try:
+            if self.state.metrics_prometheus_path:
+                write_prometheus(report, self.state.metrics_prometheus_path)
+            if self.state.metrics_otel:
+                emit_spans(report, attributes={"etl.source": self.state.source_uri, "etl.destination": self.state.dest_uri})
+        except Exception as e:
+            self.state.errors.append(f"Metrics export failed: {e}")
+    
+    def run_steps(self) -> ETLFlowState:
+        """Run the steps in order in this thread, without CrewAI's event loop and console output."""
+        for step in (self.ingest_source, self.transform_data, self.validate_quality, self.load_destination,
+                     self.export_metrics):
+            step()
+        return self.state
+    
+    def _flow_metrics(self) -> FlowMetrics:
+        # One collector per state; state.metrics is its live report
+        if self.state.metrics is None or getattr(self, "_metrics", None) is None:
+            self._metrics = FlowMetrics()
+            self.state.metrics = self._metrics.report()
+        return self._metrics
+    
+    def _instrument(self, role: str, port: Any) -> InstrumentedPort:
+        return InstrumentedPort(port, role, self._flow_metrics())
+    
+    def _run_partitions(self, destination: DataDestination) -> None:
+        store, committed = None, {}
+        try:
+            partitions = self.state.partitions
+            if self.state.checkpoint_key is not None:
+                store = CheckpointStore(self.state.checkpoint_path)
+                committed = store.begin(_checkpoint_target(destination), self.state.checkpoint_key)
+                partitions = [p for p in partitions if p.index not in committed]
+            result = self._executor().execute(
+                partitions, self._build_job(), destination, self._validation_rules(),
+                quarantine_uri=self.state.quarantine_path if self.state.quarantine else None,
+            )
+        except Exception as e:
+            self.state.errors.append(f"Partitioned run failed: {e}")
+            return
+        if store is not None:
+            self._commit_partitions(store, destination, committed, result)
+        self.state.load_result = result["load_result"]
+        self.state.validation_report = result["validation_report"]
+        self.state.profile = result["profile"]
+        self.state.quarantine_report = result["quarantine_report"]
+        self.state.errors.extend(result["errors"])
+    
+    def _commit_partitions(
+        self, store: CheckpointStore, destination: DataDestination, committed: Dict[int, Dict[str, Any]],
+        result: Dict[str, Any],
+    ) -> None:
+        target = _checkpoint_target(destination)
+        for unit in result["committed"]:
+            store.commit(target, unit["partition"], unit["rows"], unit["path"])
+        if not result["errors"]:
+            store.finish(target)
+        load = result["load_result"]
+        load["rows_written"] += sum(unit["rows"] for unit in committed.values())
+        load["paths"] = [unit["path"] for unit in committed.values()] + load["paths"]
+        load["partitions_resumed"] = len(committed)
+    
+    def _plan_cache(self, source: DataSource) -> None:
+        job = self._build_job()
+        ingest = cache_key("ingest", source_fingerprint(source), _adapter_id(type(self._source_adapter())))
+        transform = cache_key(
+            "transform", ingest, job.mappings, job.target_schema, job.rules,
+            _adapter_id(type(self._transform_adapter())),
+        )
+        self.state.cache_keys = {"ingest": ingest, "transform": transform}
+    
+    def _restore(self, stage: str) -> bool:
+        cache = StageCache(self.state.cache_dir, self.state.cache_max_bytes)
+        key = self.state.cache_keys[stage]
+        if not cache.has(key):
+            return False
+        if self.state.chunk_size:
+            self.state.stream = cache.get_stream(key)
+        else:
+            self.state.batch = cache.get(key)
+        self.state.cache_hits.append(stage)
+        return True
+    
+    def _snapshot(self, stage: str) -> None:
+        if not self.state.cache_keys:
+            return
+        cache = StageCache(self.state.cache_dir, self.state.cache_max_bytes)
+        key = self.state.cache_keys[stage]
+        if self.state.stream is not None:
+            # Committed only if the whole stream is consumed
+            self.state.stream = cache.put_stream(key, stage, self.state.stream)
+        else:
+            try:
+                cache.put(key, stage, self.state.batch)
+            except Exception as e:
+                self.state.errors.append(f"Stage cache write failed for {stage}: {e}")
+    
+    def _executor(self) -> PartitionedETLExecutor:
+        return PartitionedETLExecutor(
+            workers=self.state.workers,
+            strategy=self.state.partition_strategy,
+            key_column=self.state.partition_key,
+            source_adapter=SOURCE_ADAPTERS[self.state.source_kind],
+            destination_adapter=DESTINATION_ADAPTERS[self.state.dest_kind],
+            profiler_adapter=partial(DataProfiler, **(self.state.profile_options or {})) if self.state.profile_data else None,
+            transform_adapter=self._transform_adapter_class(),
+        )
+    
+    def _source_adapter(self):
+        if self.state.source_kind not in SOURCE_ADAPTERS:
+            raise ValueError(f"Unsupported source kind: {self.state.source_kind}")
+        return SOURCE_ADAPTERS[self.state.source_kind]()
+    
+    def _destination_adapter(self):
+        if self.state.dest_kind not in DESTINATION_ADAPTERS:
+            raise ValueError(f"Unsupported destination kind: {self.state.dest_kind}")
+        return DESTINATION_ADAPTERS[self.state.dest_kind]()
+    
+    def _transform_adapter(self):
+        return self._transform_adapter_class()()
+    
+    def _transform_adapter_class(self) -> type:
+        engine = (self.state.transform_rules or {}).get("engine")
+        if engine is None:
+            return ArrowTransformAdapter if self.state.arrow_native else PandasTransformAdapter
+        if engine not in TRANSFORM_ENGINES:
+            raise ValueError(f"Unsupported transform engine: {engine}")
+        return TRANSFORM_ENGINES[engine]
+    
+    def _validation_rules(self) -> Dict[str, Any]:
+        return {**DEFAULT_VALIDATION_RULES, **(self.state.validation_rules or {})}
+    
+    def _build_job(self) -> TransformationJob:
+        return TransformationJob(
+            # Streamed and partitioned runs carry per-chunk schemas; the job only needs the batch one
+            source_schema=(self.state.batch.schema if self.state.batch else None) or {},
+            target_schema=self.state.target_schema,
+            mappings=self.state.mappings,
+            rules={**({"quarantine": True} if self.state.quarantine else {}), **(self.state.transform_rules or {})},
+        )
+
+
+def _checkpoint_target(destination: DataDestination) -> str:
+    return str(Path(destination.uri).resolve())
+
+
+def _adapter_id(adapter: type) -> str:
+    return f"{adapter.__module__}.{adapter.__qualname__}"
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..domain.entities import DataBatch, DataSource
+
+# Prefix of every exported metric name
+METRICS_PREFIX = "etl"
+
+_PORT_FIELDS = ("calls", "chunks", "wall_s", "cpu_s", "rows_in", "rows_out", "bytes_in", "bytes_out", "rss_peak_delta_mb")
+
+
+class FlowMetrics:
+    """Wall/CPU time, rows, bytes and peak-RSS growth per flow step and per port method.
+
+    Port timings are exclusive: in a streamed run `destination.write_stream`
+    pulls chunks through `validation.validate`, `transform.apply_stream` and
+    `source.read_stream`, and each of them is charged only for its own work,
+    as a profiler would. Each thread keeps its own call stack, so pipelined
+    stages are accounted separately too (their queue waits count as wall time
+    of the consumer, not CPU time).
+
+    `steps` and `ports` are plain dicts, ready to be stored on the flow state.
+    """
+
+    def __init__(self) -> None:
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.ports: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def report(self) -> Dict[str, Any]:
+        return {"steps": self.steps, "ports": self.ports}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started_ns, start, cpu, rss = time.time_ns(), time.perf_counter(), time.process_time(), peak_rss_bytes()
+        try:
+            yield
+        finally:
+            # process_time: a step that drives a pipelined stream also pays for its stage threads
+            self.steps[name] = {
+                "wall_s": round(time.perf_counter() - start, 6),
+                "cpu_s": round(time.process_time() - cpu, 6),
+                "rss_peak_delta_mb": _mb(peak_rss_bytes() - rss),
+                "started_ns": started_ns,
+                "ended_ns": time.time_ns(),
+            }
+
+    @contextmanager
+    def call(self, name: str) -> Iterator[Dict[str, float]]:
+        """Time one port call (or one `next()` of a port's stream), minus nested port calls."""
+        stack = self._stack()
+        children = {"wall": 0.0, "cpu": 0.0, "rss": 0}
+        stack.append(children)
+        started_ns, start, cpu, rss = time.time_ns(), time.perf_counter(), time.thread_time(), peak_rss_bytes()
+        try:
+            yield children
+        finally:
+            stack.pop()
+            wall, cpu, rss = time.perf_counter() - start, time.thread_time() - cpu, peak_rss_bytes() - rss
+            if stack:
+                parent = stack[-1]
+                parent["wall"] += wall
+                parent["cpu"] += cpu
+                parent["rss"] += rss
+            with self._lock:
+                entry = self._entry(name)
+                entry["wall_s"] += wall - children["wall"]
+                entry["cpu_s"] += cpu - children["cpu"]
+                entry["rss_peak_delta_mb"] += _mb(rss - children["rss"])
+                entry["started_ns"] = min(entry["started_ns"] or started_ns, started_ns)
+                entry["ended_ns"] = time.time_ns()
+
+    def count(self, name: str, **amounts: int) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            for field, amount in amounts.items():
+                entry[field] += amount
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        if name not in self.ports:
+            self.ports[name] = {**dict.fromkeys(_PORT_FIELDS, 0), "started_ns": 0, "ended_ns": 0}
+        return self.ports[name]
+
+    def _stack(self) -> List[Dict[str, float]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+class InstrumentedPort:
+    """Proxy recording every public method call of a port into `FlowMetrics` as `<role>.<method>`.
+
+    Batches passed in count as rows/bytes in and batches returned as rows/bytes
+    out; streams on either side are counted chunk by chunk, and a returned
+    stream has each `next()` timed. A destination's `rows_written` and
+    `bytes_written` count as out, a local source file's size as bytes in.
+    Attributes the port lacks stay missing, so `hasattr` checks still work.
+    """
+
+    def __init__(self, port: Any, role: str, metrics: FlowMetrics):
+        self._port = port
+        self._role = role
+        self._metrics = metrics
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._port, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        return self._measured(f"{self._role}.{attr}", value)
+
+    def _measured(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        metrics = self._metrics
+
+        @wraps(method)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            args = tuple(self._inputs(name, arg) for arg in args)
+            with metrics.call(name):
+                result = method(*args, **kwargs)
+            metrics.count(name, calls=1)
+            if isinstance(result, DataBatch):
+                metrics.count(name, rows_out=result.num_rows, bytes_out=batch_nbytes(result))
+            elif isinstance(result, dict):
+                metrics.count(name, rows_out=_int(result.get("rows_written")), bytes_out=_int(result.get("bytes_written")))
+            elif isinstance(result, Iterator):
+                return self._timed_stream(name, result)
+            return result
+
+        return call
+
+    def _inputs(self, name: str, arg: Any) -> Any:
+        if isinstance(arg, DataBatch):
+            self._metrics.count(name, rows_in=arg.num_rows, bytes_in=batch_nbytes(arg))
+        elif isinstance(arg, DataSource) and arg.kind == "file" and Path(arg.uri).is_file():
+            self._metrics.count(name, bytes_in=Path(arg.uri).stat().st_size)
+        elif isinstance(arg, Iterator):
+            return self._counted_stream(name, arg)
+        return arg
+
+    def _counted_stream(self, name: str, batches: Iterator[DataBatch]) -> Iterator[DataBatch]:
+        for batch in batches:
+            if isinstance(batch, DataBatch):
+                self._metrics.count(name, rows_in=batch.num_rows, bytes_in=batch_nbytes(batch))
+            yield batch
+
+    def _timed_stream(self, name: str, batches: Iterator[DataBatch]) -> Iterator[DataBatch]:
+        try:
+            while True:
+                with self._metrics.call(name):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                self._metrics.count(name, chunks=1, rows_out=batch.num_rows, bytes_out=batch_nbytes(batch))
+                yield batch
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+
+def measured_step(step: Callable[..., Any]) -> Callable[..., Any]:
+    """Record a flow step into the flow's `FlowMetrics` (`self._flow_metrics()`)."""
+    @wraps(step)
+    def run(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with self._flow_metrics().step(step.__name__):
+            return step(self, *args, **kwargs)
+
+    return run
+
+
+def batch_nbytes(batch: DataBatch) -> int:
+    if batch.is_arrow:
+        return int(batch.raw.nbytes)
+    from ..adapters.memory import estimate_nbytes
+
+    return estimate_nbytes(batch.raw)
+
+
+def write_prometheus(report: Dict[str, Any], path: str | Path, labels: Optional[Dict[str, str]] = None) -> Path:
+    """Write the metrics in Prometheus text format, atomically (for node_exporter's textfile collector)."""
+    path = Path(path)
+    extra = "".join(f',{key}="{_escape(value)}"' for key, value in (labels or {}).items())
+    lines: List[str] = []
+    for kind, label, fields in (("step", "step", ("wall_s", "cpu_s", "rss_peak_delta_mb")), ("port", "port", _PORT_FIELDS)):
+        for field in fields:
+            metric = f"{METRICS_PREFIX}_{kind}_{_metric_name(field)}"
+            lines.append(f"# TYPE {metric} gauge")
+            for name, values in report.get(f"{kind}s", {}).items():
+                lines.append(f'{metric}{{{label}="{_escape(name)}"{extra}}} {values[field]}')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.tmp")
+    staging.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    staging.replace(path)
+    return path
+
+
+def emit_spans(report: Dict[str, Any], name: str = "etl_pipeline", attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Emit the run as OpenTelemetry spans: one per step and one per port (first call to last).
+
+    Uses the globally configured tracer provider; requires `opentelemetry-api`.
+    """
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer("etl_multiagent")
+    spans = [*report.get("steps", {}).items(), *report.get("ports", {}).items()]
+    timed = [values for _, values in spans if values["started_ns"]]
+    if not timed:
+        return
+    root = tracer.start_span(name, start_time=min(v["started_ns"] for v in timed), attributes=attributes or {})
+    context = trace.set_span_in_context(root)
+    for span_name, values in spans:
+        if not values["started_ns"]:
+            continue
+        span = tracer.start_span(
+            span_name, context=context, start_time=values["started_ns"],
+            attributes={f"{METRICS_PREFIX}.{key}": value for key, value in values.items() if not key.endswith("_ns")},
+        )
+        span.end(end_time=values["ended_ns"])
+    root.end(end_time=max(v["ended_ns"] for v in timed))
+
+
+def _metric_name(field: str) -> str:
+    if field.endswith("_s"):
+        return field[:-2] + "_seconds"
+    return field[:-3] + "_megabytes" if field.endswith("_mb") else field
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def _mb(nbytes: float) -> float:
+    return round(nbytes / 1024 ** 2, 3)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process (0 where `resource` is unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_rss_mb() -> float:
+    return round(peak_rss_bytes() / 1024 ** 2, 1)
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..adapters.sources import expand_files, is_multi_file
+from .etl_pipeline_flow import ETLFlowState, ETLPipelineFlow
+from .instrumentation import peak_rss_mb
+
+DEFAULT_SCHEDULE_REPORT_PATH = "outputs/etl_schedule.json"
+# Share of physical memory handed out to jobs when no budget is given
+DEFAULT_MEMORY_FRACTION = 0.75
+# In-memory size of a loaded dataset relative to its file size, per source format
+MEMORY_EXPANSION = {"csv": 2.5, "json": 3.0, "parquet": 5.0, "feather": 1.2, "xlsx": 4.0}
+DEFAULT_MEMORY_EXPANSION = 3.0
+# Interpreter, libraries and adapter buffers of one job process, before any data
+JOB_BASE_MEMORY_MB = 256
+# Assumed input size of sources that cannot be sized locally (databases, S3)
+UNKNOWN_INPUT_MB = 1024
+
+# Keys of a job spec that belong to the scheduler; every other key is an ETLFlowState field
+_SPEC_KEYS = ("name", "priority", "depends_on", "resources")
+_STATE_FIELDS = [f.name for f in fields(ETLFlowState)]
+# Configuration fields; the ones from `batch` on are results
+_CONFIG_FIELDS = _STATE_FIELDS[:_STATE_FIELDS.index("batch")]
+_CSV_SAMPLE_BYTES = 1024 ** 2
+
+
+@dataclass
+class JobSpec:
+    """One ETL job: the initial `ETLFlowState` fields plus its scheduling attributes."""
+    name: str
+    state: Dict[str, Any]
+    # Higher runs first among the jobs ready at the same time
+    priority: int = 0
+    # Jobs that must succeed before this one starts
+    depends_on: List[str] = field(default_factory=list)
+    # Override the estimate, e.g. for database sources
+    cpus: Optional[int] = None
+    memory_mb: Optional[float] = None
+
+
+@dataclass
+class ResourceEstimate:
+    cpus: int
+    memory_mb: float
+    # None when the source cannot be sized locally
+    input_mb: Optional[float] = None
+
+
+def load_job_specs(path: str | Path) -> List[JobSpec]:
+    """Read job specs from YAML or JSON (by extension).
+
+    The file holds a list of jobs, or `{"defaults": {...}, "jobs": [...]}` with
+    state fields shared by every job. Each job has a `name`, optional
+    `priority`, `depends_on` and `resources` (`cpus`, `memory_mb`), and the
+    `ETLFlowState` fields (`source_uri`, `dest_uri`, `mappings`...).
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        data = json.loads(text)
+    else:
+        import yaml
+
+        data = yaml.safe_load(text)
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults, data = data.get("defaults") or {}, data.get("jobs")
+    if not isinstance(data, list):
+        raise ValueError(f"{path} must hold a list of jobs or a 'jobs' list")
+    specs = []
+    for index, entry in enumerate(data):
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"Job #{index} in {path} needs a name")
+        resources = entry.get("resources") or {}
+        specs.append(JobSpec(
+            name=str(entry["name"]),
+            state={**defaults, **{key: value for key, value in entry.items() if key not in _SPEC_KEYS}},
+            priority=int(entry.get("priority", 0)),
+            depends_on=list(entry.get("depends_on") or []),
+            cpus=resources.get("cpus"),
+            memory_mb=resources.get("memory_mb"),
+        ))
+    validate_jobs(specs)
+    return specs
+
+
+def validate_jobs(specs: List[JobSpec]) -> None:
+    """Reject duplicate names, unknown state fields, missing required ones, unknown dependencies and cycles."""
+    names = [spec.name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job names: {duplicates}")
+    required = [f.name for f in fields(ETLFlowState) if f.name in _CONFIG_FIELDS and _is_required(f)]
+    for spec in specs:
+        unknown = sorted(set(spec.state) - set(_CONFIG_FIELDS))
+        if unknown:
+            raise ValueError(f"Job {spec.name}: unknown ETLFlowState fields {unknown}")
+        missing = [name for name in required if name not in spec.state]
+        if missing:
+            raise ValueError(f"Job {spec.name}: missing {missing}")
+        unknown = sorted(set(spec.depends_on) - set(names))
+        if unknown:
+            raise ValueError(f"Job {spec.name} depends on unknown jobs {unknown}")
+    # Kahn's algorithm: whatever cannot be ordered sits on a cycle
+    pending = {spec.name: set(spec.depends_on) for spec in specs}
+    while pending:
+        ready = [name for name, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between jobs {sorted(pending)}")
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+def estimate_resources(spec: JobSpec) -> ResourceEstimate:
+    """CPU slots and peak memory of a job, from its input size and run mode.
+
+    A batch run holds the whole input in memory, about `MEMORY_EXPANSION`
+    times its file size. A streamed run holds the chunks in flight (two, or
+    one per pipelined stage and queue slot), as a share of the input's row
+    count when it can be read cheaply (Parquet metadata, a CSV sample).
+    Partitioned runs take one CPU per worker, pipelined runs two, DuckDB jobs
+    their configured threads.
+    """
+    state = spec.state
+    rules = state.get("transform_rules") or {}
+    workers = int(state.get("workers") or 1)
+    cpus = workers
+    if state.get("pipelined") and state.get("chunk_size"):
+        cpus = max(cpus, 2)
+    if rules.get("engine") == "duckdb":
+        cpus = max(cpus, int((rules.get("duckdb") or {}).get("threads") or 1))
+    paths = _input_paths(state)
+    if paths is None:
+        input_mb, resident_mb = None, float(UNKNOWN_INPUT_MB)
+    else:
+        input_mb = sum(os.path.getsize(p) for p in paths) / 1024 ** 2
+        fmt = state.get("source_format", "")
+        resident_mb = input_mb * MEMORY_EXPANSION.get(fmt, DEFAULT_MEMORY_EXPANSION)
+        chunk_size = state.get("chunk_size")
+        if chunk_size and workers <= 1:
+            rows = _estimate_rows(paths, fmt)
+            if rows:
+                in_flight = 3 + 2 * int(state.get("pipeline_buffer") or 1) if state.get("pipelined") else 2
+                resident_mb *= min(1.0, chunk_size * in_flight / rows)
+    return ResourceEstimate(
+        cpus=spec.cpus or cpus,
+        memory_mb=round(spec.memory_mb or JOB_BASE_MEMORY_MB * workers + resident_mb, 1),
+        input_mb=round(input_mb, 6) if input_mb is not None else None,
+    )
+
+
+def run_job(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: one `ETLPipelineFlow` over `state`, summarised for the run report."""
+    start = time.perf_counter()
+    result = ETLPipelineFlow.from_state(ETLFlowState(**state)).run_steps()
+    return {
+        "status": "failed" if result.errors else "success",
+        "errors": list(result.errors),
+        "rows_written": (result.load_result or {}).get("rows_written", 0),
+        "load_result": result.load_result,
+        "validation_status": (result.validation_report or {}).get("status"),
+        "quarantine_report": result.quarantine_report,
+        "metrics": result.metrics,
+        "run_s": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+class JobScheduler:
+    """Run many ETL jobs at once within CPU and memory budgets.
+
+    Each job runs in its own fresh process. Jobs become ready once all their
+    dependencies succeeded (dependents of a failed job are skipped); ready
+    jobs are started by priority, then file order, as long as their estimated
+    CPU slots and memory fit in what the running jobs leave free. A job that
+    does not fit does not block smaller ones behind it, so the free capacity
+    is backfilled; a job larger than the whole budget runs alone.
+    """
+
+    def __init__(
+        self,
+        specs: List[JobSpec],
+        cpu_budget: Optional[int] = None,
+        memory_budget_mb: Optional[float] = None,
+        max_jobs: Optional[int] = None,
+        runner: Callable[[Dict[str, Any]], Dict[str, Any]] = run_job,
+    ):
+        validate_jobs(specs)
+        self.specs = specs
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.memory_budget_mb = memory_budget_mb or _physical_memory_mb() * DEFAULT_MEMORY_FRACTION
+        self.max_jobs = max_jobs or self.cpu_budget
+        self.runner = runner
+        # Filled when a job becomes ready: its input may be the output of a dependency
+        self.estimates: Dict[str, ResourceEstimate] = {}
+
+    def run(self, output: Optional[str | Path] = DEFAULT_SCHEDULE_REPORT_PATH) -> Dict[str, Any]:
+        """Run every job; return (and write as JSON) the aggregated run report."""
+        start, started_at = time.perf_counter(), time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        pending = list(self.specs)
+        running: Dict[Future, JobSpec] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        usage = {"cpus": 0, "memory_mb": 0.0}
+        peaks = {"jobs": 0, "cpus": 0, "memory_mb": 0.0}
+        with ProcessPoolExecutor(max_workers=min(self.max_jobs, len(self.specs)) or 1, **_fresh_process_options()) as pool:
+            while pending or running:
+                for spec in self._ready(pending, results):
+                    estimate = self.estimates[spec.name]
+                    if running and not self._fits(estimate, usage, len(running)):
+                        continue
+                    pending.remove(spec)
+                    results[spec.name] = {"started_s": round(time.perf_counter() - start, 4)}
+                    running[pool.submit(self.runner, spec.state)] = spec
+                    usage["cpus"] += estimate.cpus
+                    usage["memory_mb"] += estimate.memory_mb
+                    peaks = {"jobs": max(peaks["jobs"], len(running)), "cpus": max(peaks["cpus"], usage["cpus"]),
+                             "memory_mb": max(peaks["memory_mb"], usage["memory_mb"])}
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = running.pop(future)
+                    estimate = self.estimates[spec.name]
+                    usage["cpus"] -= estimate.cpus
+                    usage["memory_mb"] -= estimate.memory_mb
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = {"status": "failed", "errors": [f"Job process failed: {e}"]}
+                    results[spec.name].update(outcome, ended_s=round(time.perf_counter() - start, 4))
+        report = self._report(results, peaks, started_at, time.perf_counter() - start)
+        if output is not None:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            Path(output).write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        return report
+
+    def _ready(self, pending: List[JobSpec], results: Dict[str, Dict[str, Any]]) -> List[JobSpec]:
+        ready = []
+        for spec in list(pending):
+            blocked = [dep for dep in spec.depends_on if results.get(dep, {}).get("status") in ("failed", "skipped")]
+            if blocked:
+                pending.remove(spec)
+                results[spec.name] = {"status": "skipped", "errors": [f"Dependencies did not succeed: {blocked}"]}
+            elif all(results.get(dep, {}).get("status") == "success" for dep in spec.depends_on):
+                if spec.name not in self.estimates:
+                    self.estimates[spec.name] = self._fit(estimate_resources(spec))
+                ready.append(spec)
+        order = {spec.name: index for index, spec in enumerate(self.specs)}
+        return sorted(ready, key=lambda spec: (-spec.priority, order[spec.name]))
+
+    def _fits(self, estimate: ResourceEstimate, usage: Dict[str, float], jobs: int) -> bool:
+        return (
+            jobs < self.max_jobs
+            and usage["cpus"] + estimate.cpus <= self.cpu_budget
+            and usage["memory_mb"] + estimate.memory_mb <= self.memory_budget_mb
+        )
+
+    def _fit(self, estimate: ResourceEstimate) -> ResourceEstimate:
+        # Capped at the budget: an oversized job still runs, alone
+        return ResourceEstimate(
+            cpus=min(estimate.cpus, self.cpu_budget),
+            memory_mb=min(estimate.memory_mb, self.memory_budget_mb),
+            input_mb=estimate.input_mb,
+        )
+
+    def _report(
+        self, results: Dict[str, Dict[str, Any]], peaks: Dict[str, float], started_at: str, wall: float,
+    ) -> Dict[str, Any]:
+        jobs = []
+        for spec in self.specs:
+            result = results[spec.name]
+            entry = {
+                "name": spec.name, "priority": spec.priority, "depends_on": spec.depends_on,
+                "estimate": asdict(self.estimates[spec.name]) if spec.name in self.estimates else None, **result,
+            }
+            if "ended_s" in result:
+                entry["wall_s"] = round(result["ended_s"] - result["started_s"], 4)
+            jobs.append(entry)
+        statuses = [job["status"] for job in jobs]
+        busy = sum(job.get("wall_s", 0.0) for job in jobs)
+        return {
+            "started_at": started_at,
+            "wall_s": round(wall, 4),
+            "budgets": {"cpus": self.cpu_budget, "memory_mb": round(self.memory_budget_mb, 1), "max_jobs": self.max_jobs},
+            "summary": {
+                "jobs": len(jobs),
+                "succeeded": statuses.count("success"),
+                "failed": statuses.count("failed"),
+                "skipped": statuses.count("skipped"),
+                "rows_written": sum(job.get("rows_written") or 0 for job in jobs),
+                "peak_jobs": peaks["jobs"],
+                "peak_cpus": peaks["cpus"],
+                "peak_memory_mb": round(peaks["memory_mb"], 1),
+                # Sum of job run times over the schedule's wall time: 1.0 is one job at a time
+                "concurrency": round(busy / wall, 3) if wall > 0 else None,
+            },
+            "metrics": aggregate_metrics(job.get("metrics") for job in jobs),
+            "jobs": jobs,
+        }
+
+
+def aggregate_metrics(reports: Any) -> Dict[str, Any]:
+    """Sum per-job `state.metrics` by step and by port; timestamps are dropped."""
+    merged: Dict[str, Dict[str, Dict[str, float]]] = {"steps": {}, "ports": {}}
+    for report in reports:
+        for kind in merged:
+            for name, values in (report or {}).get(kind, {}).items():
+                entry = merged[kind].setdefault(name, {})
+                for key, value in values.items():
+                    if not key.endswith("_ns"):
+                        entry[key] = round(entry.get(key, 0) + value, 6)
+    return merged
+
+
+def _is_required(f: Any) -> bool:
+    from dataclasses import MISSING
+
+    return f.default is MISSING and f.default_factory is MISSING
+
+
+def _input_paths(state: Dict[str, Any]) -> Optional[List[str]]:
+    if state.get("source_kind", "file") != "file":
+        return None
+    uri = state["source_uri"]
+    if is_multi_file(uri):
+        return expand_files(uri)
+    return [uri] if Path(uri).is_file() else None
+
+
+def _estimate_rows(paths: List[str], fmt: str) -> Optional[int]:
+    try:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            return sum(pq.read_metadata(p).num_rows for p in paths)
+        if fmt == "csv":
+            rows = 0.0
+            for p in paths:
+                with open(p, "rb") as handle:
+                    sample = handle.read(_CSV_SAMPLE_BYTES)
+                lines = sample.count(b"\n") or 1
+                rows += os.path.getsize(p) * lines / max(len(sample), 1)
+            return int(rows)
+    except Exception:  # Unreadable metadata: fall back to the batch estimate
+        return None
+    return None
+
+
+def _fresh_process_options() -> Dict[str, Any]:
+    # spawn: no inherited parent memory; one task per child so a finished job's heap is returned to the OS
+    options: Dict[str, Any] = {"mp_context": multiprocessing.get_context("spawn")}
+    if sys.version_info >= (3, 11):
+        options["max_tasks_per_child"] = 1
+    return options
+
+
+def _physical_memory_mb() -> float:
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (AttributeError, ValueError, OSError):  # Windows
+        return 4096.0
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..domain.entities import DataSource, DataBatch, TransformationJob, DataDestination
+from ..domain.use_cases import IngestData, TransformData, LoadData, ProfileData, ReconcileJobResult
+from ..adapters.sources import FileSourceAdapter, expand_files, is_multi_file, split_csv
+from ..adapters.spill import MAX_SPILL_DEPTH, SpillPartitions
+from ..adapters.destinations import FileDestinationAdapter
+from ..adapters.quarantine import QuarantineAdapter, merge_quarantine_reports
+from ..adapters.transformers import PandasTransformAdapter, ValidationAdapter
+
+PARTITION_STRATEGIES = ("auto", "files", "row_groups", "hash", "key_range")
+
+# Shuffle hash salt, distinct from the spill levels a partition's own aggregations hash with
+SHUFFLE_HASH_LEVEL = MAX_SPILL_DEPTH + 1
+
+
+@dataclass
+class Partition:
+    """One independent slice of the input processed by a single worker."""
+    index: int
+    count: int
+    source: DataSource
+    hash_key: Optional[str] = None
+    adapters: Dict[str, type] = field(default_factory=dict)
+    # Hash partitions: the shuffled rows of this bucket, filled in by `execute`
+    spill_files: List[str] = field(default_factory=list)
+
+
+class PartitionedETLExecutor:
+    """Run ingest -> transform -> validate -> load per partition on a process pool.
+
+    Partitions come from file shards (a directory or glob in `source.uri`), Parquet
+    row groups, a hash of `key_column`, or key ranges of a database source
+    (`source_adapter` must provide `split`, e.g. `DatabaseSourceAdapter`). Hash
+    partitions are shuffled first: workers read disjoint slices of the input
+    (files, Parquet row groups or line-aligned CSV byte ranges) and spill each
+    row to its bucket, so the input is read once. Each worker writes its own part file next
+    to the destination; load results and validation reports are merged afterwards.
+    Duplicate checks are partition-local, so hash partitioning on the natural key
+    keeps them exact for that key. With `profiler_adapter` each worker profiles
+    its partition and the profilers are merged into one dataset profile.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        strategy: str = "auto",
+        key_column: Optional[str] = None,
+        source_adapter: type = FileSourceAdapter,
+        transform_adapter: type = PandasTransformAdapter,
+        validation_adapter: type = ValidationAdapter,
+        destination_adapter: type = FileDestinationAdapter,
+        profiler_adapter: Optional[Any] = None,
+    ):
+        if strategy not in PARTITION_STRATEGIES:
+            raise ValueError(f"Unsupported partition strategy: {strategy}")
+        if strategy in ("hash", "key_range") and not key_column:
+            raise ValueError(f"{strategy} partitioning requires key_column")
+        self.workers = workers or os.cpu_count() or 1
+        self.strategy = strategy
+        self.key_column = key_column
+        # Adapter classes (not instances) so each worker process builds its own
+        self.adapters = {
+            "source": source_adapter,
+            "transform": transform_adapter,
+            "validation": validation_adapter,
+            "destination": destination_adapter,
+        }
+        if profiler_adapter is not None:
+            self.adapters["profiler"] = profiler_adapter
+
+    def plan(self, source: DataSource) -> List[Partition]:
+        strategy = self._resolve_strategy(source)
+        if strategy == "files":
+            sources = [replace(source, uri=path, options=dict(source.options)) for path in expand_files(source.uri)]
+            if not sources:
+                raise FileNotFoundError(f"Source not found: {source.uri}")
+        elif strategy == "row_groups":
+            sources = self._row_group_sources(source)
+        elif strategy == "key_range":
+            splitter = self.adapters["source"]()
+            if not hasattr(splitter, "split"):
+                raise ValueError(f"{type(splitter).__name__} cannot split sources by key range")
+            sources = splitter.split(source, self.workers, self.key_column)
+        elif strategy == "hash":
+            return [
+                Partition(index=i, count=self.workers, source=source,
+                          hash_key=self.key_column, adapters=self.adapters)
+                for i in range(self.workers)
+            ]
+        else:
+            sources = [source]
+        return [
+            Partition(index=i, count=len(sources), source=part, adapters=self.adapters)
+            for i, part in enumerate(sources)
+        ]
+
+    def run(
+        self,
+        source: DataSource,
+        job: TransformationJob,
+        destination: DataDestination,
+        rules: Dict[str, Any],
+        quarantine_uri: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return self.execute(self.plan(source), job, destination, rules, quarantine_uri)
+
+    def execute(
+        self,
+        partitions: List[Partition],
+        job: TransformationJob,
+        destination: DataDestination,
+        rules: Dict[str, Any],
+        quarantine_uri: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run every partition; with `quarantine_uri`, each worker writes its own dead-letter file.
+
+        File destinations get one part file per partition. Database partitions
+        all load the same table: it is replaced once up front, and workers
+        create it in turn under a shared lock before appending.
+        """
+        results: List[Dict[str, Any]] = []
+        if not partitions:
+            return merge_partition_results(results)
+        with ExitStack() as stack:
+            shuffle_dir = None
+            if partitions[0].hash_key:
+                shuffle_dir = tempfile.mkdtemp(prefix="etl-shuffle-")
+                stack.callback(shutil.rmtree, shuffle_dir, ignore_errors=True)
+            table_lock = None
+            if destination.kind != "file" and len(partitions) > 1:
+                writer = self.adapters["destination"]()
+                if hasattr(writer, "prepare_shared"):
+                    destination = writer.prepare_shared(destination)
+                table_lock = stack.enter_context(multiprocessing.Manager()).Lock()
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=min(self.workers, len(partitions))))
+            if shuffle_dir is not None:
+                partitions = self._shuffle(partitions, pool, shuffle_dir)
+            futures = [
+                pool.submit(
+                    run_partition, partition, job, _partition_destination(destination, partition), rules,
+                    _partition_uri(quarantine_uri, partition) if quarantine_uri else None, table_lock,
+                )
+                for partition in partitions
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+        results.sort(key=lambda r: r["partition"])
+        return merge_partition_results(results)
+
+    def _resolve_strategy(self, source: DataSource) -> str:
+        if self.strategy != "auto":
+            return self.strategy
+        if source.kind == "db":
+            return "key_range" if self.key_column else "single"
+        if is_multi_file(source.uri):
+            return "files"
+        if source.format == "parquet" and _num_row_groups(source.uri) > 1:
+            return "row_groups"
+        if self.key_column:
+            return "hash"
+        return "single"
+
+    def _row_group_sources(self, source: DataSource) -> List[DataSource]:
+        # Contiguous ranges keep each worker's reads sequential within the file
+        groups = _contiguous(list(range(_num_row_groups(source.uri))), self.workers)
+        return [replace(source, options={**source.options, "row_groups": group}) for group in groups]
+
+    def _read_slices(self, source: DataSource) -> List[DataSource]:
+        """Disjoint slices covering the input once: files, Parquet row groups or CSV byte ranges."""
+        if source.kind != "file":
+            return [source]
+        files = source.options.get("files")
+        if files is None and is_multi_file(source.uri):
+            files = expand_files(source.uri)
+        if files is not None and len(files) > 1:
+            return [replace(source, options={**source.options, "files": group})
+                    for group in _contiguous(files, self.workers)]
+        if files is None and source.format == "parquet" and _num_row_groups(source.uri) > 1:
+            return self._row_group_sources(source)
+        return split_csv(source, self.workers)
+
+    def _shuffle(self, partitions: List[Partition], pool: ProcessPoolExecutor, directory: str) -> List[Partition]:
+        first = partitions[0]
+        futures = [
+            pool.submit(scatter_slice, part, first.count, first.hash_key, self.adapters["source"], directory)
+            for part in self._read_slices(first.source)
+        ]
+        # Slice order, then spill order within a slice, keeps each bucket's rows in input order
+        scattered = [future.result() for future in futures]
+        files: Dict[int, List[str]] = {}
+        for result in scattered:
+            for bucket, paths in result["files"].items():
+                files.setdefault(bucket, []).extend(paths)
+        empty = [result["empty"] for result in scattered if result["empty"]][:1]
+        return [replace(partition, spill_files=files.get(partition.index, empty)) for partition in partitions]
+
+
+def run_partition(
+    partition: Partition,
+    job: TransformationJob,
+    destination: DataDestination,
+    rules: Dict[str, Any],
+    quarantine_uri: Optional[str] = None,
+    table_lock: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Worker entry point: the full use-case chain for one partition.
+
+    With `table_lock` (a table shared by every partition), an empty write
+    under the lock creates the table first, so workers never race on its DDL.
+    """
+    adapters = partition.adapters
+    result: Dict[str, Any] = {"partition": partition.index, "errors": []}
+    quarantine = QuarantineAdapter(quarantine_uri) if quarantine_uri else None
+    try:
+        ingest = IngestData(source_port=adapters.get("source", FileSourceAdapter)())
+        if partition.hash_key:
+            batch = _read_bucket(partition)
+        else:
+            batch = ingest.execute(partition.source)
+            if partition.count > 1:
+                batch.metadata["partition"] = partition.index
+        batch = TransformData(transform_port=adapters.get("transform", PandasTransformAdapter)()).execute(batch, job)
+        if quarantine is not None:
+            if "quarantine" in batch.metadata:
+                quarantine.write(batch.metadata.pop("quarantine"))
+            batch = quarantine.split(batch, rules)
+        validation = ReconcileJobResult(validation_port=adapters.get("validation", ValidationAdapter)())
+        result["validation_report"] = validation.execute(batch, rules)
+        if "profiler" in adapters:
+            profiler = adapters["profiler"]()
+            ProfileData(profiling_port=profiler).execute(batch)
+            result["profiler"] = profiler
+        load = LoadData(destination_port=adapters.get("destination", FileDestinationAdapter)())
+        if table_lock is not None:
+            with table_lock:
+                load.execute(DataBatch(raw=batch.raw[:0], schema=batch.schema), destination)
+        result["load_result"] = load.execute(batch, destination)
+    except Exception as e:
+        result["errors"].append(f"Partition {partition.index} failed: {e}")
+    if quarantine is not None:
+        result["quarantine_report"] = quarantine.report()
+    return result
+
+
+def scatter_slice(
+    source: DataSource, count: int, key_column: str, source_adapter: type, directory: str,
+) -> Dict[str, Any]:
+    """Worker entry point: spill one read slice's rows to the files of their hash buckets."""
+    spill = SpillPartitions(count, spill_dir=directory, level=SHUFFLE_HASH_LEVEL)
+    empty = None
+    for batch in IngestData(source_port=source_adapter()).execute_stream(source):
+        df = batch.to_pandas()
+        if empty is None:
+            # Column layout for buckets that receive no rows
+            empty = spill.directory / "empty.pkl"
+            df.iloc[:0].to_pickle(empty)
+        spill.write("rows", df, [key_column])
+    return {
+        "files": {bucket: [str(path) for path in paths] for (_, bucket), paths in spill.files.items()},
+        "empty": str(empty) if empty is not None else None,
+    }
+
+
+def merge_partition_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    load_results = [r["load_result"] for r in results if r.get("load_result")]
+    errors = [error for r in results for error in r["errors"]]
+    profilers = [r["profiler"] for r in results if r.get("profiler") is not None]
+    for profiler in profilers[1:]:
+        profilers[0].merge(profiler)
+    return {
+        "load_result": {
+            "status": "success" if not errors else "partial" if load_results else "error",
+            "paths": [r.get("path") for r in load_results],
+            "rows_written": sum(r.get("rows_written", 0) for r in load_results),
+            "bytes_written": sum(r.get("bytes_written", 0) for r in load_results),
+            "partitions": len(results),
+            "files": [f for r in load_results for f in r.get("files", [])],
+        },
+        "validation_report": ValidationAdapter.merge_reports(r.get("validation_report") for r in results),
+        "profile": profilers[0].profile() if profilers else None,
+        "quarantine_report": (
+            merge_quarantine_reports(r.get("quarantine_report") for r in results)
+            if any("quarantine_report" in r for r in results) else None
+        ),
+        "errors": errors,
+        # Partitions whose output is fully written, e.g. for checkpoints
+        "committed": [
+            {"partition": r["partition"], "rows": r["load_result"].get("rows_written", 0), "path": r["load_result"].get("path")}
+            for r in results if r.get("load_result") and not r["errors"]
+        ],
+    }
+
+
+def _read_bucket(partition: Partition) -> DataBatch:
+    frames = [pd.read_pickle(path) for path in partition.spill_files]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return DataBatch(
+        raw=df,
+        schema={"columns": df.dtypes.to_dict()},
+        stats={"rows": len(df), "cols": len(df.columns)},
+        metadata={"source": partition.source.uri, "partition": partition.index},
+    )
+
+
+def _partition_destination(destination: DataDestination, partition: Partition) -> DataDestination:
+    # Only file URIs name per-partition outputs; a database URL is shared as is
+    if partition.count == 1 or destination.kind != "file":
+        return destination
+    if destination.options.get("partition_cols"):
+        # Hive layouts share the root directory; workers only need distinct file names
+        return replace(destination, options={**destination.options, "file_index": partition.index})
+    return replace(destination, uri=_partition_uri(destination.uri, partition))
+
+
+def _partition_uri(uri: str, partition: Partition) -> str:
+    if partition.count == 1:
+        return uri
+    path = Path(uri)
+    return str(path.with_name(f"{path.stem}.part-{partition.index:05d}{path.suffix}"))
+
+
+def _contiguous(items: List[Any], count: int) -> List[List[Any]]:
+    count = min(count, len(items)) or 1
+    size, extra = divmod(len(items), count)
+    groups, start = [], 0
+    for i in range(count):
+        stop = start + size + (1 if i < extra else 0)
+        groups.append(items[start:stop])
+        start = stop
+    return groups
+
+
+def _num_row_groups(uri: str) -> int:
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(uri).num_row_groups
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Chunks a stage may run ahead of its consumer; memory in flight is bounded by stages x (buffer + 1) chunks
+DEFAULT_PIPELINE_BUFFER = 2
+
+# How often a blocked producer re-checks whether the consumer went away
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class PipelineStage:
+    """Drive an upstream iterator in its own thread, handing items over a bounded queue.
+
+    Chaining stages (`PipelineStage(PipelineStage(read), ...)`) lets chunk N+1
+    be read while chunk N is transformed and chunk N-1 is written. A full queue
+    blocks the producer (backpressure), so at most `buffer` chunks wait between
+    two stages. Upstream errors are re-raised in the consumer; a consumer that
+    stops early stops the producer and closes the upstream iterator.
+
+    `stats` reports `chunks`, `busy_s` (time producing), `blocked_s` (time the
+    producer waited on a full queue: downstream is the bottleneck) and
+    `waiting_s` (time the consumer waited on an empty queue: this stage is).
+    """
+
+    def __init__(self, source: Iterable[Any], name: str, buffer: int = DEFAULT_PIPELINE_BUFFER):
+        self.source = source
+        self.name = name
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+        self.stats: Dict[str, Any] = {"chunks": 0, "busy_s": 0.0, "blocked_s": 0.0, "waiting_s": 0.0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        self._thread = threading.Thread(target=self._produce, name=f"etl-{self.name}", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                start = time.perf_counter()
+                item = self.queue.get()
+                self.stats["waiting_s"] += time.perf_counter() - start
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            self._stop.set()
+            self._drain()
+            self._thread.join()
+
+    def _produce(self) -> None:
+        iterator = iter(self.source)
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                self.stats["busy_s"] += time.perf_counter() - start
+                if not self._put(item):
+                    return
+                self.stats["chunks"] += 1
+            self._put(_DONE)
+        except BaseException as e:
+            self._put(_Failure(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, item: Any) -> bool:
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.stats["blocked_s"] += time.perf_counter() - start
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol, Any
+from typing import Protocol, Any, Iterable, Iterator
 
 from ..domain.entities import DataSource, DataBatch, TransformationJob, DataDestination
 
@@ -9,6 +9,9 @@ class SourcePort(Protocol):
     def read(self, source: DataSource) -> DataBatch:
         ...
 
+    def read_stream(self, source: DataSource) -> Iterator[DataBatch]:
+        ...
+
 
 class TransformPort(Protocol):
     def apply(self, batch: DataBatch, job: TransformationJob) -> DataBatch:
@@ -20,10 +23,21 @@ class ValidationPort(Protocol):
         ...
 
 
+class ProfilingPort(Protocol):
+    def update(self, batch: DataBatch) -> None:
+        ...
+
+    def profile(self) -> dict[str, Any]:
+        ...
+
+
 class DestinationPort(Protocol):
     def write(self, batch: DataBatch, destination: DataDestination) -> dict[str, Any]:
         ...
 
+    def write_stream(self, batches: Iterable[DataBatch], destination: DataDestination) -> dict[str, Any]:
+        ...
+
 
 class OrchestrationPort(Protocol):
     def coordinate(self, workflow: dict[str, Any]) -> dict[str, Any]:
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import os
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -148,6 +149,70 @@ def run_flow(domain: str, flow: str, state: Optional[str]):
     click.echo(f"Resultado guardado en {out_file}")
 
 
+@cli.group("etl-cache")
+def etl_cache():
+    """Inspecciona y limpia el caché de etapas del ETL"""
+
+
+@etl_cache.command("list")
+@click.option("--dir", "cache_dir", default="outputs/etl_cache", show_default=True, help="Directorio del caché")
+def etl_cache_list(cache_dir: str):
+    """Lista las entradas del caché (más recientes primero)"""
+    from etl_multiagent.adapters.stage_cache import StageCache
+
+    entries = StageCache(cache_dir).entries()
+    if not entries:
+        click.echo(f"Caché vacío: {cache_dir}")
+        return
+    for e in entries:
+        used = datetime.fromtimestamp(e.last_used).isoformat(timespec="seconds")
+        click.echo(f"- {e.key[:12]}  {e.stage:<9} {e.rows:>10} filas  {e.chunks:>4} chunks  "
+                   f"{e.bytes / 1024 ** 2:>9.1f} MiB  usado {used}")
+    click.echo(f"Total: {len(entries)} entradas, {sum(e.bytes for e in entries) / 1024 ** 2:.1f} MiB")
+
+
+@etl_cache.command("purge")
+@click.option("--dir", "cache_dir", default="outputs/etl_cache", show_default=True, help="Directorio del caché")
+@click.option("--older-than", type=float, help="Solo entradas sin uso en las últimas N horas")
+@click.option("--max-bytes", type=int, help="Desaloja por LRU hasta que el caché ocupe como máximo N bytes")
+def etl_cache_purge(cache_dir: str, older_than: Optional[float], max_bytes: Optional[int]):
+    """Elimina entradas del caché (todas por defecto)"""
+    from etl_multiagent.adapters.stage_cache import StageCache
+
+    cache = StageCache(cache_dir)
+    if max_bytes is not None:
+        removed = cache.evict(max_bytes)
+    else:
+        removed = cache.purge(older_than * 3600 if older_than is not None else None)
+    click.echo(f"Eliminadas {len(removed)} entradas ({sum(e.bytes for e in removed) / 1024 ** 2:.1f} MiB)")
+
+
+@cli.command("etl-jobs")
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--cpus", type=int, help="CPUs disponibles para los jobs (por defecto todas)")
+@click.option("--memory-mb", type=float, help="Memoria disponible en MiB (por defecto 75% de la física)")
+@click.option("--max-jobs", type=int, help="Máximo de jobs simultáneos")
+@click.option("--output", default="outputs/etl_schedule.json", show_default=True, help="Reporte JSON de la ejecución")
+def etl_jobs(jobs_file: str, cpus: Optional[int], memory_mb: Optional[float], max_jobs: Optional[int], output: str):
+    """Ejecuta en paralelo los jobs ETL de un archivo YAML/JSON según CPU, memoria, prioridades y dependencias"""
+    from etl_multiagent.flows.job_scheduler import JobScheduler, load_job_specs
+
+    try:
+        specs = load_job_specs(jobs_file)
+    except ValueError as e:
+        click.echo(f"Jobs inválidos: {e}")
+        raise SystemExit(1)
+    report = JobScheduler(specs, cpu_budget=cpus, memory_budget_mb=memory_mb, max_jobs=max_jobs).run(output)
+    for job in report["jobs"]:
+        click.echo(f"- {job['name']:<24} {job['status']:<8} {job.get('wall_s', 0.0):>9.2f} s  "
+                   f"{job.get('rows_written') or 0:>10} filas")
+    summary = report["summary"]
+    click.echo(f"Total: {summary['succeeded']} ok, {summary['failed']} fallidos, {summary['skipped']} omitidos "
+               f"en {report['wall_s']:.1f} s (concurrencia {summary['concurrency']}); reporte en {output}")
+    if summary["failed"] or summary["skipped"]:
+        raise SystemExit(1)
+
+
 def main():
     cli()
 
@@ -0,0 +1,929 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path for local runs and CI
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+pd = pytest.importorskip("pandas")
+
+from etl_multiagent.domain.entities import DataSource, DataDestination, TransformationJob
+from etl_multiagent.domain.use_cases import IngestData, TransformData, LoadData
+from etl_multiagent.adapters.sources import FileSourceAdapter
+from etl_multiagent.adapters.destinations import FileDestinationAdapter
+from etl_multiagent.adapters.transformers import PandasTransformAdapter, ValidationAdapter
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    path = tmp_path / "input.csv"
+    pd.DataFrame({
+        "id": range(10),
+        "name": [f"n{i}" for i in range(10)],
+        "amount": [float(i) if i % 3 else None for i in range(10)],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_read_stream_yields_bounded_chunks(sample_csv):
+    source = DataSource(name="s", kind="file", uri=str(sample_csv), format="csv",
+                        options={"chunksize": 4})
+    batches = list(FileSourceAdapter().read_stream(source))
+
+    assert [b.stats["rows"] for b in batches] == [4, 4, 2]
+    assert [b.metadata["chunk_index"] for b in batches] == [0, 1, 2]
+
+
+def test_streamed_pipeline_matches_single_batch(sample_csv, tmp_path):
+    source = DataSource(name="s", kind="file", uri=str(sample_csv), format="csv",
+                        options={"chunksize": 3})
+    job = TransformationJob(source_schema={}, target_schema={"key": "int32"},
+                            mappings={"key": "id"})
+    destination = DataDestination(name="d", kind="file", uri=str(tmp_path / "out.csv"), format="csv")
+
+    batches = IngestData(FileSourceAdapter()).execute_stream(source)
+    batches = TransformData(PandasTransformAdapter()).execute_stream(batches, job)
+    result = LoadData(FileDestinationAdapter()).execute_stream(batches, destination)
+
+    assert result["rows_written"] == 10
+    assert result["chunks_written"] == 4
+    written = pd.read_csv(destination.uri)
+    assert list(written["key"]) == list(range(10))
+
+
+def test_merge_reports_sums_counters():
+    reports = [
+        {"status": "warning", "issues": [], "rows_validated": 3, "null_counts": {"a": 1}, "duplicate_rows": 0},
+        {"status": "pass", "issues": [], "rows_validated": 2, "null_counts": {}, "duplicate_rows": 1},
+    ]
+    merged = ValidationAdapter.merge_reports(reports)
+
+    assert merged["rows_validated"] == 5
+    assert merged["null_counts"] == {"a": 1}
+    assert merged["duplicate_rows"] == 1
+    assert merged["status"] == "warning"
+
+
+def test_partitioned_executor_hash_keeps_duplicates_exact(tmp_path):
+    from etl_multiagent.flows.partitioned_executor import PartitionedETLExecutor
+
+    source_path = tmp_path / "input.csv"
+    pd.DataFrame({"id": [1, 2, 3, 1, 2, 4], "v": [1, 2, 3, 1, 2, 4]}).to_csv(source_path, index=False)
+    source = DataSource(name="s", kind="file", uri=str(source_path), format="csv")
+    job = TransformationJob(source_schema={}, target_schema={}, mappings={})
+    destination = DataDestination(name="d", kind="file", uri=str(tmp_path / "out.csv"), format="csv")
+
+    executor = PartitionedETLExecutor(workers=2, strategy="hash", key_column="id")
+    result = executor.run(source, job, destination, {"check_duplicates": True})
+
+    assert result["errors"] == []
+    assert result["load_result"]["rows_written"] == 6
+    assert len(result["load_result"]["paths"]) == 2
+    assert result["validation_report"]["duplicate_rows"] == 2
+
+
+def test_split_csv_reads_each_line_once_under_the_header(tmp_path):
+    from etl_multiagent.adapters.sources import split_csv
+
+    path = tmp_path / "input.csv"
+    df = pd.DataFrame({"id": range(50), "name": [f"n{i}" * (i % 7) for i in range(50)]})
+    df.to_csv(path, index=False)
+    source = DataSource(name="s", kind="file", uri=str(path), format="csv")
+
+    slices = split_csv(source, 4)
+    adapter = FileSourceAdapter(chunk_rows=5)
+    read = pd.concat([adapter.read(part).raw for part in slices], ignore_index=True)
+    streamed = pd.concat([b.raw for part in slices for b in adapter.read_stream(part)], ignore_index=True)
+
+    assert len(slices) == 4
+    assert [part.options["byte_range"][0] for part in slices[1:]] == [
+        part.options["byte_range"][1] for part in slices[:-1]
+    ]
+    pd.testing.assert_frame_equal(read, pd.read_csv(path))
+    pd.testing.assert_frame_equal(streamed, pd.read_csv(path))
+    assert split_csv(DataSource(name="s", kind="file", uri=str(path), format="csv", options={"skiprows": 1}), 4) == [
+        DataSource(name="s", kind="file", uri=str(path), format="csv", options={"skiprows": 1})
+    ]
+
+
+def test_partitioned_executor_hash_shuffles_disjoint_read_slices(tmp_path):
+    from etl_multiagent.flows.partitioned_executor import PartitionedETLExecutor
+
+    source_path = tmp_path / "input.csv"
+    ids = [i % 40 for i in range(100)]
+    pd.DataFrame({"id": ids, "label": [f"k{i}" for i in ids]}).to_csv(source_path, index=False)
+    source = DataSource(name="s", kind="file", uri=str(source_path), format="csv")
+    job = TransformationJob(source_schema={}, target_schema={}, mappings={})
+    destination = DataDestination(name="d", kind="file", uri=str(tmp_path / "out.csv"), format="csv")
+
+    executor = PartitionedETLExecutor(workers=3, strategy="hash", key_column="id")
+    result = executor.run(source, job, destination, {"check_duplicates": True})
+    parts = [pd.read_csv(path) for path in result["load_result"]["paths"]]
+
+    assert len(executor._read_slices(source)) == 3
+    assert result["errors"] == []
+    assert result["validation_report"]["duplicate_rows"] == 60
+    assert sorted(pd.concat(parts)["id"]) == sorted(ids)
+    # Every key lives in one partition, whose rows keep the input order
+    assert sum(part["id"].nunique() for part in parts) == 40
+    assert all(list(part["id"]) == [i for i in ids if i in set(part["id"])] for part in parts)
+
+
+def test_rule_engine_reports_violations_with_samples():
+    from etl_multiagent.domain.entities import DataBatch
+
+    df = pd.DataFrame({
+        "age": [10, 200, "x", None],
+        "email": ["a@b.co", "bad", None, "c@d.io"],
+        "dept": ["IT", "HR", "XX", "IT"],
+    })
+    rules = {
+        "type_checks": {"age": "int64"},
+        "range_checks": {"age": {"min": 0, "max": 120}},
+        "pattern_checks": {"email": r"[^@]+@[^@]+\.[a-z]+"},
+        "referential_integrity": {"dept": ["IT", "HR"]},
+    }
+    report = ValidationAdapter().validate(DataBatch(raw=df), rules)
+    violations = report["violations"]
+
+    assert report["status"] == "warning"
+    assert violations["type_checks:age"]["sample_rows"] == [2]
+    assert violations["range_checks:age"]["sample_rows"] == [1, 2]
+    assert violations["pattern_checks:email"]["count"] == 1
+    assert violations["referential_integrity:dept"]["sample_rows"] == [2]
+
+    text = ValidationAdapter().validate(DataBatch(raw=pd.DataFrame({"age": ["5", "abc", "200", "-1x", None]})),
+                                        {"range_checks": {"age": {"min": 0, "max": 120}}})
+    assert text["violations"]["range_checks:age"]["sample_rows"] == [1, 2, 3]
+
+
+def test_incremental_validator_detects_cross_batch_duplicates():
+    from etl_multiagent.domain.entities import DataBatch
+    from etl_multiagent.adapters.transformers import IncrementalValidationAdapter
+
+    validator = IncrementalValidationAdapter(bloom_capacity=1_000)
+    rules = {"check_nulls": True, "check_duplicates": True}
+    validator.validate(DataBatch(raw=pd.DataFrame({"id": [1, 2, 3], "v": [1.0, None, 3.0]})), rules)
+    validator.validate(DataBatch(raw=pd.DataFrame({"id": [3, 4, 4], "v": [3.0, 4.0, 4.0]})), rules)
+    report = validator.report()
+
+    assert report["rows_validated"] == 6
+    assert report["duplicate_rows"] == 2
+    assert report["null_counts"] == {"v": 1}
+    assert report["column_stats"]["id"]["min"] == 1
+    assert report["column_stats"]["id"]["max"] == 4
+    assert report["column_stats"]["id"]["approx_distinct"] == 4
+
+
+def test_hyperloglog_estimate_within_error_bound():
+    np = pytest.importorskip("numpy")
+    from etl_multiagent.adapters.sketches import HyperLogLog, hash_values
+
+    first, second = HyperLogLog(12), HyperLogLog(12)
+    first.add_hashes(hash_values(pd.Series(np.arange(0, 60_000))))
+    second.add_hashes(hash_values(pd.Series(np.arange(40_000, 100_000))))
+    first.merge(second)
+
+    assert abs(first.estimate() - 100_000) / 100_000 < 0.05
+
+
+def test_low_copy_transform_renames_and_reports_cast_errors():
+    from etl_multiagent.domain.entities import DataBatch
+
+    df = pd.DataFrame({"id": [1, 2], "age": ["1", "x"], "name": ["a", "b"]})
+    job = TransformationJob(source_schema={}, target_schema={"key": "int32", "age": "int64"},
+                            mappings={"key": "id"}, rules={"low_copy": True})
+    result = PandasTransformAdapter().apply(DataBatch(raw=df), job)
+
+    assert list(result.raw.columns) == ["key", "age", "name"]
+    assert str(result.raw["key"].dtype) == "int32"
+    assert set(result.metadata["cast_errors"]) == {"age"}
+    assert list(df.columns) == ["id", "age", "name"]
+
+
+def test_arrow_batches_flow_without_pandas(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    from etl_multiagent.adapters.transformers import ArrowTransformAdapter
+
+    source_path = tmp_path / "input.parquet"
+    pd.DataFrame({"id": [1, 2, 2], "v": [1.0, None, None]}).to_parquet(source_path)
+    source = DataSource(name="s", kind="file", uri=str(source_path), format="parquet",
+                        options={"arrow": True})
+    job = TransformationJob(source_schema={}, target_schema={"key": "int32"}, mappings={"key": "id"})
+
+    batch = FileSourceAdapter().read(source)
+    batch = ArrowTransformAdapter().apply(batch, job)
+    report = ValidationAdapter().validate(batch, {"check_nulls": True, "check_duplicates": True})
+    destination = DataDestination(name="d", kind="file", uri=str(tmp_path / "out.parquet"), format="parquet")
+    FileDestinationAdapter().write(batch, destination)
+
+    assert isinstance(batch.raw, pa.Table)
+    assert batch.raw.schema.field("key").type == pa.int32()
+    assert report["null_counts"] == {"v": 2}
+    assert report["duplicate_rows"] == 1
+    assert list(pd.read_parquet(destination.uri)["key"]) == [1, 2, 2]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_source_pushes_down_columns_and_filters(tmp_path, fmt, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.feather as feather
+
+    read_columns = []
+    read_table = feather.read_table
+    monkeypatch.setattr(feather, "read_table", lambda *a, **kw: read_columns.append(kw.get("columns")) or read_table(*a, **kw))
+    df = pd.DataFrame({"id": range(20), "country": ["CO", "MX"] * 10, "amount": [float(i) for i in range(20)],
+                       "note": ["x" * 50] * 20})
+    path = tmp_path / f"input.{fmt}"
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, row_group_size=5)
+    else:
+        df.to_feather(path)
+    job = TransformationJob(source_schema={}, target_schema={"amount": "float32"}, mappings={"key": "id"})
+    options = {"columns": job.required_columns(), "filters": [("country", "=", "CO"), ("id", ">=", 10)]}
+    source = DataSource(name="s", kind="file", uri=str(path), format=fmt, options=options)
+
+    batch = FileSourceAdapter().read(source)
+    chunks = list(FileSourceAdapter(chunk_rows=2).read_stream(source))
+
+    assert list(batch.raw.columns) == ["id", "amount"]
+    assert list(batch.raw["id"]) == [10, 12, 14, 16, 18]
+    assert sum(len(chunk.raw) for chunk in chunks) == 5
+    assert all(list(chunk.raw.columns) == ["id", "amount"] for chunk in chunks)
+    if fmt == "feather":
+        # Unused columns are never decompressed
+        assert read_columns == [["id", "country", "amount"]] * 2
+
+
+def test_destination_writes_hive_partitions_in_parallel(tmp_path):
+    pytest.importorskip("pyarrow")
+    from etl_multiagent.domain.entities import DataBatch
+
+    df = pd.DataFrame({"country": ["CO", "MX", "CO", None], "year": [2024, 2024, 2025, 2025], "v": [1, 2, 3, 4]})
+    destination = DataDestination(name="d", kind="file", uri=str(tmp_path / "out"), format="parquet",
+                                  options={"partition_cols": ["country"], "compression": "zstd",
+                                           "row_group_size": 2})
+    result = FileDestinationAdapter(max_workers=2).write(DataBatch(raw=df), destination)
+
+    files = {tuple(f["values"].items()): f for f in result["files"]}
+    assert result["rows_written"] == 4
+    assert files[(("country", "CO"),)]["rows"] == 2
+    assert files[(("country", None),)]["path"].endswith("country=__HIVE_DEFAULT_PARTITION__/part-00000.parquet")
+    assert result["bytes_written"] == sum(f["bytes"] for f in result["files"])
+    written = pd.read_parquet(files[(("country", "CO"),)]["path"])
+    assert list(written.columns) == ["year", "v"]
+    assert list(written["v"]) == [1, 3]
+
+
+def test_postgres_adapter_replace_and_upsert_on_sqlite(tmp_path):
+    pytest.importorskip("pyarrow")
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from etl_multiagent.domain.entities import DataBatch
+    from etl_multiagent.adapters.destinations import PostgresDestinationAdapter
+
+    url = f"sqlite:///{tmp_path / 'warehouse.db'}"
+    adapter = PostgresDestinationAdapter()
+    replace = DataDestination(name="sales", kind="db", uri=url, format="table", options={"mode": "replace"})
+    upsert = DataDestination(name="sales", kind="db", uri=url, format="table",
+                             options={"mode": "upsert", "key_columns": ["id"]})
+
+    adapter.write(DataBatch(raw=pd.DataFrame({"id": [1, 2], "v": ["a", None]})), replace)
+    result = adapter.write_stream([
+        DataBatch(raw=pd.DataFrame({"id": [2, 3, 3], "v": ["b", "c", "d"]})),
+        DataBatch(raw=pd.DataFrame({"id": [4], "v": ["e"]})),
+    ], upsert)
+
+    rows = pd.read_sql("SELECT id, v FROM sales ORDER BY id", sqlalchemy.create_engine(url))
+    assert result["rows_written"] == 3
+    assert result["chunks_written"] == 2
+    assert rows.values.tolist() == [[1, "a"], [2, "b"], [3, "d"], [4, "e"]]
+
+
+def test_database_source_streams_chunks_and_splits_key_ranges(tmp_path):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from etl_multiagent.adapters.sources import DatabaseSourceAdapter
+
+    url = f"sqlite:///{tmp_path / 'source.db'}"
+    pd.DataFrame({"id": range(10), "v": [i * 2 for i in range(10)]}).to_sql(
+        "events", sqlalchemy.create_engine(url), index=False)
+    source = DataSource(name="events", kind="db", uri=url, format="table",
+                        options={"table": "events", "chunksize": 4})
+    adapter = DatabaseSourceAdapter()
+
+    chunks = list(adapter.read_stream(source))
+    parts = adapter.split(source, 3, key_column="id")
+    ids = [sorted(adapter.read(part).raw["id"]) for part in parts]
+
+    assert [chunk.stats["rows"] for chunk in chunks] == [4, 4, 2]
+    assert [part.options["key_range"] for part in parts] == [(None, 4), (4, 8), (8, None)]
+    assert ids == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_copy_csv_slices_keep_nulls_apart_from_empty_strings():
+    import csv
+    import io
+
+    pa = pytest.importorskip("pyarrow")
+    from etl_multiagent.adapters.destinations import _CsvSliceReader, _csv_slices
+
+    values = [None, "", 'say "hi"', "line1\nline2", "a,b"]
+    table = pa.table({"id": [1, 2, None, 4, 5], "s": values})
+
+    slices = list(_csv_slices(table, 2))
+    data = b"".join(slices)
+    reader = _CsvSliceReader(table, 2)
+    pieces = iter(lambda: reader.read(3), b"")
+
+    assert len(slices) == 3
+    # COPY ... CSV reads an unquoted empty field as NULL and "" as an empty string
+    assert data.startswith(b'1,\n2,""\n,"say ""hi"""\n')
+    assert b"".join(pieces) == data
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+    assert [row[1] for row in rows] == ["", "", 'say "hi"', "line1\nline2", "a,b"]
+    assert [row[0] for row in rows] == ["1", "2", "", "4", "5"]
+    assert list(_csv_slices(table.slice(0, 0), 2)) == []
+
+
+def test_s3_source_reads_prefix_with_ranged_gets(tmp_path):
+    pytest.importorskip("pyarrow")
+    from etl_multiagent.adapters.object_store import LocalObjectStore
+    from etl_multiagent.adapters.sources import S3SourceAdapter
+
+    table_dir = tmp_path / "bucket" / "sales"
+    table_dir.mkdir(parents=True)
+    pd.DataFrame({"id": range(0, 50), "v": range(50)}).to_parquet(table_dir / "a.parquet", row_group_size=10)
+    pd.DataFrame({"id": range(50, 60), "v": range(10)}).to_parquet(table_dir / "b.parquet")
+    (table_dir / "_SUCCESS").write_text("")
+    pd.DataFrame({"id": range(25)}).to_csv(tmp_path / "bucket" / "ids.csv", index=False)
+
+    adapter = S3SourceAdapter(store=LocalObjectStore(tmp_path), max_workers=4, part_size=256, chunk_rows=10)
+    parquet = DataSource(name="s", kind="s3", uri="s3://bucket/sales/", format="parquet",
+                         options={"columns": ["id"], "filters": [("id", ">=", 45)]})
+    csv = DataSource(name="s", kind="s3", uri="s3://bucket/ids.csv", format="csv")
+
+    batch = adapter.read(parquet)
+    chunks = list(adapter.read_stream(csv))
+
+    assert list(batch.raw["id"]) == list(range(45, 60))
+    assert len(batch.metadata["objects"]) == 2
+    assert [chunk.stats["rows"] for chunk in chunks] == [10, 10, 5]
+    assert pd.concat([chunk.raw for chunk in chunks])["id"].tolist() == list(range(25))
+
+
+def test_boto3_object_store_paginates_listings_and_sends_byte_ranges():
+    import io
+
+    boto3 = pytest.importorskip("boto3")
+    from botocore.response import StreamingBody
+    from botocore.stub import Stubber
+    from etl_multiagent.adapters.object_store import Boto3ObjectStore, ObjectInfo
+
+    client = boto3.client("s3", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test")
+    stubber = Stubber(client)
+    stubber.add_response(
+        "list_objects_v2",
+        {"Contents": [{"Key": "sales/a.csv", "Size": 10}], "IsTruncated": True, "NextContinuationToken": "page-2"},
+        {"Bucket": "bucket", "Prefix": "sales/"},
+    )
+    stubber.add_response(
+        "list_objects_v2",
+        {"Contents": [{"Key": "sales/b.csv", "Size": 5}], "IsTruncated": False},
+        {"Bucket": "bucket", "Prefix": "sales/", "ContinuationToken": "page-2"},
+    )
+    stubber.add_response(
+        "get_object",
+        {"Body": StreamingBody(io.BytesIO(b"bcd"), 3), "ContentLength": 3},
+        {"Bucket": "bucket", "Key": "sales/a.csv", "Range": "bytes=1-3"},
+    )
+
+    with stubber:
+        store = Boto3ObjectStore(client=client)
+        objects = store.list("bucket", "sales/")
+        # end is exclusive; the HTTP Range header is inclusive
+        data = store.get_range("bucket", "sales/a.csv", 1, 4)
+
+    stubber.assert_no_pending_responses()
+    assert objects == [ObjectInfo("bucket", "sales/a.csv", 10), ObjectInfo("bucket", "sales/b.csv", 5)]
+    assert data == b"bcd"
+
+
+def test_stage_cache_roundtrip_fingerprint_and_lru(tmp_path, sample_csv):
+    pytest.importorskip("pyarrow")
+    import os
+    from etl_multiagent.domain.entities import DataBatch
+    from etl_multiagent.adapters.stage_cache import StageCache, cache_key, source_fingerprint
+
+    source = DataSource(name="s", kind="file", uri=str(sample_csv), format="csv")
+    key = cache_key("ingest", source_fingerprint(source))
+    cache = StageCache(tmp_path / "cache")
+    batch = DataBatch(raw=pd.DataFrame({"id": [1, 2], "v": [0.5, None]}), metadata={"cast_errors": {"v": "x"}})
+
+    cache.put(key, "ingest", batch)
+    restored = cache.get(key)
+    chunks = list(cache.put_stream("streamed", "transform", [batch, batch]))
+    os.utime(cache.root / key / "meta.json", (0, 0))  # make the first entry the least recently used
+    evicted = cache.evict(max_bytes=cache.entries()[0].bytes)
+    sample_csv.write_text("id,name,amount\n1,a,2.0\n")
+
+    assert restored.raw.equals(batch.raw)
+    assert restored.metadata["cast_errors"] == {"v": "x"}
+    assert len(chunks) == 2 and cache.get("streamed").num_rows == 4
+    assert [e.key for e in evicted] == [key]
+    assert cache_key("ingest", source_fingerprint(source)) != key
+
+
+def test_incremental_watermarks_read_only_new_rows_and_files(tmp_path):
+    from etl_multiagent.domain.entities import DataBatch
+    from etl_multiagent.adapters.watermarks import WatermarkStore, plan_incremental
+
+    store = WatermarkStore(tmp_path / "watermarks.json")
+    path = tmp_path / "events.csv"
+    pd.DataFrame({"id": [1, 2, 3], "seq": [10, 20, 30]}).to_csv(path, index=False)
+    source = DataSource(name="s", kind="file", uri=str(path), format="csv")
+    adapter = FileSourceAdapter()
+
+    first = plan_incremental(source, {"mode": "column", "column": "seq"}, store)
+    first.observe(adapter.read(first.source))
+    assert first.commit(store)
+    pd.DataFrame({"id": [1, 2, 3, 4], "seq": [10, 20, 30, 40]}).to_csv(path, index=False)
+    second = plan_incremental(source, {"mode": "column", "column": "seq"}, store)
+    delta = adapter.read(second.source)
+
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    pd.DataFrame({"id": [1]}).to_csv(landing / "day=01.csv", index=False)
+    files = DataSource(name="f", kind="file", uri=str(landing), format="csv")
+    plan_incremental(files, {"mode": "name"}, store).commit(store)
+    pd.DataFrame({"id": [2]}).to_csv(landing / "day=02.csv", index=False)
+    new_files = plan_incremental(files, {"mode": "name"}, store)
+
+    assert list(delta.raw["id"]) == [4]
+    assert store.get(first.key)["value"] == 30
+    assert [Path(f).name for f in new_files.source.options["files"]] == ["day=02.csv"]
+    assert list(adapter.read(new_files.source).raw["id"]) == [2]
+
+
+def _set_watermarks(path, worker):
+    from etl_multiagent.adapters.watermarks import WatermarkStore
+
+    store = WatermarkStore(path)
+    for i in range(20):
+        store.set(f"w{worker}:{i}", {"mode": "column", "column": "seq", "value": i})
+
+
+def test_watermark_store_keeps_concurrent_updates(tmp_path):
+    import multiprocessing
+    from etl_multiagent.adapters.watermarks import WatermarkStore
+
+    path = tmp_path / "watermarks.json"
+    workers = [multiprocessing.Process(target=_set_watermarks, args=(path, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    store = WatermarkStore(path)
+    assert all(store.get(f"w{w}:{i}")["value"] == i for w in range(4) for i in range(20))
+
+
+def test_schema_registry_infers_compact_dtypes_and_falls_back(tmp_path):
+    from etl_multiagent.adapters.schema_registry import SchemaRegistry
+
+    path = tmp_path / "events.csv"
+    pd.DataFrame({
+        "id": range(3000),
+        "country": ["CO", "MX", "PE"] * 1000,
+        "active": ["True", "False"] * 1500,
+        "ts": pd.date_range("2024-01-01", periods=3000, freq="h").astype(str),
+    }).to_csv(path, index=False)
+    registry_path = tmp_path / "schemas.json"
+    source = DataSource(name="s", kind="file", uri=str(path), format="csv",
+                        options={"schema": "registry", "schema_registry": str(registry_path)})
+
+    batch = FileSourceAdapter().read(source)
+    registered = SchemaRegistry(registry_path).get(str(path))
+    path.write_text("id,country,active,ts\n1,CO,True,2024-01-01\nnot-a-number,MX,False,2024-01-02\n")
+    fallback = FileSourceAdapter().read(source)
+
+    assert registered.columns == {"id": "int32", "country": "category", "active": "bool", "ts": "datetime64[ns]"}
+    assert batch.raw.dtypes.astype(str).to_dict() == registered.columns
+    assert "schema_fallback" in fallback.metadata
+    assert list(fallback.raw["id"]) == ["1", "not-a-number"]
+    assert SchemaRegistry(registry_path).get(str(path)) is None
+
+
+def test_optimize_memory_rule_downcasts_and_reports_bytes():
+    pytest.importorskip("pyarrow")
+    from etl_multiagent.domain.entities import DataBatch
+
+    df = pd.DataFrame({
+        "qty": [1, 2, 300] * 100,
+        "delta": pd.array([-1, None, 5] * 100, dtype="Int64"),
+        "price": [0.5, 1.25, None] * 100,
+        "ratio": [0.1, 0.2, 0.3] * 100,
+        "country": ["CO", "MX", "PE"] * 100,
+        "name": [f"user-{i}" for i in range(300)],
+    })
+    job = TransformationJob(source_schema={}, target_schema={}, mappings={}, rules={"optimize_memory": True})
+    adapter = PandasTransformAdapter()
+
+    batch = adapter.apply(DataBatch(raw=df), job)
+    chunk = adapter.apply(DataBatch(raw=df, metadata={"chunk_index": 0}), job)
+    report = batch.metadata["memory"]
+
+    assert batch.raw.dtypes.astype(str).to_dict() == {
+        "qty": "uint16", "delta": "Int8", "price": "float32", "ratio": "float64",
+        "country": "category", "name": "string",
+    }
+    assert str(batch.raw["name"].dtype.storage) == "pyarrow"
+    assert report["bytes_after"] < report["bytes_before"] // 3
+    assert report["columns"]["qty"] == "int64->uint16"
+    assert chunk.raw["qty"].dtype == "int64" and chunk.raw["country"].dtype == "category"
+    assert df["qty"].dtype == "int64"
+
+
+def test_profiler_merges_chunks_into_the_single_batch_profile():
+    from etl_multiagent.domain.entities import DataBatch
+    from etl_multiagent.domain.use_cases import ProfileData
+    from etl_multiagent.adapters.profiler import DataProfiler
+
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "amount": np.append(rng.normal(100, 10, 999), 10_000.0),
+        "country": rng.choice(["CO", "MX", None], 1000),
+        "user": [f"u{i}" for i in range(1000)],
+    })
+    df = pd.concat([df, df.head(3)], ignore_index=True)
+    batch = DataBatch(raw=df)
+
+    whole = ProfileData(profiling_port=DataProfiler()).execute(batch)
+    streamed = DataProfiler()
+    for start in range(0, len(df), 250):
+        streamed.update(DataBatch(raw=df.iloc[start:start + 250]))
+    merged = streamed.profile()
+    approx = DataProfiler(exact_distinct_limit=100)
+    approx.update(batch)
+    users = approx.profile()["columns"]["user"]
+
+    assert batch.stats["profile"] is whole
+    assert whole["rows"] == 1003 and whole["duplicates"] == 3
+    assert whole["columns"]["country"]["nulls"] == df["country"].isna().sum()
+    assert whole["columns"]["country"]["distinct"] == 2
+    assert whole["columns"]["amount"]["outliers"]["count"] >= 1
+    assert whole["columns"]["amount"]["max"] == 10_000.0
+    assert merged["columns"]["amount"]["quantiles"] == whole["columns"]["amount"]["quantiles"]
+    assert merged["columns"]["amount"]["mean"] == pytest.approx(whole["columns"]["amount"]["mean"])
+    assert merged["duplicates"] == 3 and merged["columns"]["user"]["distinct"] == 1000
+    assert users["distinct_approx"] and abs(users["distinct"] - 1000) < 50
+
+
+def test_expression_rules_compile_once_and_run_vectorized(tmp_path):
+    from etl_multiagent.domain.entities import DataBatch, TransformationJob
+    from etl_multiagent.adapters.expressions import compile_expression
+    from etl_multiagent.adapters.transformers import PandasTransformAdapter
+
+    pd.DataFrame({"code": ["CO", "MX"], "name": ["Colombia", "Mexico"]}).to_csv(tmp_path / "countries.csv", index=False)
+    df = pd.DataFrame({
+        "name": [" ana ", "BOB", None, "carl"],
+        "price": [10.0, 2.5, 3.0, None],
+        "qty": [1, 2, 3, 4],
+        "country": ["CO", "MX", "US", "CO"],
+    })
+    job = TransformationJob(source_schema={}, target_schema={"total": "float32"}, mappings={}, rules={
+        "cleanse": {"name": ["strip", "title"]},
+        "derive": {"total": "coalesce(price, 0) * qty", "tier": "'high' if total > 4 else 'low'"},
+        "enrich": {"country_name": f"lookup(country, '{tmp_path / 'countries.csv'}', 'code', 'name', 'Other')"},
+        "normalize": {"qty": "minmax"},
+        "filter": ["country in ['CO', 'MX']", "notnull(name)"],
+    })
+    adapter = PandasTransformAdapter()
+    out = adapter.apply(DataBatch(raw=df), job)
+    # Per-chunk statistics would scale every chunk differently
+    with pytest.raises(ValueError, match="minmax"):
+        adapter.apply(DataBatch(raw=df.iloc[:2], metadata={"chunk_index": 1}), job)
+    job.rules["normalize"] = {"qty": "minmax(qty, 1, 4)"}
+    second = adapter.apply(DataBatch(raw=df.iloc[:2], metadata={"chunk_index": 1}), job)
+
+    result = out.raw
+    assert list(result["name"]) == ["Ana", "Bob", "Carl"]
+    assert list(result["total"]) == [10.0, 5.0, 0.0] and result["total"].dtype == "float32"
+    assert list(result["tier"]) == ["high", "high", "low"]
+    assert list(result["country_name"]) == ["Colombia", "Mexico", "Colombia"]
+    assert list(result["qty"]) == [0.0, pytest.approx(1 / 3), 1.0]
+    assert out.metadata["filtered_rows"] == 1 and len(second.raw) == 2
+    assert list(second.raw["qty"]) == [0.0, pytest.approx(1 / 3)]
+    assert len(adapter._plans) == 2 and "total" not in df.columns
+    for bad in ["__import__('os')", "a.b", "a[0]", "a +"]:
+        with pytest.raises(ValueError):
+            compile_expression(bad)
+
+
+def test_numexpr_path_matches_pandas_on_boolean_logic():
+    pytest.importorskip("numexpr")
+    np = pytest.importorskip("numpy")
+    from etl_multiagent.adapters.expressions import NUMEXPR_MIN_ROWS, compile_expression
+
+    rng = np.random.default_rng(7)
+    price = rng.choice([0.0, 1.5, -2.0, np.nan], NUMEXPR_MIN_ROWS)
+    df = pd.DataFrame({"qty": rng.integers(0, 3, NUMEXPR_MIN_ROWS), "price": price})
+
+    for source in ["qty and price", "qty or price", "not qty", "not price", "price if qty else 0",
+                   "qty * 2 if price else -1", "qty > 1 and not price", "where(price, qty, 0)"]:
+        expression = compile_expression(source)
+        assert expression.numexpr_source, source
+        fast, reference = expression(df), expression.evaluate(df)
+        pd.testing.assert_series_equal(fast, reference, check_dtype=False, check_names=False, obj=source)
+
+
+def test_spilling_aggregate_and_join_match_in_memory_results(tmp_path):
+    from etl_multiagent.domain.entities import DataBatch, TransformationJob
+    from etl_multiagent.adapters.spill import SpillingAggregator
+    from etl_multiagent.adapters.transformers import PandasTransformAdapter
+
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        "customer": rng.integers(0, 20_000, 60_000),
+        "country": rng.choice(["CO", "MX", None], 60_000),
+        "amount": rng.normal(100, 10, 60_000),
+        "store": rng.integers(0, 3, 60_000),
+    })
+    metrics = {"total": "sum(amount)", "orders": "count()", "avg": "mean(amount)", "sd": "std(amount)",
+               "top": "max(amount)", "stores": "nunique(store)"}
+    aggregator = SpillingAggregator(["country", "customer"], metrics, memory_budget_mb=0.5,
+                                    partitions=4, spill_dir=str(tmp_path / "spill"))
+    for start in range(0, len(df), 10_000):
+        aggregator.update(df.iloc[start:start + 10_000])
+    result = pd.concat(list(aggregator.results()), ignore_index=True)
+    expected = df.groupby(["country", "customer"], dropna=False).agg(
+        total=("amount", "sum"), orders=("amount", "size"), avg=("amount", "mean"), sd=("amount", "std"),
+        top=("amount", "max"), stores=("store", "nunique"),
+    ).reset_index()
+    merged = result.merge(expected, on=["country", "customer"], suffixes=("", "_expected"))
+
+    assert aggregator.stats["spills"] == 1 and aggregator.stats["spilled_bytes"] > 0
+    assert len(result) == len(expected) == len(merged)
+    for column in metrics:
+        assert np.allclose(merged[column], merged[f"{column}_expected"], equal_nan=True)
+    assert not list((tmp_path / "spill").iterdir())
+
+    # Large offsets cancel catastrophically in sum-of-squares variance; pooled M2s do not
+    offset = pd.DataFrame({"g": rng.integers(0, 50, 20_000), "x": 1e9 + rng.normal(0, 1, 20_000)})
+    pooled = SpillingAggregator(["g"], {"sd": "std(x)", "var": "var(x)"}, memory_budget_mb=0.05, partitions=4)
+    for start in range(0, len(offset), 1_000):
+        pooled.update(offset.iloc[start:start + 1_000])
+    spread = pd.concat(list(pooled.results())).set_index("g").sort_index()
+    exact = offset.groupby("g")["x"].agg(sd="std", var="var")
+    assert np.allclose(spread["sd"], exact["sd"], rtol=1e-6)
+    assert np.allclose(spread["var"], exact["var"], rtol=1e-6)
+
+    pd.DataFrame({"id": range(20_000), "segment": ["gold", "silver"] * 10_000}).to_csv(tmp_path / "c.csv", index=False)
+    job = TransformationJob(source_schema={}, target_schema={}, mappings={}, rules={
+        "join": {"right": {"uri": str(tmp_path / "c.csv")}, "on": {"left": "customer", "right": "id"},
+                 "columns": ["segment"], "memory_budget_mb": 0.05, "partitions": 4},
+        "aggregate": {"group_by": "segment", "metrics": {"orders": "count()"}},
+    })
+    batches = [DataBatch(raw=df.iloc[start:start + 20_000], metadata={"chunk_index": i})
+               for i, start in enumerate(range(0, len(df), 20_000))]
+    out = list(PandasTransformAdapter().apply_stream(batches, job))
+    counts = pd.concat([batch.raw for batch in out]).set_index("segment")["orders"]
+
+    assert out[-1].metadata["spill"]["join"]["broadcast"] is False
+    assert counts.to_dict() == (df["customer"] % 2).map({0: "gold", 1: "silver"}).value_counts().to_dict()
+
+
+def test_duckdb_adapter_runs_sql_over_a_stream_in_arrow_chunks(tmp_path):
+    pytest.importorskip("duckdb")
+    pa = pytest.importorskip("pyarrow")
+    from etl_multiagent.domain.entities import DataBatch, TransformationJob
+    from etl_multiagent.adapters.transformers import DuckDBTransformAdapter
+
+    pd.DataFrame({"id": [1, 2], "segment": ["gold", "silver"]}).to_parquet(tmp_path / "customers.parquet")
+    table = pa.table({"customer": [1, 2, 1, 2, 1, 3] * 500, "amount": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0] * 500})
+    batches = [DataBatch(raw=chunk, metadata={"chunk_index": i}) for i, chunk in enumerate(table.to_batches(1000))]
+    job = TransformationJob(source_schema={}, target_schema={"orders": "int32"}, mappings={"client": "customer"}, rules={
+        "engine": "duckdb",
+        "sql_tables": {"customers": str(tmp_path / "customers.parquet")},
+        "sql": "SELECT c.segment, sum(b.amount) AS total, count(*) AS orders "
+               "FROM batch b LEFT JOIN customers c ON b.client = c.id GROUP BY ALL ORDER BY ALL",
+        "duckdb": {"threads": 2},
+    })
+
+    out = list(DuckDBTransformAdapter().apply_stream(iter(batches), job))
+    result = pa.concat_tables([batch.raw for batch in out]).to_pandas()
+    filtered = DuckDBTransformAdapter(chunk_rows=500).apply_stream(
+        [DataBatch(raw=table)],
+        TransformationJob(source_schema={}, target_schema={}, mappings={}, rules={"sql": "SELECT * FROM batch WHERE amount > 25"}),
+    )
+
+    assert all(batch.is_arrow and batch.metadata["engine"] == "duckdb" for batch in out)
+    assert result["segment"].tolist() == ["gold", "silver", None]
+    assert result["total"].tolist() == [45_000.0, 30_000.0, 30_000.0] and result["orders"].tolist() == [1500, 1000, 500]
+    assert str(out[0].raw.schema.field("orders").type) == "int32"
+    sizes = [batch.num_rows for batch in filtered]
+    assert sum(sizes) == 2000 and max(sizes) <= 500
+    with pytest.raises(ValueError):
+        DuckDBTransformAdapter().apply(DataBatch(raw=table), TransformationJob(
+            source_schema={}, target_schema={}, mappings={}, rules={"engine": "duckdb", "derive": {"x": "1"}}))
+
+
+def test_pipeline_stages_overlap_with_bounded_queues():
+    import threading
+    import time
+    from etl_multiagent.flows.pipelined_executor import PipelineStage
+
+    def slow(items):
+        for item in items:
+            time.sleep(0.05)
+            yield item
+
+    started = time.perf_counter()
+    read = PipelineStage(slow(range(8)), "read", buffer=1)
+    transformed = PipelineStage(slow(read), "transform", buffer=1)
+    written = list(slow(transformed))
+    elapsed = time.perf_counter() - started
+
+    def failing():
+        yield 1
+        raise RuntimeError("source broke")
+
+    assert written == list(range(8)) and read.stats["chunks"] == 8
+    assert elapsed < 8 * 0.05 * 2  # Sequential would take 8 x 3 x 0.05 s
+    with pytest.raises(RuntimeError, match="source broke"):
+        list(PipelineStage(slow(PipelineStage(failing(), "read")), "transform"))
+    early = iter(PipelineStage(slow(PipelineStage(slow(range(100)), "read", buffer=1)), "transform", buffer=1))
+    next(early)
+    early.close()
+    assert not [t for t in threading.enumerate() if t.name in ("etl-read", "etl-transform")]
+
+
+def test_benchmark_generator_is_deterministic_and_runner_reports_throughput(tmp_path):
+    pytest.importorskip("pyarrow")
+    from etl_multiagent.benchmarks.runner import BenchmarkCase, compare_results, run_adapters
+    from etl_multiagent.benchmarks.synthetic import generate_chunks, write_dataset
+
+    whole = pd.concat(generate_chunks("strings", 5000, seed=7, chunk_rows=2000), ignore_index=True)
+    again = pd.concat(generate_chunks("strings", 5000, seed=7, chunk_rows=2000), ignore_index=True)
+    other = pd.concat(generate_chunks("strings", 5000, seed=8, chunk_rows=2000), ignore_index=True)
+    pd.testing.assert_frame_equal(whole, again)
+    assert not whole["email"].equals(other["email"]) and whole["id"].tolist() == list(range(5000))
+
+    path = write_dataset(tmp_path / "wide.parquet", "wide", 3000, "parquet", chunk_rows=1000)
+    case = BenchmarkCase("wide", 3000, "parquet", chunk_rows=1000, end_to_end=False)
+    results = run_adapters(case, str(path), str(tmp_path))
+    assert [r["stage"] for r in results] == ["read", "transform", "validate", "write"]
+    assert all(r["rows_per_s"] > 0 and r["mb_per_s"] > 0 and r["peak_rss_mb"] > 0 for r in results)
+    written = pd.read_parquet(tmp_path / "out-wide.parquet")
+    assert written.shape == (3000, 51) and "id_copy" in written and written["f00"].dtype == "float32"
+
+    slower = [{**r, "rows_per_s": r["rows_per_s"] / 2} for r in results]
+    comparison = compare_results({"results": results}, {"results": slower})
+    assert all(c["regression"] and c["speedup"] == 0.5 for c in comparison)
+
+
+def test_instrumented_ports_report_exclusive_time_rows_and_bytes(tmp_path, sample_csv):
+    import time
+    from etl_multiagent.flows.instrumentation import FlowMetrics, InstrumentedPort, write_prometheus
+
+    class SlowTransform:
+        def apply_stream(self, batches, job):
+            for batch in batches:
+                time.sleep(0.05)
+                yield batch
+
+    metrics = FlowMetrics()
+    source = InstrumentedPort(FileSourceAdapter(), "source", metrics)
+    transform = TransformData(transform_port=InstrumentedPort(SlowTransform(), "transform", metrics))
+    load = LoadData(destination_port=InstrumentedPort(FileDestinationAdapter(), "destination", metrics))
+    stream = IngestData(source_port=source).execute_stream(
+        DataSource(name="src", kind="file", uri=str(sample_csv), format="csv", options={"chunksize": 4}))
+    destination = DataDestination(name="dst", kind="file", uri=str(tmp_path / "out.csv"), format="csv")
+    with metrics.step("load_destination"):
+        load.execute_stream(transform.execute_stream(stream, None), destination)
+
+    ports = metrics.report()["ports"]
+    assert not hasattr(InstrumentedPort(SlowTransform(), "transform", metrics), "apply")
+    assert ports["source.read_stream"]["chunks"] == 3 and ports["source.read_stream"]["rows_out"] == 10
+    assert ports["source.read_stream"]["bytes_in"] == sample_csv.stat().st_size
+    assert ports["transform.apply_stream"]["rows_in"] == ports["transform.apply_stream"]["rows_out"] == 10
+    assert ports["destination.write_stream"]["bytes_out"] == (tmp_path / "out.csv").stat().st_size
+    # The sleeps belong to the transform only, although the destination drives the whole stream
+    assert ports["transform.apply_stream"]["wall_s"] >= 0.15
+    assert ports["destination.write_stream"]["wall_s"] < 0.1 and ports["source.read_stream"]["wall_s"] < 0.1
+    assert metrics.steps["load_destination"]["wall_s"] >= 0.15
+
+    text = write_prometheus(metrics.report(), tmp_path / "etl.prom").read_text()
+    assert 'etl_port_rows_out{port="destination.write_stream"} 10' in text
+    assert 'etl_step_wall_seconds{step="load_destination"}' in text
+
+
+def test_quarantine_isolates_bad_rows_with_reason_codes(tmp_path):
+    import json
+    from etl_multiagent.adapters.quarantine import QuarantineAdapter
+    from etl_multiagent.domain.entities import DataBatch
+
+    df = pd.DataFrame({"id": [1, 2, 3, 4], "amount": ["1.5", "oops", "2", "3"], "age": [30, 40, 150, 20]})
+    job = TransformationJob(source_schema={}, target_schema={"amount": "float64"}, mappings={},
+                            rules={"quarantine": True})
+    transformed = PandasTransformAdapter().apply(DataBatch(raw=df), job)
+    assert transformed.raw["id"].tolist() == [1, 3, 4] and transformed.raw["amount"].dtype == "float64"
+    assert "cast_errors" not in transformed.metadata
+
+    quarantine = QuarantineAdapter(str(tmp_path / "dead.jsonl"))
+    quarantine.write(transformed.metadata.pop("quarantine"))
+    good = quarantine.split(transformed, {"range_checks": {"age": {"max": 120}}, "pattern_checks": {"id": r"[0-3]"}})
+    assert good.raw["id"].tolist() == [1] and good.metadata["quarantined_rows"] == 2
+
+    rows = [json.loads(line) for line in (tmp_path / "dead.jsonl").read_text().splitlines()]
+    assert [(r["id"], r["_quarantine_reason"], r["_quarantine_stage"]) for r in rows] == [
+        (2, "cast:amount", "transform"),
+        (3, "range_checks:age", "validation"),
+        (4, "pattern_checks:id", "validation"),
+    ]
+    assert rows[0]["amount"] == "oops"
+    assert quarantine.report()["reasons"] == {"cast:amount": 1, "range_checks:age": 1, "pattern_checks:id": 1}
+
+
+def test_checkpointed_load_resumes_after_last_committed_chunk(tmp_path, sample_csv):
+    from etl_multiagent.adapters.checkpoints import CheckpointedLoad, CheckpointStore
+
+    source = DataSource(name="src", kind="file", uri=str(sample_csv), format="csv", options={"chunksize": 3})
+    destination = DataDestination(name="dst", kind="file", uri=str(tmp_path / "out"), format="csv")
+    store = CheckpointStore(tmp_path / "checkpoints.db")
+
+    def crash_at_third_chunk(batches):
+        for batch in batches:
+            if batch.metadata["chunk_index"] == 2:
+                raise RuntimeError("worker killed")
+            yield batch
+
+    first = CheckpointedLoad(store, destination, "run-1")
+    with pytest.raises(RuntimeError):
+        first.write_stream(crash_at_third_chunk(FileSourceAdapter().read_stream(source)), FileDestinationAdapter())
+    assert sorted(store.committed(str((tmp_path / "out").resolve()))) == [0, 1]
+
+    resumed = CheckpointedLoad(store, destination, "run-1")
+    pending = list(resumed.skip_committed(FileSourceAdapter().read_stream(source)))
+    result = resumed.write_stream(pending, FileDestinationAdapter())
+    assert resumed.resumed and [batch.metadata["chunk_index"] for batch in pending] == [2, 3]
+    assert result["chunks_written"] == 2 and result["chunks_resumed"] == 2 and result["rows_written"] == 10
+    written = pd.concat(pd.read_csv(path) for path in sorted((tmp_path / "out").glob("part-*.csv")))
+    assert written["id"].tolist() == list(range(10))
+
+    # A finished run, or a different run key, starts over
+    assert not CheckpointedLoad(store, destination, "run-1").resumed
+    assert not list((tmp_path / "out").glob("part-*.csv"))
+
+
+def _fake_etl_job(state):
+    # Stands in for run_job in the scheduler's worker processes
+    import time
+
+    time.sleep(0.2)
+    if state["source_uri"] == "missing.csv":
+        return {"status": "failed", "errors": ["Source not found"], "rows_written": 0}
+    return {"status": "success", "errors": [], "rows_written": 10,
+            "metrics": {"steps": {}, "ports": {"destination.write": {"calls": 1, "rows_out": 10, "started_ns": 1}}}}
+
+
+def test_job_scheduler_orders_by_priority_and_dependencies(tmp_path, sample_csv):
+    pytest.importorskip("crewai")
+    from etl_multiagent.flows.job_scheduler import JobScheduler, estimate_resources, load_job_specs, validate_jobs
+
+    (tmp_path / "jobs.yaml").write_text(f"""
+defaults: {{source_format: csv, dest_format: parquet, mappings: {{}}, target_schema: {{}}}}
+jobs:
+  - {{name: base, source_uri: "{sample_csv}", dest_uri: out/base.parquet}}
+  - {{name: derived, depends_on: [base], source_uri: "{sample_csv}", dest_uri: out/derived.parquet}}
+  - {{name: urgent, priority: 10, source_uri: "{sample_csv}", dest_uri: out/urgent.parquet, resources: {{cpus: 2}}}}
+  - {{name: broken, source_uri: missing.csv, dest_uri: out/broken.parquet}}
+  - {{name: after_broken, depends_on: [broken], source_uri: "{sample_csv}", dest_uri: out/x.parquet}}
+""", encoding="utf-8")
+    specs = load_job_specs(tmp_path / "jobs.yaml")
+    assert specs[1].state["source_format"] == "csv" and specs[1].depends_on == ["base"]
+    assert estimate_resources(specs[2]).cpus == 2 and estimate_resources(specs[0]).input_mb > 0
+
+    report = JobScheduler(specs, cpu_budget=2, memory_budget_mb=4096, runner=_fake_etl_job).run(tmp_path / "run.json")
+
+    jobs = {job["name"]: job for job in report["jobs"]}
+    started = sorted((job["started_s"], name) for name, job in jobs.items() if "started_s" in job)
+    # urgent fills both CPU slots; then base and broken share them, and derived follows base
+    assert [name for _, name in started] == ["urgent", "base", "broken", "derived"]
+    assert jobs["derived"]["started_s"] >= jobs["base"]["ended_s"]
+    assert jobs["after_broken"]["status"] == "skipped" and jobs["broken"]["status"] == "failed"
+    assert report["summary"]["succeeded"] == 3 and report["summary"]["rows_written"] == 30
+    assert report["summary"]["peak_jobs"] == 2 and report["summary"]["peak_cpus"] == 2
+    assert report["metrics"]["ports"]["destination.write"] == {"calls": 3, "rows_out": 30}
+    assert (tmp_path / "run.json").exists()
+
+    specs[0].depends_on = ["derived"]
+    with pytest.raises(ValueError, match="cycle"):
+        validate_jobs(specs)
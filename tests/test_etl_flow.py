@@ -0,0 +1,187 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path for local runs and CI
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+# Flows are run offline: no CrewAI telemetry export
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("crewai")
+
+from etl_multiagent.flows.etl_pipeline_flow import ETLFlowState, ETLPipelineFlow
+
+
+def run_flow(**state):
+    """Run ETLPipelineFlow step by step over a fresh state."""
+    defaults = {"source_format": "csv", "dest_format": "csv", "mappings": {}, "target_schema": {}}
+    return ETLPipelineFlow.from_state(ETLFlowState(**{**defaults, **state})).run_steps()
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    path = tmp_path / "input.csv"
+    pd.DataFrame({
+        "id": range(10),
+        "name": [f"n{i}" for i in range(10)],
+        "amount": [float(i) if i % 3 else None for i in range(10)],
+    }).to_csv(path, index=False)
+    return path
+
+
+def read_output(dest_uri):
+    """The rows a run wrote, whether to one file or to per-partition part files."""
+    path = Path(dest_uri)
+    parts = sorted(path.parent.glob(f"{path.stem}.part-*{path.suffix}")) or [path]
+    return pd.concat([pd.read_csv(part) for part in parts]).sort_values("id", ignore_index=True)
+
+
+def test_chunked_pipelined_and_partitioned_runs_match_the_single_batch_run(tmp_path, sample_csv):
+    common = dict(
+        source_uri=str(sample_csv), mappings={"total": "amount"},
+        validation_rules={"range_checks": {"total": {"max": 7}}},
+        quarantine=True,
+    )
+    modes = {
+        "batch": {},
+        "chunked": {"chunk_size": 3},
+        "pipelined": {"chunk_size": 3, "pipelined": True},
+        "partitioned": {"workers": 2, "partition_strategy": "hash", "partition_key": "id"},
+    }
+    states = {
+        mode: run_flow(**common, **options, dest_uri=str(tmp_path / f"{mode}.csv"),
+                       quarantine_path=str(tmp_path / f"{mode}-dead.jsonl"))
+        for mode, options in modes.items()
+    }
+    expected = read_output(tmp_path / "batch.csv")
+
+    assert expected["id"].tolist() == [0, 1, 2, 3, 4, 5, 6, 7, 9] and list(expected.columns) == ["id", "name", "amount", "total"]
+    for mode, state in states.items():
+        assert not state.errors, mode
+        assert state.load_result["rows_written"] == 9, mode
+        assert state.quarantine_report["rows"] == 1, mode
+        pd.testing.assert_frame_equal(read_output(tmp_path / f"{mode}.csv"), expected)
+    assert states["pipelined"].pipeline_report
+
+
+def test_cached_rerun_skips_ingest_and_transform(tmp_path, sample_csv, monkeypatch):
+    from etl_multiagent.adapters.sources import FileSourceAdapter
+
+    state = dict(source_uri=str(sample_csv), dest_uri=str(tmp_path / "out.csv"), mappings={"total": "amount"},
+                 cache_dir=str(tmp_path / "cache"))
+    first = run_flow(**state)
+    monkeypatch.setattr(FileSourceAdapter, "read", lambda self, source: 1 / 0)
+    second = run_flow(**state)
+    written = read_output(tmp_path / "out.csv")
+    changed = run_flow(**{**state, "mappings": {"value": "amount"}})
+
+    assert first.cache_hits == [] and second.cache_hits == ["transform"]
+    assert not second.errors and second.load_result["rows_written"] == 10
+    assert written["total"].equals(pd.read_csv(sample_csv)["amount"].rename("total"))
+    # A different transform reuses the cached ingest; the patched reader is never called
+    assert changed.cache_hits == ["ingest"] and not changed.errors
+
+
+def test_partitioned_run_loads_one_database_table(tmp_path, sample_csv):
+    pytest.importorskip("pyarrow")
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    df = pd.read_csv(sample_csv)
+    df.iloc[:6].to_csv(shards / "a.csv", index=False)
+    df.iloc[6:].to_csv(shards / "b.csv", index=False)
+    url = f"sqlite:///{tmp_path / 'wh.db'}"
+    pd.DataFrame({"id": [99]}).to_sql("events", sqlalchemy.create_engine(url), index=False)
+
+    state = run_flow(
+        source_uri=str(shards), dest_uri=url, dest_kind="db", workers=2,
+        dest_options={"table": "events", "mode": "replace"},
+    )
+
+    assert not state.errors
+    assert state.load_result["status"] == "success" and state.load_result["rows_written"] == 10
+    loaded = pd.read_sql("SELECT * FROM events ORDER BY id", sqlalchemy.create_engine(url))
+    # Replaced once up front: the stale row is gone and both partitions are kept
+    assert loaded["id"].tolist() == list(range(10)) and list(loaded.columns) == ["id", "name", "amount"]
+
+
+def test_checkpointed_run_resumes_without_duplicating_quarantined_rows(tmp_path, monkeypatch):
+    from etl_multiagent.adapters.destinations import FileDestinationAdapter
+
+    source = tmp_path / "input.csv"
+    amounts = [str(i) for i in range(10)]
+    amounts[1] = amounts[7] = "oops"  # chunks 0 and 2
+    pd.DataFrame({"id": range(10), "amount": amounts}).to_csv(source, index=False)
+    out = tmp_path / "out"
+    state = dict(
+        source_uri=str(source), dest_uri=str(out), target_schema={"amount": "float64"}, chunk_size=3,
+        checkpoint=True, checkpoint_path=str(tmp_path / "ckpt.db"),
+        quarantine=True, quarantine_path=str(tmp_path / "dead.jsonl"),
+    )
+    write = FileDestinationAdapter.write
+
+    def crash_on_third_chunk(self, batch, destination):
+        if "part-000002" in destination.uri:
+            raise RuntimeError("worker killed")
+        return write(self, batch, destination)
+
+    monkeypatch.setattr(FileDestinationAdapter, "write", crash_on_third_chunk)
+    crashed = run_flow(**state)
+    assert any("worker killed" in error for error in crashed.errors)
+    monkeypatch.setattr(FileDestinationAdapter, "write", write)
+
+    resumed = run_flow(**state)
+
+    assert not resumed.errors
+    assert resumed.load_result["chunks_resumed"] == 2 and resumed.load_result["chunks_written"] == 2
+    written = pd.concat(pd.read_csv(path) for path in sorted(out.glob("part-*.csv")))
+    assert written["id"].tolist() == [0, 2, 3, 4, 5, 6, 8, 9]
+    dead = pd.read_json(tmp_path / "dead.jsonl", lines=True)
+    assert sorted(dead["id"]) == [1, 7] and sorted(dead["_quarantine_chunk"]) == [0, 2]
+
+    # A fresh run removes only the parts it recorded
+    (out / "part-999999.csv").write_text("id\n", encoding="utf-8")
+    rerun = run_flow(**state)
+    assert rerun.load_result["chunks_resumed"] == 0 and (out / "part-999999.csv").exists()
+
+    file_like = run_flow(**{**state, "dest_uri": str(tmp_path / "out.csv")})
+    assert any("looks like a file" in error for error in file_like.errors)
+
+
+def test_incremental_watermark_advances_only_after_a_successful_load(tmp_path, monkeypatch):
+    from etl_multiagent.adapters.destinations import FileDestinationAdapter
+    from etl_multiagent.adapters.watermarks import WatermarkStore
+
+    source = tmp_path / "events.csv"
+    pd.DataFrame({"id": range(6), "seq": range(6)}).to_csv(source, index=False)
+    watermarks = tmp_path / "watermarks.json"
+    out = tmp_path / "out.csv"
+
+    def run():
+        return run_flow(source_uri=str(source), dest_uri=str(out), chunk_size=4,
+                        incremental={"mode": "column", "column": "seq", "key": "events"},
+                        watermark_path=str(watermarks))
+
+    first = run()
+    empty = run()
+    pd.DataFrame({"id": range(9), "seq": range(9)}).to_csv(source, index=False)
+    write_stream = FileDestinationAdapter.write_stream
+    monkeypatch.setattr(FileDestinationAdapter, "write_stream", lambda self, *a, **k: 1 / 0)
+    failed = run()
+    monkeypatch.setattr(FileDestinationAdapter, "write_stream", write_stream)
+    watermark_after_failure = WatermarkStore(watermarks).get("events")["value"]
+    resumed = run()
+
+    assert first.load_result["rows_written"] == 6
+    assert empty.load_result == {"status": "skipped", "rows_written": 0, "reason": "no new rows"}
+    assert failed.errors and watermark_after_failure == 5
+    assert resumed.load_result["rows_written"] == 3
+    assert WatermarkStore(watermarks).get("events")["value"] == 8
+    assert list(pd.read_csv(out)["id"]) == list(range(9))